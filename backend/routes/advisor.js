@@ -3,6 +3,82 @@ const { authenticateToken } = require('../middleware/auth');
 const Startup = require('../models/Startup');
 const axios = require('axios');
 
+// ML-service advisor session per user, tied to the startup document version.
+// Same idle TTL and session cap as AdvisorSessionStore in the ML service; a Map keeps
+// insertion order, so re-inserting on use makes the first entry the least recently used.
+const ADVISOR_SESSION_TTL_MS = Number(process.env.ADVISOR_SESSION_TTL_S || 1800) * 1000;
+const ADVISOR_MAX_SESSIONS = Number(process.env.ADVISOR_MAX_SESSIONS || 10000);
+const advisorSessions = new Map();
+
+function getCachedSession(userId) {
+  const cached = advisorSessions.get(userId);
+  if (!cached) return null;
+  advisorSessions.delete(userId);
+  if (Date.now() - cached.lastUsed > ADVISOR_SESSION_TTL_MS) return null;
+  cached.lastUsed = Date.now();
+  advisorSessions.set(userId, cached);
+  return cached;
+}
+
+function cacheSession(userId, session) {
+  advisorSessions.delete(userId);
+  advisorSessions.set(userId, { ...session, lastUsed: Date.now() });
+  // Drop expired sessions, then least recently used until within the cap
+  const now = Date.now();
+  for (const [key, entry] of advisorSessions) {
+    if (now - entry.lastUsed <= ADVISOR_SESSION_TTL_MS && advisorSessions.size <= ADVISOR_MAX_SESSIONS) break;
+    advisorSessions.delete(key);
+  }
+}
+
+function advisorRequestConfig(userId) {
+  return {
+    timeout: 30000,
+    headers: {
+      'Content-Type': 'application/json',
+      // Lets the ML service shed the request instead of working past our timeout
+      'X-Request-Deadline': String(Date.now() + 30000),
+      'X-Client-Id': String(userId)
+    }
+  };
+}
+
+// Reuse the session while the startup is unchanged; otherwise load it once and open a new one
+async function getAdvisorSession(userId, startupVersion) {
+  const cached = getCachedSession(userId);
+  if (cached && cached.version === startupVersion) {
+    return cached.sessionId;
+  }
+
+  const startup = await Startup.findOne({ userId }).sort({ createdAt: -1 });
+  const sessionResponse = await axios.post(
+    `${process.env.ML_SERVICE_URL}/advisor/session`,
+    {
+      startup_data: {
+        name: startup.name,
+        description: startup.description,
+        category: startup.category,
+        location: startup.location,
+        team_size: startup.team_size,
+        founded_year: startup.founded_year,
+        funding: startup.funding,
+        problem_solving: startup.problem_solving,
+        target_audience: startup.target_audience,
+        unique_value_proposition: startup.unique_value_proposition,
+        business_model: startup.business_model,
+        key_strengths: startup.key_strengths,
+        main_challenges: startup.main_challenges
+      },
+      // Paths to success are searched once here and reused for every question in the session
+      include_paths: true
+    },
+    advisorRequestConfig(userId)
+  );
+
+  cacheSession(userId, { sessionId: sessionResponse.data.session_id, version: startupVersion });
+  return sessionResponse.data.session_id;
+}
+
 // Dynamic AI advisor powered by ML service
 router.post('/ask', authenticateToken, async (req, res) => {
   try {
@@ -14,40 +90,32 @@ router.post('/ask', authenticateToken, async (req, res) => {
 
     console.log(`[ADVISOR] User ${req.user.id} asked: "${question}"`);
 
-    // Get user's startup data from database
-    const startup = await Startup.findOne({ userId: req.user.id }).sort({ createdAt: -1 });
+    // Only the version is read here; the full profile is sent once per session
+    const startup = await Startup.findOne({ userId: req.user.id })
+      .sort({ createdAt: -1 })
+      .select('updatedAt')
+      .lean();
     
     console.log(`[ADVISOR] Startup data found: ${startup ? 'YES' : 'NO'}`);
 
     // Call ML service for dynamic AI response
     try {
-      const mlResponse = await axios.post(
-        'http://localhost:8000/advisor/ask',
-        {
-          question: question,
-          startup_data: startup ? {
-            name: startup.name,
-            description: startup.description,
-            category: startup.category,
-            location: startup.location,
-            team_size: startup.team_size,
-            founded_year: startup.founded_year,
-            funding: startup.funding,
-            problem_solving: startup.problem_solving,
-            target_audience: startup.target_audience,
-            unique_value_proposition: startup.unique_value_proposition,
-            business_model: startup.business_model,
-            key_strengths: startup.key_strengths,
-            main_challenges: startup.main_challenges
-          } : null
-        },
-        { 
-          timeout: 30000,
-          headers: {
-            'Content-Type': 'application/json'
-          }
-        }
-      );
+      const askAdvisor = async () => {
+        const payload = startup
+          ? { question, session_id: await getAdvisorSession(req.user.id, String(startup.updatedAt)) }
+          : { question, startup_data: null };
+        return axios.post(`${process.env.ML_SERVICE_URL}/advisor/ask`, payload, advisorRequestConfig(req.user.id));
+      };
+
+      let mlResponse;
+      try {
+        mlResponse = await askAdvisor();
+      } catch (sessionError) {
+        // Session expired or evicted in the ML service: open a fresh one and retry once
+        if (!startup || sessionError.response?.status !== 404) throw sessionError;
+        advisorSessions.delete(req.user.id);
+        mlResponse = await askAdvisor();
+      }
 
       console.log(`[ADVISOR] ML service responded successfully`);
       console.log(`[ADVISOR] Response length: ${mlResponse.data.answer.length} characters`);
@@ -173,6 +241,12 @@ router.get('/my-startup', authenticateToken, async (req, res) => {
 
 // Clear conversation (optional - for chat history management)
 router.post('/clear', authenticateToken, (req, res) => {
+  const cached = advisorSessions.get(req.user.id);
+  advisorSessions.delete(req.user.id);
+  if (cached) {
+    axios.delete(`${process.env.ML_SERVICE_URL}/advisor/session/${cached.sessionId}`).catch(() => {});
+  }
+
   res.json({ 
     message: 'Conversation cleared',
     timestamp: new Date()
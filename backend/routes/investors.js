@@ -1,124 +1,25 @@
 const router = require('express').Router();
 const { authenticateToken } = require('../middleware/auth');
 const Startup = require('../models/Startup');
+const axios = require('axios');
+const path = require('path');
 
-// Real investor data
-const INVESTORS = [
-  {
-    name: 'Sequoia Capital',
-    logo: '🌲',
-    type: 'Venture Capital',
-    stage: 'Seed-Series B',
-    ticketSize: '$1M - $20M',
-    location: 'Menlo Park, USA',
-    portfolio: 200,
-    focus: ['Technology', 'AI/ML', 'Fintech', 'E-commerce'],
-    description: 'Leading VC firm backing legendary founders. Portfolio includes Apple, Google, Airbnb, Stripe.',
-    whyMatch: 'Active in AI/ML investments. Perfect match for Technology startups. Great for seed-stage funding'
-  },
-  {
-    name: 'Andreessen Horowitz (a16z)',
-    logo: '🅰️',
-    type: 'Venture Capital',
-    stage: 'Seed-Series B',
-    ticketSize: '$1M - $20M',
-    location: 'Menlo Park, USA',
-    portfolio: 150,
-    focus: ['AI/ML', 'Fintech', 'Technology'],
-    description: 'Deep tech and enterprise focus. Portfolio includes Coinbase, Instagram, Lyft, Oculus.',
-    whyMatch: 'Active in AI/ML investments. Perfect match for Technology startups. Great for seed-stage funding'
-  },
-  {
-    name: 'Y Combinator',
-    logo: '🚀',
-    type: 'Accelerator',
-    stage: 'Pre-seed-Seed',
-    ticketSize: '$150K - $500K',
-    location: 'San Francisco, USA',
-    portfolio: 4000,
-    focus: ['All sectors'],
-    description: 'World\'s most successful startup accelerator. Portfolio includes Airbnb, DoorDash, Stripe, Dropbox.',
-    whyMatch: 'Best for early-stage startups. Great for seed-stage funding. Provides mentorship and network'
-  },
-  {
-    name: 'Accel Partners',
-    logo: '⚡',
-    type: 'Venture Capital',
-    stage: 'Seed-Series C',
-    ticketSize: '$2M - $15M',
-    location: 'Palo Alto, USA',
-    portfolio: 100,
-    focus: ['SaaS', 'Technology', 'Consumer'],
-    description: 'Early-stage investor with deep SaaS expertise. Portfolio includes Facebook, Slack, Dropbox.',
-    whyMatch: 'European and US investments. Perfect for SaaS and Technology. Good for Series A'
-  },
-  {
-    name: '500 Global',
-    logo: '🌐',
-    type: 'Accelerator',
-    stage: 'Pre-seed-Seed',
-    ticketSize: '$50K - $250K',
-    location: 'San Francisco, USA',
-    portfolio: 2500,
-    focus: ['All sectors', 'Global'],
-    description: 'Global VC and accelerator backing innovative startups worldwide. 2,500+ company portfolio.',
-    whyMatch: 'Great for early-stage startups. Global focus. Provides hands-on support'
-  },
-  {
-    name: 'Khosla Ventures',
-    logo: '💡',
-    type: 'Venture Capital',
-    stage: 'Seed-Series B',
-    ticketSize: '$2M - $15M',
-    location: 'Menlo Park, USA',
-    portfolio: 80,
-    focus: ['AI/ML', 'Healthcare', 'Fintech'],
-    description: 'High-conviction, founder-friendly VC focused on transformative technologies and businesses.',
-    whyMatch: 'Deep tech and healthcare focus. Perfect match for AI/ML. Founder-friendly terms'
-  },
-  {
-    name: 'Insight Partners',
-    logo: '📊',
-    type: 'Venture Capital',
-    stage: 'Series A-Series C',
-    ticketSize: '$5M - $50M',
-    location: 'New York, USA',
-    portfolio: 400,
-    focus: ['SaaS', 'Enterprise', 'Technology'],
-    description: 'Growth-stage investor focused on ScaleUp software companies. $90B+ assets under management.',
-    whyMatch: 'Perfect for growth-stage SaaS. Enterprise focus. Strong operational support'
-  },
-  {
-    name: 'Index Ventures',
-    logo: '📇',
-    type: 'Venture Capital',
-    stage: 'Seed-Series C',
-    ticketSize: '$1M - $50M',
-    location: 'London, UK',
-    portfolio: 200,
-    focus: ['Technology', 'Fintech', 'E-commerce'],
-    description: 'European and US early-stage investor. Portfolio includes Dropbox, Figma, Discord, Revolut.',
-    whyMatch: 'European and US investments. Perfect for Technology and Fintech. Good for international expansion'
-  }
-];
+// Investor table shared with the ML service (ml-services/data/investors.json)
+const INVESTORS = require(process.env.INVESTORS_FILE || path.join(__dirname, '../../ml-services/data/investors.json'));
 
-// Calculate match score based on startup profile
+// Local fallback scorer, used only when the ML service is unavailable.
+// Same rules as InvestorIndex.match in ml-services/main_gpu.py - keep them in step.
 function calculateMatchScore(startup, investor) {
   let score = 50; // Base score
   
-  console.log(`[MATCH] Calculating for ${investor.name}`);
-  console.log(`[MATCH] Startup: ${startup.name}, Category: ${startup.category}, Funding: ${startup.funding?.total || 0}`);
-  
   // Category match (20 points)
   const startupCategory = (startup.category || '').toLowerCase();
   const investorFocus = investor.focus.map(f => f.toLowerCase());
   
   if (investorFocus.some(f => f.includes(startupCategory) || startupCategory.includes(f))) {
     score += 20;
-    console.log(`[MATCH] Category match: +20 (${startup.category} matches ${investor.focus})`);
   } else if (investorFocus.includes('all sectors')) {
     score += 15;
-    console.log(`[MATCH] All sectors: +15`);
   }
   
   // Stage match (20 points)
@@ -127,39 +28,30 @@ function calculateMatchScore(startup, investor) {
   
   if (funding === 0 && (stage.includes('pre-seed') || stage.includes('accelerator'))) {
     score += 20;
-    console.log(`[MATCH] Pre-seed/Accelerator match: +20`);
   } else if (funding < 1000000 && stage.includes('seed')) {
     score += 20;
-    console.log(`[MATCH] Seed stage match: +20`);
   } else if (funding >= 1000000 && funding < 5000000 && stage.includes('series a')) {
     score += 20;
-    console.log(`[MATCH] Series A match: +20`);
   } else if (funding >= 5000000 && (stage.includes('series b') || stage.includes('series c'))) {
     score += 20;
-    console.log(`[MATCH] Series B/C match: +20`);
   } else {
     score += 5; // Partial match
-    console.log(`[MATCH] Partial stage match: +5`);
   }
   
   // Team size match (10 points)
   const teamSize = startup.team_size || 0;
   if (teamSize >= 5 && teamSize <= 50) {
     score += 10;
-    console.log(`[MATCH] Optimal team size: +10`);
   } else if (teamSize < 5 && investor.type === 'Accelerator') {
     score += 10;
-    console.log(`[MATCH] Small team + Accelerator: +10`);
   } else {
     score += 5;
-    console.log(`[MATCH] Team size partial: +5`);
   }
   
   // Location match (10 points)
   const location = (startup.location || '').toLowerCase();
   if (location.includes('us') || location.includes('san francisco') || location.includes('new york')) {
     score += 10;
-    console.log(`[MATCH] US location: +10`);
   }
   
   // Company age match (10 points)
@@ -167,14 +59,11 @@ function calculateMatchScore(startup, investor) {
   const age = currentYear - (startup.founded_year || currentYear);
   if (age >= 1 && age <= 3) {
     score += 10;
-    console.log(`[MATCH] Optimal age (1-3 years): +10`);
   } else if (age >= 0 && age <= 5) {
     score += 5;
-    console.log(`[MATCH] Good age (0-5 years): +5`);
   }
   
   const finalScore = Math.min(Math.max(score, 0), 100);
-  console.log(`[MATCH] Final score for ${investor.name}: ${finalScore}`);
   
   return finalScore;
 }
@@ -211,23 +100,36 @@ router.get('/matches', authenticateToken, async (req, res) => {
     console.log('[INVESTORS]   - Founded:', startup.founded_year);
     console.log('[INVESTORS]   - Location:', startup.location);
     
-    // Calculate match scores for all investors
-    const matchedInvestors = INVESTORS.map(investor => {
-      const matchScore = calculateMatchScore(startup, investor);
-      return {
+    // Indexed, vectorized matching in the ML service
+    let matchedInvestors;
+    try {
+      const mlResponse = await axios.post(
+        `${process.env.ML_SERVICE_URL}/investors/match`,
+        {
+          startup: {
+            funding_total: startup.funding?.total || 0,
+            funding_rounds: startup.funding?.rounds || 0,
+            founded_year: startup.founded_year,
+            category: startup.category,
+            location: startup.location,
+            team_size: startup.team_size,
+            key_strengths: startup.key_strengths || [],
+            main_challenges: startup.main_challenges || []
+          },
+          top_k: 50
+        },
+        { timeout: 5000, headers: { 'X-Client-Id': String(req.user.id) } }
+      );
+      matchedInvestors = mlResponse.data.investors;
+    } catch (mlError) {
+      console.log('[INVESTORS] ML service not available, using local matching:', mlError.message);
+      matchedInvestors = INVESTORS.map(investor => ({
         ...investor,
-        matchScore: matchScore
-      };
-    });
-    
-    // Sort by match score (highest first)
-    matchedInvestors.sort((a, b) => b.matchScore - a.matchScore);
-    
-    console.log('\n[INVESTORS] Match Scores:');
-    matchedInvestors.forEach(inv => {
-      console.log(`[INVESTORS]   ${inv.name}: ${inv.matchScore}%`);
-    });
-    
+        matchScore: calculateMatchScore(startup, investor)
+      }));
+      matchedInvestors.sort((a, b) => b.matchScore - a.matchScore);
+    }
+
     console.log('\n[INVESTORS] ✅ Returning', matchedInvestors.length, 'investors');
     console.log('[INVESTORS] ========================================\n');
     
@@ -8,9 +8,14 @@ IMPROVED ML TRAINING SYSTEM - TARGETS 85%+ ACCURACY
 
 import os
 import sys
+import argparse
+import json
+import time
+import hashlib
+import inspect
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, roc_auc_score, classification_report
 import xgboost as xgb
@@ -18,6 +23,9 @@ import joblib
 import torch
 from datetime import datetime
 import warnings
+import synthetic_data
+import cpu_profile
+import neighbor_index
 warnings.filterwarnings('ignore')
 
 print("="*80)
@@ -29,31 +37,71 @@ CONFIG = {
     'data_dir': './data',
     'models_dir': './models',
     'min_samples': 1000,
+    'synthetic_rows': 12000,
     'test_size': 0.2,
-    'random_state': 42
+    'random_state': 42,
+    'csv_engine': 'pyarrow',
+    'ingest_memory_budget_mb': 2048,
+    'ingest_chunk_rows': 1_000_000,
+    'cache_dir': './data/cache',
+    'use_dataset_cache': True,
+    'incremental_rounds': 50,
+    'incremental_holdout': 0.2,
+    'incremental_valid': 0.1,
+    'incremental_max_auc_loss': 0.002,
+    'search_eta': 3,
+    'search_min_rounds': 25,
+    'search_max_rounds': 500,
+    'search_early_stopping': 30,
+    'search_threads_per_worker': 2,
+    'cv_max_rounds': 1000,
+    'cv_early_stopping': 50,
+    'pipeline_dir': './data/cache/pipeline',
+    'categorical_mode': 'label',
+    'scaling_benchmark_rounds': 200,
+    'distributed_timeout_s': 3600,
+    'distributed_shutdown_timeout_s': 60,
+    'drift_bins': 20,
+    'neighbor_attributes': ['funding_total', 'team_size', 'founded_year', 'funding_rounds', 'monthly_revenue'],
+    'cpu_autotune': True,
+    'autotune_max_bins': [64, 128, 256],
+    'autotune_rounds': 30,
+    'autotune_max_auc_loss': 0.001,
+    'autotune_max_rows': 200_000,
+    'compaction_max_auc_loss': 0.005,
+    'compaction_valid_size': 0.2,
+    'compaction_student_depths': [2, 3, 4]
 }
 
+step_number = 0
+
+def step(title):
+    """Console banner, numbered in the order steps actually run"""
+    global step_number
+    step_number += 1
+    print(f"\n[{step_number}] {title}")
+
 def check_gpu():
     """Check GPU availability"""
-    print("\n[1/9] CHECKING GPU...")
+    step("CHECKING GPU...")
     cuda_available = torch.cuda.is_available()
     if cuda_available:
         print(f"✓ GPU: {torch.cuda.get_device_name(0)}")
         return 'cuda'
     else:
-        print("⚠ Using CPU (slower)")
+        print(f"✓ Using CPU ({cpu_profile.available_cpus()} usable cores)")
         return 'cpu'
 
 def setup_directories():
     """Create necessary directories"""
-    print("\n[2/9] SETUP...")
+    step("SETUP...")
     os.makedirs(CONFIG['data_dir'], exist_ok=True)
     os.makedirs(CONFIG['models_dir'], exist_ok=True)
     print("✓ Ready")
 
 def download_data():
     """Download real data from Kaggle"""
-    print("\n[3/9] LOADING DATA...")
+    step("LOADING DATA...")
     
     data_file = os.path.join(CONFIG['data_dir'], 'investments_VC.csv')
     
@@ -81,60 +129,182 @@ def download_data():
         print("⚠ Kaggle not configured, using synthetic data")
         return None
 
-def load_and_clean_advanced(data_file):
+SUCCESS_STATUSES = ['acquired', 'ipo']
+FAILURE_STATUSES = ['closed', 'dead']
+
+# Model features and the dtype each one is built with (XGBoost reads them as float32)
+FEATURE_SCHEMA = {
+    'funding_total': np.float32,
+    'founded_year': np.int16,
+    'team_size': np.int16,
+    'funding_rounds': np.int16,
+    'monthly_revenue': np.float32,
+    'user_growth_rate': np.float32,
+    'burn_rate': np.float32,
+    'market_size': np.float32,
+    'company_age': np.int16,
+    'funding_per_round': np.float32,
+    'funding_velocity': np.float32,
+    'revenue_to_burn_ratio': np.float32,
+    'funding_efficiency': np.float32,
+    'category_encoded': np.int32,
+    'location_encoded': np.int32,
+    'num_strengths': np.int8,
+    'num_challenges': np.int8,
+    'strength_to_challenge_ratio': np.float32,
+    'description_length': np.int16,
+    'problem_length': np.int16,
+    'runway_months': np.float32,
+    'location_tier': np.int8,
+    'founded_in_recession': np.int8,
+    'is_well_funded': np.int8,
+    'optimal_age': np.int8,
+    'optimal_team': np.int8
+}
+FEATURE_COLUMNS = list(FEATURE_SCHEMA)
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None if unavailable)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            info = psutil.Process().memory_info()
+            return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+        except ImportError:
+            return None
+
+def current_rss_mb():
+    """Resident memory of this process right now in MB (None if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+        except (OSError, ValueError, AttributeError):
+            return None
+
+def discover_columns(data_file):
+    """Find the source columns we need from the CSV header alone"""
+    header = pd.read_csv(data_file, nrows=0).columns
+    find = lambda match: next((c for c in header if match(c.lower())), None)
+    
+    return {
+        'status': find(lambda c: 'status' in c),
+        'funding': find(lambda c: 'funding' in c and 'total' in c),
+        'founded': find(lambda c: 'founded' in c),
+        'founded_year': 'founded_year' if 'founded_year' in header else None,
+        'category': find(lambda c: 'category' in c),
+        'location': find(lambda c: 'country' in c or 'region' in c),
+        'rounds': find(lambda c: 'rounds' in c),
+    }, len(header)
+
+def fill_category(series, value):
+    """fillna that also works on categorical columns"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+def clean_chunk(chunk, cols):
+    """Reduce raw rows to compact base columns and drop unusable rows early"""
+    df_clean = pd.DataFrame(index=chunk.index)
+    df_clean['status'] = chunk[cols['status']].str.lower().fillna('unknown')
+    df_clean['funding_total'] = pd.to_numeric(chunk[cols['funding']], errors='coerce').fillna(0).astype(np.float32)
+    
+    # Founded year
+    if cols['founded_year']:
+        df_clean['founded_year'] = pd.to_numeric(chunk[cols['founded_year']], errors='coerce')
+    else:
+        df_clean['founded_year'] = pd.to_datetime(chunk[cols['founded']], errors='coerce').dt.year
+    
+    # Category and location
+    df_clean['category'] = fill_category(chunk[cols['category']], 'other') if cols['category'] else 'other'
+    df_clean['location'] = fill_category(chunk[cols['location']], 'unknown') if cols['location'] else 'unknown'
+    
+    # Funding rounds
+    if cols['rounds']:
+        df_clean['funding_rounds'] = pd.to_numeric(chunk[cols['rounds']], errors='coerce').fillna(0).astype(np.int32)
+    else:
+        df_clean['funding_rounds'] = np.int32(1)
+    
+    # Clean data
+    df_clean = df_clean.dropna(subset=['founded_year'])
+    df_clean = df_clean[(df_clean['founded_year'] >= 1990) & (df_clean['founded_year'] <= 2024)]
+    df_clean = df_clean[df_clean['funding_total'] >= 0]
+    df_clean = df_clean[df_clean['status'].isin(SUCCESS_STATUSES + FAILURE_STATUSES)]
+    df_clean['founded_year'] = df_clean['founded_year'].astype(np.int32)
+    
+    return df_clean
+
+def read_source_data(data_file):
+    """Column-pruned, compact-dtype read; streams in chunks over the memory budget"""
+    start = time.time()
+    cols, n_columns = discover_columns(data_file)
+    
+    if not all([cols['status'], cols['funding'], cols['founded']]):
+        return None
+    
+    usecols = sorted({c for c in cols.values() if c})
+    dtypes = {cols[k]: 'category' for k in ('status', 'category', 'location') if cols[k]}
+    file_mb = os.path.getsize(data_file) / 1024 / 1024
+    
+    if file_mb > CONFIG['ingest_memory_budget_mb']:
+        print(f"   Streaming {file_mb:,.0f}MB in chunks of {CONFIG['ingest_chunk_rows']:,} rows...")
+        n_raw = 0
+        parts = []
+        for chunk in pd.read_csv(data_file, usecols=usecols, dtype=dtypes, chunksize=CONFIG['ingest_chunk_rows']):
+            n_raw += len(chunk)
+            parts.append(clean_chunk(chunk, cols))
+        df_clean = pd.concat(parts, ignore_index=True)
+        del parts
+    else:
+        engine = CONFIG['csv_engine']
+        if engine == 'pyarrow':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                engine = 'c'
+        raw = pd.read_csv(data_file, usecols=usecols, dtype=dtypes, engine=engine)
+        n_raw = len(raw)
+        df_clean = clean_chunk(raw, cols)
+        del raw
+    
+    # Chunks may disagree on categories; unify once at the end
+    for col in ['status', 'category', 'location']:
+        df_clean[col] = df_clean[col].astype('category')
+    
+    peak = peak_rss_mb()
+    print(f"   Loaded: {n_raw:,} rows | {len(usecols)}/{n_columns} columns | {time.time() - start:.1f}s"
+          + (f" | peak RSS {peak:,.0f}MB" if peak else ""))
+    print(f"   Usable: {len(df_clean):,} rows ({df_clean.memory_usage(deep=True).sum() / 1024 / 1024:.1f}MB)")
+    
+    return df_clean
+
+def load_and_clean_advanced(data_file, allow_synthetic=True):
     """IMPROVED data cleaning for better accuracy"""
-    print("\n[4/9] CLEANING & ENGINEERING...")
+    step("CLEANING & ENGINEERING...")
     
     if data_file is None or not os.path.exists(data_file):
+        if not allow_synthetic:
+            raise FileNotFoundError(f"Data file not found: {data_file}")
         print("   Using synthetic data...")
         return generate_quality_synthetic_data()
     
     try:
-        df = pd.read_csv(data_file, low_memory=False)
-        print(f"   Loaded: {len(df):,} rows")
-        
-        # Find columns flexibly
-        status_col = next((c for c in df.columns if 'status' in c.lower()), None)
-        funding_col = next((c for c in df.columns if 'funding' in c.lower() and 'total' in c.lower()), None)
-        founded_col = next((c for c in df.columns if 'founded' in c.lower()), None)
-        
-        if not all([status_col, funding_col, founded_col]):
+        df_clean = read_source_data(data_file)
+        if df_clean is None:
+            if not allow_synthetic:
+                raise ValueError(f"Missing key columns in {data_file}")
             print("   Missing key columns, using synthetic...")
             return generate_quality_synthetic_data()
         
-        # Extract key fields
-        df_clean = pd.DataFrame()
-        df_clean['status'] = df[status_col].str.lower().fillna('unknown')
-        df_clean['funding_total'] = pd.to_numeric(df[funding_col], errors='coerce').fillna(0)
-        
-        # Founded year
-        if 'founded_year' in df.columns:
-            df_clean['founded_year'] = pd.to_numeric(df['founded_year'], errors='coerce')
-        else:
-            df_clean['founded_year'] = pd.to_datetime(df[founded_col], errors='coerce').dt.year
-        
-        # Category and location
-        category_col = next((c for c in df.columns if 'category' in c.lower()), None)
-        location_col = next((c for c in df.columns if 'country' in c.lower() or 'region' in c.lower()), None)
-        
-        df_clean['category'] = df[category_col].fillna('other') if category_col else 'other'
-        df_clean['location'] = df[location_col].fillna('unknown') if location_col else 'unknown'
-        
-        # Funding rounds
-        rounds_col = next((c for c in df.columns if 'rounds' in c.lower()), None)
-        df_clean['funding_rounds'] = pd.to_numeric(df[rounds_col], errors='coerce').fillna(0) if rounds_col else 1
-        
-        # Clean data
-        df_clean = df_clean.dropna(subset=['founded_year'])
-        df_clean = df_clean[(df_clean['founded_year'] >= 1990) & (df_clean['founded_year'] <= 2024)]
-        df_clean = df_clean[df_clean['funding_total'] >= 0]
-        
         # SUCCESS LABEL
-        success_statuses = ['acquired', 'ipo']
-        failure_statuses = ['closed', 'dead']
-        
-        df_clean = df_clean[df_clean['status'].isin(success_statuses + failure_statuses)]
-        df_clean['success'] = df_clean['status'].isin(success_statuses).astype(int)
+        df_clean['success'] = df_clean['status'].isin(SUCCESS_STATUSES).astype(int)
         
         # BALANCE DATASET for better accuracy
         n_success = df_clean['success'].sum()
@@ -154,184 +324,129 @@ def load_and_clean_advanced(data_file):
         
         print(f"   After balance: {len(df_clean):,} samples ({df_clean['success'].mean():.1%} success)")
         
-        # ENHANCED FEATURES
-        df_clean['founded_year'] = df_clean['founded_year'].astype(int)
-        df_clean['company_age'] = 2025 - df_clean['founded_year']
-        
-        # Team size (better estimate)
-        df_clean['team_size'] = np.select(
-            [
-                df_clean['funding_total'] == 0,
-                df_clean['funding_total'] < 500_000,
-                df_clean['funding_total'] < 2_000_000,
-                df_clean['funding_total'] < 10_000_000,
-                df_clean['funding_total'] < 50_000_000
-            ],
-            [
-                np.random.randint(2, 5, len(df_clean)),
-                np.random.randint(3, 10, len(df_clean)),
-                np.random.randint(8, 25, len(df_clean)),
-                np.random.randint(20, 80, len(df_clean)),
-                np.random.randint(50, 200, len(df_clean))
-            ],
-            default=np.random.randint(100, 500, len(df_clean))
-        )
-        
-        # Financial metrics
-        df_clean['funding_per_round'] = df_clean['funding_total'] / (df_clean['funding_rounds'] + 1)
-        df_clean['funding_velocity'] = df_clean['funding_total'] / (df_clean['company_age'] + 1)
-        
-        # Revenue estimate (success-correlated)
-        df_clean['has_revenue'] = (np.random.random(len(df_clean)) < 0.3).astype(int)
-        df_clean['monthly_revenue'] = np.where(
-            df_clean['has_revenue'] == 1,
-            df_clean['funding_total'] * 0.02 * (df_clean['success'] + 0.5),
-            0
-        )
-        
-        df_clean['burn_rate'] = np.where(
-            df_clean['funding_total'] > 0,
-            df_clean['funding_total'] / 18 / 12,
-            df_clean['team_size'] * 5000
-        )
-        
-        df_clean['user_growth_rate'] = np.where(
-            df_clean['success'] == 1,
-            np.random.uniform(0.5, 2.5, len(df_clean)),
-            np.random.uniform(-0.2, 1.0, len(df_clean))
-        )
-        
-        df_clean['market_size'] = 10_000_000_000
-        df_clean['revenue_to_burn_ratio'] = df_clean['monthly_revenue'] / (df_clean['burn_rate'] + 1)
-        df_clean['funding_efficiency'] = df_clean['user_growth_rate'] * df_clean['funding_total'] / 1e6
-        
-        # Strengths/challenges (success-correlated)
-        df_clean['num_strengths'] = np.where(
-            df_clean['success'] == 1,
-            np.random.randint(3, 6, len(df_clean)),
-            np.random.randint(0, 3, len(df_clean))
-        )
-        df_clean['num_challenges'] = np.where(
-            df_clean['success'] == 1,
-            np.random.randint(1, 3, len(df_clean)),
-            np.random.randint(3, 6, len(df_clean))
-        )
-        df_clean['strength_to_challenge_ratio'] = df_clean['num_strengths'] / (df_clean['num_challenges'] + 1)
-        
-        # Text features
-        df_clean['description_length'] = 100
-        df_clean['problem_length'] = 50
-        
-        # Additional features
-        df_clean['runway_months'] = df_clean['funding_total'] / (df_clean['burn_rate'] * 12 + 1)
-        df_clean['is_well_funded'] = (df_clean['funding_total'] > 1_000_000).astype(int)
-        df_clean['optimal_age'] = ((df_clean['company_age'] >= 2) & (df_clean['company_age'] <= 6)).astype(int)
-        df_clean['optimal_team'] = ((df_clean['team_size'] >= 5) & (df_clean['team_size'] <= 50)).astype(int)
-        
-        # Location tier
         top_10_locations = df_clean['location'].value_counts().head(10).index
-        df_clean['location_tier'] = np.where(df_clean['location'].isin(top_10_locations), 1, 2)
-        
-        # Recession
-        df_clean['founded_in_recession'] = df_clean['founded_year'].isin([2008, 2009, 2020, 2023]).astype(int)
+        df_clean = engineer_features(df_clean, top_10_locations, np.random.default_rng(CONFIG['random_state']))
         
         print(f"✓ Final: {len(df_clean):,} samples | {len(df_clean.columns)} features")
         
         return df_clean
         
     except Exception as e:
+        if not allow_synthetic:
+            raise
         print(f"   Error: {e}")
         print("   Using synthetic...")
         return generate_quality_synthetic_data()
 
-def generate_quality_synthetic_data():
-    """HIGH QUALITY synthetic data"""
-    print("   Generating 12,000 high-quality samples...")
+def tier_one_locations(df):
+    """Locations the dataset put in location_tier 1, saved so new rows are tiered the same way"""
+    return sorted(df.loc[df['location_tier'] == 1, 'location'].astype(str).unique())
+
+def engineer_features(df_clean, top_locations, rng=None):
+    """Derived features for cleaned, labelled rows (works on a whole frame or one chunk)"""
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(df_clean)
+    success = df_clean['success'].to_numpy() == 1
+    funding = df_clean['funding_total'].to_numpy(np.float32)
     
-    n = 12000
+    def put(name, values):
+        df_clean[name] = np.asarray(values).astype(FEATURE_SCHEMA[name], copy=False)
     
-    categories = ['Technology', 'Healthcare', 'Fintech', 'E-commerce', 
-                  'SaaS', 'AI/ML', 'Consumer', 'Enterprise']
-    locations = ['USA', 'UK', 'India', 'China', 'Germany', 'Canada']
+    # ENHANCED FEATURES
+    put('founded_year', df_clean['founded_year'])
+    put('company_age', 2025 - df_clean['founded_year'])
+    company_age = df_clean['company_age'].to_numpy()
+    put('funding_rounds', df_clean['funding_rounds'])
     
-    df = pd.DataFrame()
+    # Team size (better estimate): one uniform draw scaled into the funding bucket's range
+    funding_bucket = np.where(
+        funding == 0, 0,
+        np.searchsorted([500_000, 2_000_000, 10_000_000, 50_000_000], funding, side='right') + 1
+    )
+    put('team_size', synthetic_data.bucket_integers(
+        rng, funding_bucket, [2, 3, 8, 20, 50, 100], [5, 10, 25, 80, 200, 500], np.int16
+    ))
+    team_size = df_clean['team_size'].to_numpy()
     
-    # Base features
-    df['category'] = np.random.choice(categories, n)
-    df['location'] = np.random.choice(locations, n)
-    df['founded_year'] = np.random.randint(2010, 2024, n)
-    df['company_age'] = 2025 - df['founded_year']
+    # Financial metrics
+    put('funding_per_round', funding / (df_clean['funding_rounds'].to_numpy() + 1))
+    put('funding_velocity', funding / (company_age + 1))
     
-    # Funding (realistic distribution)
-    df['funding_total'] = np.random.lognormal(13, 2, n)
-    df['funding_rounds'] = np.where(
-        df['funding_total'] < 1_000_000, np.random.randint(0, 2, n),
-        np.where(df['funding_total'] < 10_000_000, np.random.randint(1, 4, n),
-                 np.random.randint(2, 6, n))
-    )
+    # Revenue estimate (success-correlated)
+    has_revenue = rng.random(n) < 0.3
+    df_clean['has_revenue'] = has_revenue.astype(np.int8)
+    put('monthly_revenue', np.where(has_revenue, funding * np.float32(0.02) * (success + np.float32(0.5)), 0))
     
-    # Team
-    df['team_size'] = np.where(
-        df['funding_total'] < 1_000_000, np.random.randint(2, 10, n),
-        np.where(df['funding_total'] < 10_000_000, np.random.randint(8, 40, n),
-                 np.random.randint(30, 150, n))
-    )
+    put('burn_rate', np.where(funding > 0, funding / np.float32(18 * 12), team_size * np.float32(5000)))
+    burn_rate = df_clean['burn_rate'].to_numpy()
     
-    # Financial
-    df['funding_per_round'] = df['funding_total'] / (df['funding_rounds'] + 1)
-    df['funding_velocity'] = df['funding_total'] / (df['company_age'] + 1)
-    
-    df['has_revenue'] = (np.random.random(n) < 0.35).astype(int)
-    df['monthly_revenue'] = np.where(df['has_revenue'] == 1, df['funding_total'] * 0.02, 0)
-    df['burn_rate'] = df['funding_total'] / 18 / 12
-    df['user_growth_rate'] = np.random.uniform(-0.2, 2.0, n)
-    df['market_size'] = 10_000_000_000
-    
-    df['revenue_to_burn_ratio'] = df['monthly_revenue'] / (df['burn_rate'] + 1)
-    df['funding_efficiency'] = df['user_growth_rate'] * df['funding_total'] / 1e6
-    
-    # Strengths/challenges
-    df['num_strengths'] = np.random.randint(0, 6, n)
-    df['num_challenges'] = np.random.randint(1, 6, n)
-    df['strength_to_challenge_ratio'] = df['num_strengths'] / (df['num_challenges'] + 1)
-    
-    # Other
-    df['description_length'] = 100
-    df['problem_length'] = 50
-    df['runway_months'] = 12
-    df['is_well_funded'] = (df['funding_total'] > 1_000_000).astype(int)
-    df['optimal_age'] = ((df['company_age'] >= 2) & (df['company_age'] <= 6)).astype(int)
-    df['optimal_team'] = ((df['team_size'] >= 5) & (df['team_size'] <= 50)).astype(int)
-    df['location_tier'] = np.where(df['location'] == 'USA', 1, 2)
-    df['founded_in_recession'] = 0
-    
-    # SUCCESS (realistic formula)
-    df['success_score'] = (
-        df['is_well_funded'] * 15 +
-        df['optimal_age'] * 15 +
-        df['optimal_team'] * 15 +
-        (df['num_strengths'] > 2).astype(int) * 10 +
-        (df['num_challenges'] < 3).astype(int) * 10 +
-        (df['has_revenue'] == 1).astype(int) * 20 +
-        (df['user_growth_rate'] > 0.5).astype(int) * 15 +
-        np.random.normal(0, 15, n)
-    )
+    put('user_growth_rate', np.where(success, rng.uniform(0.5, 2.5, n), rng.uniform(-0.2, 1.0, n)))
+    
+    put('market_size', np.full(n, 10_000_000_000))
+    put('revenue_to_burn_ratio', df_clean['monthly_revenue'].to_numpy() / (burn_rate + 1))
+    put('funding_efficiency', df_clean['user_growth_rate'].to_numpy() * funding / np.float32(1e6))
+    
+    # Strengths/challenges (success-correlated)
+    put('num_strengths', np.where(success, rng.integers(3, 6, n), rng.integers(0, 3, n)))
+    put('num_challenges', np.where(success, rng.integers(1, 3, n), rng.integers(3, 6, n)))
+    put('strength_to_challenge_ratio',
+        df_clean['num_strengths'].to_numpy() / np.float32(df_clean['num_challenges'].to_numpy() + 1))
+    
+    # Text features
+    put('description_length', np.full(n, 100))
+    put('problem_length', np.full(n, 50))
     
-    df['success'] = (df['success_score'] > 50).astype(int)
+    # Additional features
+    put('runway_months', funding / (burn_rate * 12 + 1))
+    put('is_well_funded', funding > 1_000_000)
+    put('optimal_age', (company_age >= 2) & (company_age <= 6))
+    put('optimal_team', (team_size >= 5) & (team_size <= 50))
+    
+    # Location tier
+    put('location_tier', np.where(df_clean['location'].isin(top_locations), 1, 2))
+    
+    # Recession
+    put('founded_in_recession', df_clean['founded_year'].isin([2008, 2009, 2020, 2023]))
+    
+    return df_clean
+
+def generate_quality_synthetic_data():
+    """HIGH QUALITY synthetic data (seeded, see synthetic_data.py)"""
+    n = CONFIG['synthetic_rows']
+    print(f"   Generating {n:,} high-quality samples...")
+    
+    df = synthetic_data.generate(n, schema='auto_train', seed=CONFIG['random_state'])
     
     print(f"   ✓ Generated {len(df):,} samples ({df['success'].mean():.1%} success)")
     
     return df
 
+# Model feature -> source column for the two categoricals
+NATIVE_CATEGORICALS = {'category_encoded': 'category', 'location_encoded': 'location'}
+ENCODER_FILES = ['category_encoder.pkl', 'location_encoder.pkl']
+
 def encode_features(df):
     """Encode categorical features"""
-    print("\n[5/9] ENCODING...")
+    step("ENCODING...")
+    
+    if CONFIG['categorical_mode'] == 'native':
+        # Fixed, sorted category lists; XGBoost partitions them natively
+        for feature, source in NATIVE_CATEGORICALS.items():
+            values = df[source].astype(str)
+            df[feature] = pd.Categorical(values, categories=sorted(values.unique()))
+        for name in ENCODER_FILES:
+            path = os.path.join(CONFIG['models_dir'], name)
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"✓ Encoded (native categorical: {df['category_encoded'].cat.categories.size} categories, "
+              f"{df['location_encoded'].cat.categories.size} locations)")
+        return df
     
     le_category = LabelEncoder()
     le_location = LabelEncoder()
     
-    df['category_encoded'] = le_category.fit_transform(df['category'].astype(str))
-    df['location_encoded'] = le_location.fit_transform(df['location'].astype(str))
+    df['category_encoded'] = le_category.fit_transform(df['category'].astype(str)).astype(FEATURE_SCHEMA['category_encoded'])
+    df['location_encoded'] = le_location.fit_transform(df['location'].astype(str)).astype(FEATURE_SCHEMA['location_encoded'])
     
     joblib.dump(le_category, os.path.join(CONFIG['models_dir'], 'category_encoder.pkl'))
     joblib.dump(le_location, os.path.join(CONFIG['models_dir'], 'location_encoder.pkl'))
@@ -339,23 +454,96 @@ def encode_features(df):
     print("✓ Encoded")
     return df
 
+# Config keys whose values change the cleaned dataset
+DATASET_CONFIG_KEYS = ['random_state', 'synthetic_rows', 'categorical_mode']
+
+def file_fingerprint(path):
+    """Content hash of the raw input, memoized on (size, mtime) to skip re-reading"""
+    stat = os.stat(path)
+    memo_path = os.path.join(CONFIG['cache_dir'], 'file_hashes.json')
+    memo = {}
+    if os.path.exists(memo_path):
+        with open(memo_path) as f:
+            memo = json.load(f)
+    
+    abs_path = os.path.abspath(path)
+    memo_key = f"{abs_path}|{stat.st_size}|{stat.st_mtime_ns}"
+    if memo_key not in memo:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(8 << 20), b''):
+                digest.update(block)
+        # Forget deleted files and earlier versions of this one so the memo stays bounded
+        memo = {key: value for key, value in memo.items()
+                if key.rsplit('|', 2)[0] != abs_path and os.path.exists(key.rsplit('|', 2)[0])}
+        memo[memo_key] = digest.hexdigest()
+        with open(memo_path, 'w') as f:
+            json.dump(memo, f, indent=2)
+    
+    return memo[memo_key]
+
+def dataset_cache_key(data_file):
+    """Hash of raw input + cleaning/encoding code + relevant config"""
+    digest = hashlib.blake2b(digest_size=16)
+    if data_file and os.path.exists(data_file):
+        digest.update(file_fingerprint(data_file).encode())
+    else:
+        digest.update(b'synthetic')
+    
+    for stage in [load_and_clean_advanced, read_source_data, clean_chunk, engineer_features,
+                  generate_quality_synthetic_data, synthetic_data.auto_train_chunk, encode_features]:
+        digest.update(inspect.getsource(stage).encode())
+    
+    digest.update(json.dumps({k: CONFIG[k] for k in DATASET_CONFIG_KEYS}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def load_or_build_dataset(data_file):
+    """Cleaned + encoded dataset, from the Feather cache when inputs are unchanged"""
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        feather = None
+    
+    if not CONFIG['use_dataset_cache'] or feather is None:
+        return encode_features(load_and_clean_advanced(data_file))
+    
+    os.makedirs(CONFIG['cache_dir'], exist_ok=True)
+    key = dataset_cache_key(data_file)
+    data_path = os.path.join(CONFIG['cache_dir'], f'dataset_{key}.feather')
+    encoders_path = os.path.join(CONFIG['cache_dir'], f'encoders_{key}.pkl')
+    
+    if os.path.exists(data_path) and os.path.exists(encoders_path):
+        step(f"CLEANING & ENGINEERING... cached ({key[:12]})")
+        # Uncompressed Feather is memory-mapped, not parsed
+        df = feather.read_table(data_path, memory_map=True).to_pandas()
+        encoders = joblib.load(encoders_path)
+        for name, encoder in encoders.items():
+            joblib.dump(encoder, os.path.join(CONFIG['models_dir'], name))
+        print(f"✓ Loaded {len(df):,} samples from cache")
+        step("ENCODING... cached")
+        return df
+    
+    df = encode_features(load_and_clean_advanced(data_file))
+    
+    feather.write_feather(df.reset_index(drop=True), data_path, compression='uncompressed')
+    # Native categorical mode writes no encoders
+    joblib.dump({
+        name: joblib.load(os.path.join(CONFIG['models_dir'], name))
+        for name in ENCODER_FILES if os.path.exists(os.path.join(CONFIG['models_dir'], name))
+    }, encoders_path)
+    print(f"✓ Cached dataset ({key[:12]})")
+    return df
+
 def prepare_data(df):
     """Prepare features and labels"""
-    print("\n[6/9] PREPARING...")
-    
-    feature_cols = [
-        'funding_total', 'founded_year', 'team_size', 'funding_rounds',
-        'monthly_revenue', 'user_growth_rate', 'burn_rate', 'market_size',
-        'company_age', 'funding_per_round', 'funding_velocity',
-        'revenue_to_burn_ratio', 'funding_efficiency',
-        'category_encoded', 'location_encoded',
-        'num_strengths', 'num_challenges', 'strength_to_challenge_ratio',
-        'description_length', 'problem_length',
-        'runway_months', 'location_tier', 'founded_in_recession',
-        'is_well_funded', 'optimal_age', 'optimal_team'
-    ]
+    step("PREPARING...")
     
-    X = df[feature_cols]
+    feature_cols = FEATURE_COLUMNS
+    
+    # Cleaned data is built in FEATURE_SCHEMA dtypes already; this only touches stragglers
+    mismatched = {c: t for c, t in FEATURE_SCHEMA.items()
+                  if df[c].dtype != t and not isinstance(df[c].dtype, pd.CategoricalDtype)}
+    X = df[feature_cols].astype(mismatched) if mismatched else df[feature_cols]
     y = df['success']
     
     print(f"✓ Features: {len(feature_cols)}")
@@ -370,16 +558,9 @@ def prepare_data(df):
     
     return X_train, X_test, y_train, y_test, feature_cols
 
-def train_optimized(X_train, y_train, X_test, y_test, device):
-    """Train XGBoost with optimized parameters"""
-    print("\n[7/9] TRAINING OPTIMIZED MODEL...")
-    print(f"   Device: {device.upper()}")
-    
-    import time
-    start = time.time()
-    
-    # OPTIMIZED HYPERPARAMETERS FOR BETTER ACCURACY
-    params = {
+def optimized_params(device):
+    """OPTIMIZED HYPERPARAMETERS FOR BETTER ACCURACY"""
+    return {
         'device': device,
         'tree_method': 'hist',
         'max_depth': 6,
@@ -395,9 +576,44 @@ def train_optimized(X_train, y_train, X_test, y_test, device):
         'eval_metric': 'auc',
         'random_state': CONFIG['random_state']
     }
+
+def profile_cpu(X_train, y_train, device):
+    """Benchmark nthread/max_bin on the training data; CPU runs only"""
+    if device != 'cpu' or not CONFIG['cpu_autotune']:
+        return None
+    step("PROFILING CPU...")
     
-    dtrain = xgb.DMatrix(X_train, label=y_train)
-    dtest = xgb.DMatrix(X_test, label=y_test)
+    profile = cpu_profile.autotune(
+        X_train, y_train, optimized_params('cpu'),
+        bin_options=CONFIG['autotune_max_bins'],
+        rounds=CONFIG['autotune_rounds'],
+        max_auc_loss=CONFIG['autotune_max_auc_loss'],
+        max_rows=CONFIG['autotune_max_rows'],
+        seed=CONFIG['random_state']
+    )
+    
+    limit = profile['cgroup_cpu_limit']
+    print(f"   Cores: {profile['available_cpus']} usable / {profile['host_cpus']} host"
+          + (f" (cgroup quota {limit:g})" if limit else ""))
+    for t in profile['trials']:
+        print(f"   nthread={t['nthread']:3d} max_bin={t['max_bin']:4d} {t['seconds']:.3f}s AUC={t['auc']:.4f}")
+    default = profile['default_seconds']
+    print(f"✓ Selected nthread={profile['nthread']} max_bin={profile['max_bin']} | "
+          f"{profile['seconds']:.3f}s" + (f" vs {default:.3f}s at defaults" if default else "")
+          + f" for {profile['rounds']} rounds")
+    return profile
+
+def train_optimized(X_train, y_train, X_test, y_test, device, overrides=None, num_rounds=None):
+    """Train XGBoost with optimized parameters (exactly num_rounds if given, e.g. from CV)"""
+    step("TRAINING OPTIMIZED MODEL...")
+    print(f"   Device: {device.upper()}")
+    
+    start = time.time()
+    
+    params = {**optimized_params(device), **(overrides or {})}
+    
+    dtrain = xgb.DMatrix(X_train, label=y_train, enable_categorical=True)
+    dtest = xgb.DMatrix(X_test, label=y_test, enable_categorical=True)
     
     evals = [(dtrain, 'train'), (dtest, 'test')]
     
@@ -405,22 +621,46 @@ def train_optimized(X_train, y_train, X_test, y_test, device):
     model = xgb.train(
         params,
         dtrain,
-        num_boost_round=500,
+        num_boost_round=num_rounds or 500,
         evals=evals,
-        early_stopping_rounds=50,
+        early_stopping_rounds=None if num_rounds else 50,
         verbose_eval=100
     )
     
     elapsed = time.time() - start
     print(f"\n✓ Trained in {elapsed:.1f}s")
     
+    return attach_categories(model, X_train)
+
+def attach_categories(model, X):
+    """Store native category lists on the booster, so serving needs no encoders"""
+    categories = {
+        name: X[name].cat.categories.astype(str).tolist()
+        for name in X.columns if isinstance(X[name].dtype, pd.CategoricalDtype)
+    }
+    if categories:
+        model.set_attr(categories=json.dumps(categories))
     return model
 
+def feature_array(X):
+    """float32 matrix and XGBoost feature types; categoricals become codes (NaN if missing)"""
+    columns, types = [], []
+    for name in X.columns:
+        col = X[name]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes = col.cat.codes.to_numpy()
+            columns.append(np.where(codes < 0, np.nan, codes).astype(np.float32))
+            types.append('c')
+        else:
+            columns.append(col.to_numpy(np.float32))
+            types.append('q')
+    return np.column_stack(columns), types
+
 def evaluate(model, X_test, y_test):
     """Evaluate model performance"""
-    print("\n[8/9] EVALUATING...")
+    step("EVALUATING...")
     
-    dtest = xgb.DMatrix(X_test)
+    dtest = xgb.DMatrix(X_test, enable_categorical=True)
     y_pred_proba = model.predict(dtest)
     y_pred = (y_pred_proba > 0.5).astype(int)
     
@@ -444,9 +684,71 @@ def evaluate(model, X_test, y_test):
     
     return acc, auc
 
-def save_all(model, features, acc, auc):
+def drift_reference(model, X):
+    """Reference histograms for serving drift checks: quantile bin cuts + training counts"""
+    n_bins = CONFIG['drift_bins']
+    matrix, _ = feature_array(X)
+    cuts, counts = [], []
+    for j in range(matrix.shape[1]):
+        column = matrix[:, j]
+        column = column[~np.isnan(column)]
+        # Interior cut points; bin = number of cuts <= value
+        edges = np.unique(np.quantile(column, np.linspace(0, 1, n_bins + 1)).astype(np.float32))[1:]
+        cuts.append(edges.tolist())
+        counts.append(np.bincount(np.searchsorted(edges, column, side='right'), minlength=len(edges) + 1).tolist())
+    
+    prediction_cuts = np.linspace(0, 1, n_bins + 1)[1:-1].astype(np.float32)
+    proba = model.predict(xgb.DMatrix(X, enable_categorical=True))
+    return {
+        'features': list(X.columns),
+        'cuts': cuts,
+        'counts': counts,
+        'prediction': {
+            'cuts': prediction_cuts.tolist(),
+            'counts': np.bincount(np.searchsorted(prediction_cuts, proba, side='right'),
+                                  minlength=n_bins).tolist()
+        }
+    }
+
+def group_labels(X, feature):
+    """Raw category/location strings behind an encoded column (native or LabelEncoder)"""
+    column = X[feature]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.astype(str).to_numpy(dtype=str)
+    encoder = joblib.load(os.path.join(CONFIG['models_dir'], f"{NATIVE_CATEGORICALS[feature]}_encoder.pkl"))
+    return np.asarray(encoder.classes_, dtype=str)[column.to_numpy().astype(np.int64)]
+
+def model_fingerprint(model):
+    """Hash of the serialized booster; serving only ranks against scores from the same model"""
+    return hashlib.blake2b(bytes(model.save_raw('ubj')), digest_size=16).hexdigest()
+
+def score_distribution(model, X):
+    """Sorted model scores over the training population, overall and per category / location.
+    Per-group scores are stored back to back, sorted within each group, with group offsets."""
+    proba = model.predict(xgb.DMatrix(X, enable_categorical=True)).astype(np.float32)
+    arrays = {'all': np.sort(proba), 'model': np.array(model_fingerprint(model))}
+    for feature, source in NATIVE_CATEGORICALS.items():
+        labels, groups = np.unique(group_labels(X, feature), return_inverse=True)
+        order = np.lexsort((proba, groups))
+        arrays[f'{source}_labels'] = labels
+        arrays[f'{source}_offsets'] = np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=len(labels)))])
+        arrays[f'{source}_scores'] = proba[order]
+    return arrays
+
+def build_neighbor_index(X, y):
+    """Similar-startup index over the training population, saved next to the model"""
+    step("INDEXING NEIGHBOURS...")
+    matrix, _ = feature_array(X)
+    meta = neighbor_index.build(
+        matrix, y.to_numpy(), list(X.columns), os.path.join(CONFIG['models_dir'], 'neighbors'),
+        attributes={name: X[name].to_numpy() for name in CONFIG['neighbor_attributes']},
+        labels={source: group_labels(X, feature) for feature, source in NATIVE_CATEGORICALS.items()},
+        seed=CONFIG['random_state'])
+    print(f"✓ {meta['rows']:,} startups in {meta['n_lists']} lists (largest {meta['largest_list']:,})")
+
+def save_all(model, features, acc, auc, profile=None, reference=None, scores=None, top_locations=None):
     """Save model and metadata"""
-    print("\n[9/9] SAVING...")
+    step("SAVING...")
     
     joblib.dump(model, os.path.join(CONFIG['models_dir'], 'xgboost_model.pkl'))
     joblib.dump(features, os.path.join(CONFIG['models_dir'], 'feature_columns.pkl'))
@@ -458,23 +760,1170 @@ def save_all(model, features, acc, auc):
         'features': len(features),
         'device': 'cuda' if torch.cuda.is_available() else 'cpu'
     }
+    if profile:
+        metadata['training_profile'] = {k: v for k, v in profile.items() if k != 'trials'}
+    if reference:
+        metadata['drift_reference'] = reference
+    if top_locations is not None:
+        metadata['top_locations'] = list(top_locations)
     joblib.dump(metadata, os.path.join(CONFIG['models_dir'], 'model_metadata.pkl'))
-    
+
+    write_score_distribution(scores)
     print("✓ Saved")
 
-def main():
-    """Main training pipeline"""
+def write_score_distribution(scores):
+    """Score distribution for serving percentiles; a stale one would rank against another model"""
+    scores_path = os.path.join(CONFIG['models_dir'], 'score_distribution.npz')
+    if scores:
+        np.savez(scores_path, **scores)
+        print(f"✓ Score distribution: {len(scores['all']):,} startups")
+    elif os.path.exists(scores_path):
+        os.remove(scores_path)
+
+def count_tree_nodes(model):
+    """Total nodes across all trees - inference cost scales with this"""
+    return sum(len(tree.splitlines()) for tree in model.get_dump())
+
+def measure_latency(model, X, repeats=200):
+    """Median single-row latency (ms) and batch cost (us/row)"""
+    single = xgb.DMatrix(X.iloc[:1], enable_categorical=True)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(single)
+        timings.append(time.perf_counter() - start)
+
+    batch = xgb.DMatrix(X, enable_categorical=True)
+    start = time.perf_counter()
+    model.predict(batch)
+    batch_elapsed = time.perf_counter() - start
+
+    return float(np.median(timings) * 1000), float(batch_elapsed / len(X) * 1e6)
+
+def compact_model(model, X_train, y_train, X_test, y_test, device):
+    """Find the smallest ensemble within the AUC budget and save it
+
+    Candidates are cut, early-stopped and selected on a validation split of the training
+    rows; the test set is only used to report the AUC of each candidate. The teacher has
+    seen the validation rows, so its validation AUC is optimistic and the budget errs
+    towards keeping more trees.
+    """
+    step("COMPACTING...")
+
+    max_loss = CONFIG['compaction_max_auc_loss']
+    X_fit, X_valid, _, y_valid = train_test_split(
+        X_train, y_train, test_size=CONFIG['compaction_valid_size'],
+        random_state=CONFIG['random_state'], stratify=y_train
+    )
+    dvalid = xgb.DMatrix(X_valid, label=y_valid, enable_categorical=True)
+    dtest = xgb.DMatrix(X_test, enable_categorical=True)
+    full_valid_auc = roc_auc_score(y_valid, model.predict(dvalid))
+    n_rounds = model.num_boosted_rounds()
+
+    candidates = [('full', model, full_valid_auc)]
+
+    # 1) Iteration-range cut: keep only the first k boosting rounds
+    for k in sorted(set(np.linspace(1, n_rounds, 25).astype(int))):
+        auc = roc_auc_score(y_valid, model.predict(dvalid, iteration_range=(0, int(k))))
+        if auc >= full_valid_auc - max_loss:
+            candidates.append((f'cut@{k}', model[:int(k)], auc))
+            break
+
+    # 2) Distillation: shallow student fit on the teacher's probabilities
+    teacher_scores = model.predict(xgb.DMatrix(X_fit, enable_categorical=True))
+    dstudent = xgb.DMatrix(X_fit, label=teacher_scores, enable_categorical=True)
+
+    for depth in CONFIG['compaction_student_depths']:
+        params = {
+            'device': device,
+            'tree_method': 'hist',
+            'max_depth': depth,
+            'learning_rate': 0.1,
+            'objective': 'binary:logistic',
+            'eval_metric': 'auc',
+            'random_state': CONFIG['random_state']
+        }
+        student = xgb.train(
+            params,
+            dstudent,
+            num_boost_round=n_rounds,
+            evals=[(dvalid, 'valid')],
+            early_stopping_rounds=30,
+            verbose_eval=False
+        )
+        student = student[:student.best_iteration + 1]
+        auc = roc_auc_score(y_valid, student.predict(dvalid))
+        candidates.append((f'distill_depth{depth}', student, auc))
+
+    # Smallest ensemble that stays within the AUC budget on the validation split
+    report_rows = []
+    for name, booster, valid_auc in candidates:
+        report_rows.append({
+            'method': name,
+            'trees': booster.num_boosted_rounds(),
+            'nodes': count_tree_nodes(booster),
+            'valid_auc': float(valid_auc),
+            'auc': float(roc_auc_score(y_test, booster.predict(dtest))),
+            'within_budget': bool(valid_auc >= full_valid_auc - max_loss)
+        })
+
+    eligible = [i for i, row in enumerate(report_rows) if row['within_budget']]
+    best_idx = min(eligible, key=lambda i: report_rows[i]['nodes'])
+    best_name, best_model, _ = candidates[best_idx]
+    full_auc, best_auc = report_rows[0]['auc'], report_rows[best_idx]['auc']
+
+    full_single_ms, full_batch_us = measure_latency(model, X_test)
+    compact_single_ms, compact_batch_us = measure_latency(best_model, X_test)
+
+    for row in report_rows:
+        print(f"   {row['method']:18s} trees={row['trees']:4d} nodes={row['nodes']:6d} "
+              f"valid AUC={row['valid_auc']:.4f} test AUC={row['auc']:.4f}"
+              f"{'' if row['within_budget'] else '  (over budget)'}")
+
+    report = {
+        'created': datetime.now().isoformat(),
+        'max_auc_loss': max_loss,
+        'selected': best_name,
+        'full': {
+            **report_rows[0],
+            'latency_single_ms': full_single_ms,
+            'latency_batch_us_per_row': full_batch_us
+        },
+        'compact': {
+            **report_rows[best_idx],
+            'latency_single_ms': compact_single_ms,
+            'latency_batch_us_per_row': compact_batch_us
+        },
+        'candidates': report_rows
+    }
+
+    attach_categories(best_model, X_train)
+    joblib.dump(best_model, os.path.join(CONFIG['models_dir'], 'xgboost_model_compact.pkl'))
+    with open(os.path.join(CONFIG['models_dir'], 'compaction_report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✓ Selected: {best_name} | nodes {report_rows[0]['nodes']:,} → {report_rows[best_idx]['nodes']:,} "
+          f"| AUC {full_auc:.4f} → {best_auc:.4f}")
+    print(f"✓ Latency: {full_single_ms:.3f}ms → {compact_single_ms:.3f}ms per request")
+
+    return best_model, report
+
+# ==================== HYPERPARAMETER SEARCH ====================
+
+def sample_config(rng):
+    """One random configuration from the search space"""
+    log_uniform = lambda lo, hi: float(np.exp(rng.uniform(np.log(lo), np.log(hi))))
+    return {
+        'max_depth': int(rng.integers(3, 11)),
+        'learning_rate': log_uniform(0.01, 0.3),
+        'subsample': float(rng.uniform(0.5, 1.0)),
+        'colsample_bytree': float(rng.uniform(0.5, 1.0)),
+        'reg_alpha': log_uniform(1e-3, 10),
+        'reg_lambda': log_uniform(1e-2, 10),
+        'min_child_weight': log_uniform(1, 20),
+        'gamma': float(rng.uniform(0, 1))
+    }
+
+# Per-worker binned data, built once by the pool initializer
+_search_data = {}
+
+def _init_search_worker(X_fit, y_fit, X_valid, y_valid, feature_types, nthread):
+    dtrain = xgb.QuantileDMatrix(X_fit, label=y_fit, feature_types=feature_types,
+                                 enable_categorical=True, nthread=nthread)
+    _search_data['dtrain'] = dtrain
+    _search_data['dvalid'] = xgb.QuantileDMatrix(X_valid, label=y_valid, ref=dtrain, feature_types=feature_types,
+                                                 enable_categorical=True, nthread=nthread)
+    _search_data['nthread'] = nthread
+
+def _run_search_job(config, rounds, model_raw):
+    """Train one trial for `rounds` more rounds, resuming from its previous rung"""
+    params = {
+        'tree_method': 'hist',
+        'objective': 'binary:logistic',
+        'eval_metric': 'auc',
+        'nthread': _search_data['nthread'],
+        'random_state': CONFIG['random_state'],
+        **config
+    }
+    previous = xgb.Booster(model_file=model_raw) if model_raw else None
+    start_rounds = previous.num_boosted_rounds() if previous else 0
+    history = {}
+    
+    booster = xgb.train(
+        params,
+        _search_data['dtrain'],
+        num_boost_round=rounds,
+        evals=[(_search_data['dvalid'], 'valid')],
+        early_stopping_rounds=CONFIG['search_early_stopping'],
+        evals_result=history,
+        xgb_model=previous,
+        verbose_eval=False
+    )
+    
+    done = booster.num_boosted_rounds()
+    stopped = done - start_rounds < rounds
+    return max(history['valid']['auc']), booster.save_raw('ubj'), done, stopped
+
+def search_hyperparameters(X_train, y_train, n_trials):
+    """Asynchronous successive halving (ASHA) over random configs, in parallel"""
+    step(f"SEARCHING {n_trials} CONFIGS (async successive halving)...")
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    
+    start = time.time()
+    rng = np.random.default_rng(CONFIG['random_state'])
+    X, feature_types = feature_array(X_train)
+    X_fit, X_valid, y_fit, y_valid = train_test_split(
+        X, y_train.to_numpy(np.float32),
+        test_size=CONFIG['test_size'], random_state=CONFIG['random_state'], stratify=y_train
+    )
+    
+    # Rung budgets in boosting rounds: min, min*eta, ... up to max
+    eta = CONFIG['search_eta']
+    budgets = []
+    budget = CONFIG['search_min_rounds']
+    while budget < CONFIG['search_max_rounds']:
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(CONFIG['search_max_rounds'])
+    
+    threads = CONFIG['search_threads_per_worker']
+    workers = max(1, cpu_profile.available_cpus() // threads)
+    print(f"   Workers: {workers} x {threads} threads | Rungs: {budgets}")
+    
+    trials = [{'id': i, 'params': sample_config(rng), 'rung': -1, 'auc': 0.0,
+               'rounds': 0, 'stopped': False, 'model': None} for i in range(n_trials)]
+    rung_results = [[] for _ in budgets]
+    promoted = [set() for _ in budgets]
+    next_new = 0
+    
+    def next_job():
+        """Promote the best unpromoted top-1/eta trial of the highest rung, else start a new one"""
+        nonlocal next_new
+        for k in range(len(budgets) - 2, -1, -1):
+            ranked = sorted(rung_results[k], reverse=True)
+            for auc, tid in ranked[:len(ranked) // eta]:
+                if tid not in promoted[k] and not trials[tid]['stopped']:
+                    promoted[k].add(tid)
+                    return tid, k + 1
+        if next_new < n_trials:
+            next_new += 1
+            return next_new - 1, 0
+        return None
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                             initargs=(X_fit, y_fit, X_valid, y_valid, feature_types, threads)) as pool:
+        running = {}
+        
+        def fill_workers():
+            while len(running) < workers:
+                job = next_job()
+                if job is None:
+                    return
+                tid, rung = job
+                trial = trials[tid]
+                future = pool.submit(_run_search_job, trial['params'], budgets[rung] - trial['rounds'], trial['model'])
+                running[future] = (tid, rung)
+        
+        fill_workers()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                tid, rung = running.pop(future)
+                auc, model_raw, rounds, stopped = future.result()
+                trial = trials[tid]
+                trial.update({'rung': rung, 'auc': max(trial['auc'], auc), 'rounds': rounds,
+                              'stopped': stopped, 'model': model_raw})
+                rung_results[rung].append((trial['auc'], tid))
+            fill_workers()
+    
+    # A trial is converged once early stopping fired or it reached the last rung
+    for t in trials:
+        t['converged'] = t['stopped'] or t['rung'] == len(budgets) - 1
+    leaderboard = sorted(trials, key=lambda t: (t['converged'], t['auc'], t['rung']), reverse=True)
+    leaderboard = [{k: v for k, v in t.items() if k != 'model'} for t in leaderboard]
+    best = leaderboard[0]
+    
+    with open(os.path.join(CONFIG['models_dir'], 'hpo_leaderboard.json'), 'w') as f:
+        json.dump({'budgets': budgets, 'eta': eta, 'trials': leaderboard}, f, indent=2)
+    with open(os.path.join(CONFIG['models_dir'], 'best_params.json'), 'w') as f:
+        json.dump({'params': best['params'], 'valid_auc': best['auc'], 'rounds': best['rounds']}, f, indent=2)
+    
+    total_rounds = sum(t['rounds'] for t in trials)
+    print(f"✓ Searched in {time.time() - start:.1f}s | {total_rounds:,} rounds "
+          f"(vs {n_trials * budgets[-1]:,} without halving)")
+    for i, t in enumerate(leaderboard[:5], 1):
+        print(f"   {i}. trial {t['id']:3d} rung {t['rung']} rounds {t['rounds']:4d} AUC {t['auc']:.4f}")
+    
+    return best['params']
+
+# ==================== CROSS-VALIDATION ====================
+
+# Per-worker data; quantile cuts are sketched once and shared by every fold
+_cv_data = {}
+
+def _init_cv_worker(X, y, feature_types, nthread):
+    _cv_data['X'], _cv_data['y'], _cv_data['nthread'] = X, y, nthread
+    _cv_data['types'] = feature_types
+    _cv_data['cuts'] = xgb.QuantileDMatrix(X, label=y, feature_types=feature_types,
+                                           enable_categorical=True, nthread=nthread)
+
+def _run_cv_fold(params, train_idx, valid_idx, max_rounds):
+    """Train one fold, return its validation AUC and error curves"""
+    X, y, cuts = _cv_data['X'], _cv_data['y'], _cv_data['cuts']
+    nthread, types = _cv_data['nthread'], _cv_data['types']
+    dtrain = xgb.QuantileDMatrix(X[train_idx], label=y[train_idx], ref=cuts, feature_types=types,
+                                 enable_categorical=True, nthread=nthread)
+    dvalid = xgb.QuantileDMatrix(X[valid_idx], label=y[valid_idx], ref=dtrain, feature_types=types,
+                                 enable_categorical=True, nthread=nthread)
+    history = {}
+    xgb.train(
+        {**params, 'nthread': nthread, 'eval_metric': ['error', 'auc']},
+        dtrain,
+        num_boost_round=max_rounds,
+        evals=[(dvalid, 'valid')],
+        early_stopping_rounds=CONFIG['cv_early_stopping'],
+        evals_result=history,
+        verbose_eval=False
+    )
+    return history['valid']['auc'], history['valid']['error']
+
+def cross_validate(X_train, y_train, n_folds, overrides=None):
+    """Stratified k-fold CV, folds in parallel; picks the round count from the mean curve"""
+    step(f"CROSS-VALIDATING ({n_folds} folds)...")
+    from concurrent.futures import ProcessPoolExecutor
+    
+    start = time.time()
+    X, feature_types = feature_array(X_train)
+    y = y_train.to_numpy(np.float32)
+    # Folds run on CPU workers; the final model still trains on the chosen device
+    params = {**optimized_params('cpu'), **(overrides or {})}
+    
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=CONFIG['random_state'])
+    splits = list(folds.split(X, y))
+    cpus = cpu_profile.available_cpus()
+    workers = min(n_folds, cpus)
+    threads = max(1, cpus // workers)
+    print(f"   Workers: {workers} x {threads} threads")
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_cv_worker,
+                             initargs=(X, y, feature_types, threads)) as pool:
+        curves = list(pool.map(_run_cv_fold, [params] * n_folds,
+                               [tr for tr, _ in splits], [va for _, va in splits],
+                               [CONFIG['cv_max_rounds']] * n_folds))
+    
+    # Folds stop at different rounds; compare them over the common prefix
+    length = min(len(auc) for auc, _ in curves)
+    auc_curves = np.array([auc[:length] for auc, _ in curves])
+    error_curves = np.array([err[:length] for _, err in curves])
+    best_round = int(auc_curves.mean(axis=0).argmax())
+    
+    fold_auc = auc_curves[:, best_round]
+    fold_acc = 1 - error_curves[:, best_round]
+    report = {
+        'folds': n_folds,
+        'rounds': best_round + 1,
+        'auc_mean': float(fold_auc.mean()),
+        'auc_var': float(fold_auc.var()),
+        'accuracy_mean': float(fold_acc.mean()),
+        'accuracy_var': float(fold_acc.var()),
+        'fold_auc': fold_auc.tolist(),
+        'fold_accuracy': fold_acc.tolist()
+    }
+    with open(os.path.join(CONFIG['models_dir'], 'cv_report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"✓ CV in {time.time() - start:.1f}s | Best rounds: {report['rounds']}")
+    print(f"   AUC: {report['auc_mean']:.4f} ± {np.sqrt(report['auc_var']):.4f}")
+    print(f"   Accuracy: {report['accuracy_mean']:.2%} ± {np.sqrt(report['accuracy_var']):.2%}")
+    
+    return report
+
+# ==================== DISTRIBUTED TRAINING ====================
+
+def _distributed_worker(rank, comm_args, train_path, test_path, params, num_rounds, early_stopping, model_path):
+    """One data-parallel worker: trains on its own partition inside the collective; rank 0 saves the model"""
+    import pyarrow.feather as feather
+    train = feather.read_feather(train_path)
+    test = feather.read_feather(test_path)
+    
+    with xgb.collective.CommunicatorContext(**comm_args, dmlc_task_id=str(rank)):
+        dtrain = xgb.DMatrix(train.drop(columns='success'), label=train['success'], enable_categorical=True)
+        dtest = xgb.DMatrix(test.drop(columns='success'), label=test['success'], enable_categorical=True)
+        # Histograms and metrics are allreduced, so every rank grows the same trees
+        model = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=num_rounds,
+            evals=[(dtest, 'test')],
+            early_stopping_rounds=early_stopping,
+            verbose_eval=100 if rank == 0 else False
+        )
+    if rank == 0:
+        model.save_model(model_path)
+
+def write_partitions(X, y, n_parts, name):
+    """Random row partitions as uncompressed Feather files, one per worker"""
+    import pyarrow.feather as feather
+    part_dir = os.path.join(CONFIG['cache_dir'], 'distributed')
+    os.makedirs(part_dir, exist_ok=True)
+    
+    order = np.random.default_rng(CONFIG['random_state']).permutation(len(X))
+    paths = []
+    for rank, rows in enumerate(np.array_split(order, n_parts)):
+        rows = np.sort(rows)
+        part = X.iloc[rows].assign(success=y.iloc[rows].to_numpy()).reset_index(drop=True)
+        path = os.path.join(part_dir, f'{name}_{rank}of{n_parts}.feather')
+        feather.write_feather(part, path, compression='uncompressed')
+        paths.append(path)
+    return paths
+
+def train_distributed(X_train, y_train, X_test, y_test, device, n_workers, overrides=None, num_rounds=None):
+    """Data-parallel training over local processes joined by XGBoost's collective allreduce"""
+    step(f"TRAINING DISTRIBUTED ({n_workers} workers)...")
+    import multiprocessing.connection
+    from xgboost.tracker import RabitTracker
+    
+    start = time.time()
+    train_paths = write_partitions(X_train, y_train, n_workers, 'train')
+    test_paths = write_partitions(X_test, y_test, n_workers, 'test')
+    
+    threads = max(1, cpu_profile.available_cpus() // n_workers)
+    params = {**optimized_params(device), **(overrides or {}), 'nthread': threads}
+    print(f"   Workers: {n_workers} x {threads} threads | ~{len(X_train) // n_workers:,} rows each")
+    
+    model_path = os.path.join(CONFIG['cache_dir'], 'distributed', 'model.ubj')
+    if os.path.exists(model_path):
+        os.remove(model_path)
+    tracker = RabitTracker(n_workers=n_workers, host_ip='127.0.0.1', sortby='task')
+    tracker.start()
+    comm_args = tracker.worker_args()
+    processes = [
+        multiprocessing.Process(
+            target=_distributed_worker,
+            args=(rank, comm_args, train_paths[rank], test_paths[rank], params,
+                  num_rounds or 500, None if num_rounds else 50, model_path),
+            daemon=True
+        )
+        for rank in range(n_workers)
+    ]
+    
+    finished = False
+    try:
+        for process in processes:
+            process.start()
+        deadline = time.time() + CONFIG['distributed_timeout_s']
+        running = list(processes)
+        while running:
+            multiprocessing.connection.wait([p.sentinel for p in running], timeout=max(0, deadline - time.time()))
+            running = [p for p in running if p.is_alive()]
+            # Peers of a failed worker would block in allreduce forever, so fail fast
+            failed = [p for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"Distributed worker exited with code {failed[0].exitcode}")
+            if running and time.time() >= deadline:
+                raise TimeoutError(f"Distributed training exceeded {CONFIG['distributed_timeout_s']}s")
+        tracker.wait_for(timeout=CONFIG['distributed_shutdown_timeout_s'])
+        finished = True
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            if process.pid is not None:
+                process.join()
+        try:
+            tracker.free()
+        except xgb.core.XGBoostError:
+            # After a failed run the tracker only repeats that workers went away
+            if finished:
+                raise
+    
+    model = xgb.Booster(model_file=model_path)
+    print(f"\n✓ Trained in {time.time() - start:.1f}s | {model.num_boosted_rounds()} trees")
+    return attach_categories(model, X_train)
+
+def benchmark_distributed(X_train, y_train, X_test, y_test, device, max_workers):
+    """Training wall time and AUC against worker count, fixed round count"""
+    rounds = CONFIG['scaling_benchmark_rounds']
+    rows = []
+    for n_workers in cpu_profile.thread_candidates(max_workers):
+        start = time.time()
+        model = train_distributed(X_train, y_train, X_test, y_test, device, n_workers, num_rounds=rounds)
+        seconds = time.time() - start
+        auc = roc_auc_score(y_test, model.predict(xgb.DMatrix(X_test, enable_categorical=True)))
+        rows.append({'workers': n_workers, 'seconds': round(seconds, 3), 'auc': float(auc)})
+    
+    for row in rows:
+        row['speedup'] = round(rows[0]['seconds'] / row['seconds'], 2)
+    report = {
+        'created': datetime.now().isoformat(),
+        'train_rows': len(X_train),
+        'rounds': rounds,
+        'available_cpus': cpu_profile.available_cpus(),
+        'runs': rows
+    }
+    with open(os.path.join(CONFIG['models_dir'], 'distributed_scaling.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📈 SCALING ({len(X_train):,} rows, {rounds} rounds):")
+    for row in rows:
+        print(f"   {row['workers']:3d} workers  {row['seconds']:8.2f}s  x{row['speedup']:<5}  AUC={row['auc']:.4f}")
+    return report
+
+def main_scaling_benchmark(max_workers):
+    """Distributed-training scaling benchmark on the current dataset"""
+    try:
+        device = check_gpu()
+        setup_directories()
+        df = load_or_build_dataset(download_data())
+        X_train, X_test, y_train, y_test, _ = prepare_data(df)
+        del df
+        benchmark_distributed(X_train, y_train, X_test, y_test, device, max_workers)
+    except KeyboardInterrupt:
+        print("\n\n⚠ Benchmark interrupted")
+    except Exception as e:
+        print(f"\n❌ Failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+# ==================== EXTERNAL-MEMORY TRAINING ====================
+
+def write_feature_shards(data_file):
+    """Two streaming passes over the CSV: global stats, then engineered Parquet shards.
+    Returns the shard paths and the vocabulary they were encoded with (tier-1 locations and,
+    in native categorical mode, the category lists)."""
+    step("SHARDING...")
+    start = time.time()
+    cols, _ = discover_columns(data_file)
+    if not all([cols['status'], cols['funding'], cols['founded']]):
+        raise ValueError(f"Missing key columns in {data_file}")
+    
+    key = dataset_cache_key(data_file)
+    shard_dir = os.path.join(CONFIG['cache_dir'], f'shards_{key}')
+    encoders_path = os.path.join(shard_dir, 'encoders.pkl')
+    vocab_path = os.path.join(shard_dir, 'vocab.json')
+    done_marker = os.path.join(shard_dir, '_SUCCESS')
+    
+    if os.path.exists(done_marker) and os.path.exists(vocab_path):
+        install_shard_encoders(joblib.load(encoders_path))
+        with open(vocab_path) as f:
+            vocab = json.load(f)
+        shards = sorted(f for f in os.listdir(shard_dir) if f.endswith('.parquet'))
+        print(f"✓ {len(shards)} shards cached ({key[:12]})")
+        return [os.path.join(shard_dir, f) for f in shards], vocab
+    
+    os.makedirs(shard_dir, exist_ok=True)
+    usecols = sorted({c for c in cols.values() if c})
+    dtypes = {cols[k]: 'category' for k in ('status', 'category', 'location') if cols[k]}
+    read_chunks = lambda: pd.read_csv(data_file, usecols=usecols, dtype=dtypes,
+                                      chunksize=CONFIG['ingest_chunk_rows'])
+    
+    # Pass 1: label balance, label-encoder vocabularies and location counts per class
+    n_success = n_usable = 0
+    categories = set()
+    location_counts = {0: pd.Series(dtype=np.int64), 1: pd.Series(dtype=np.int64)}
+    for chunk in read_chunks():
+        chunk = clean_chunk(chunk, cols)
+        success = chunk['status'].isin(SUCCESS_STATUSES).to_numpy()
+        n_success += int(success.sum())
+        n_usable += len(chunk)
+        categories.update(chunk['category'].astype(str).unique())
+        for label, rows in [(0, ~success), (1, success)]:
+            counts = chunk.loc[rows, 'location'].astype(str).value_counts()
+            location_counts[label] = location_counts[label].add(counts, fill_value=0)
+    
+    # Same undersampling as load_and_clean_advanced, applied as a per-row keep rate
+    n_failure = n_usable - n_success
+    keep_rate = {0: 1.0, 1: 1.0}
+    if n_success > n_failure * 1.5:
+        keep_rate[1] = n_failure * 1.2 / n_success
+    elif n_failure > n_success * 1.5:
+        keep_rate[0] = n_success * 1.2 / n_failure
+    print(f"   Usable: {n_usable:,} rows | Success: {n_success:,} | Failure: {n_failure:,}")
+    
+    # Tiers come from the balanced rows, as in load_and_clean_advanced: each class's location
+    # counts scaled by its keep rate
+    balanced_counts = location_counts[0].mul(keep_rate[0]).add(location_counts[1].mul(keep_rate[1]), fill_value=0)
+    top_locations = balanced_counts.sort_values(ascending=False, kind='stable').head(10).index
+    
+    le_category = LabelEncoder().fit(sorted(categories))
+    le_location = LabelEncoder().fit(balanced_counts.index.astype(str))
+    encoders = {'category_encoder.pkl': le_category, 'location_encoder.pkl': le_location}
+    install_shard_encoders(encoders)
+    vocab = {'top_locations': sorted(top_locations.astype(str))}
+    if CONFIG['categorical_mode'] == 'native':
+        # LabelEncoder classes are sorted, so shard codes are also native category codes
+        vocab['categories'] = {'category_encoded': le_category.classes_.tolist(),
+                               'location_encoded': le_location.classes_.tolist()}
+    
+    # Pass 2: clean, balance, engineer and encode chunk by chunk
+    rng = np.random.default_rng(CONFIG['random_state'])
+    paths = []
+    n_rows = 0
+    for i, chunk in enumerate(read_chunks()):
+        chunk = clean_chunk(chunk, cols)
+        chunk['success'] = chunk['status'].isin(SUCCESS_STATUSES).astype(int)
+        chunk = chunk[rng.random(len(chunk)) < chunk['success'].map(keep_rate).to_numpy()]
+        if chunk.empty:
+            continue
+        chunk = engineer_features(chunk, top_locations, rng)
+        chunk['category_encoded'] = le_category.transform(chunk['category'].astype(str)).astype(FEATURE_SCHEMA['category_encoded'])
+        chunk['location_encoded'] = le_location.transform(chunk['location'].astype(str)).astype(FEATURE_SCHEMA['location_encoded'])
+        
+        path = os.path.join(shard_dir, f'shard_{i:05d}.parquet')
+        chunk[FEATURE_COLUMNS + ['success']].astype(np.float32).to_parquet(path, index=False)
+        paths.append(path)
+        n_rows += len(chunk)
+    
+    joblib.dump(encoders, encoders_path)
+    with open(vocab_path, 'w') as f:
+        json.dump(vocab, f)
+    open(done_marker, 'w').close()
+    peak = peak_rss_mb()
+    print(f"✓ {len(paths)} shards | {n_rows:,} rows | {time.time() - start:.1f}s"
+          + (f" | peak RSS {peak:,.0f}MB" if peak else ""))
+    return paths, vocab
+
+def install_shard_encoders(encoders):
+    """Label mode serves through the shard encoders; native mode must not leave stale ones behind"""
+    for name, encoder in encoders.items():
+        path = os.path.join(CONFIG['models_dir'], name)
+        if CONFIG['categorical_mode'] != 'native':
+            joblib.dump(encoder, path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+def shard_feature_types():
+    return ['c' if CONFIG['categorical_mode'] == 'native' and f in NATIVE_CATEGORICALS else 'q'
+            for f in FEATURE_COLUMNS]
+
+def shard_frame(paths, vocab):
+    """Feature frame of some shards, with native categoricals restored from their codes"""
+    frame = pd.concat([pd.read_parquet(p, columns=FEATURE_COLUMNS) for p in paths], ignore_index=True)
+    for feature, categories in vocab.get('categories', {}).items():
+        frame[feature] = pd.Categorical.from_codes(frame[feature].astype(np.int64), categories=categories)
+    return frame
+
+def split_shards(paths):
+    """Train/test split at shard granularity, so no shard is read by both sides"""
+    if len(paths) < 2:
+        raise ValueError("External-memory training needs at least 2 shards; "
+                         "lower ingest_chunk_rows or use the in-memory path")
+    order = np.random.default_rng(CONFIG['random_state']).permutation(len(paths))
+    n_test = min(len(paths) - 1, max(1, round(len(paths) * CONFIG['test_size'])))
+    test = [paths[i] for i in sorted(order[:n_test])]
+    train = [paths[i] for i in sorted(order[n_test:])]
+    return train, test
+
+class ShardIter(xgb.DataIter):
+    """Feeds XGBoost one Parquet shard at a time"""
+    
+    def __init__(self, paths, cache_prefix):
+        self._paths = paths
+        self._it = 0
+        super().__init__(cache_prefix=cache_prefix)
+    
+    def next(self, input_data):
+        if self._it == len(self._paths):
+            return False
+        shard = pd.read_parquet(self._paths[self._it])
+        input_data(data=shard[FEATURE_COLUMNS].to_numpy(), label=shard['success'].to_numpy(),
+                   feature_names=FEATURE_COLUMNS, feature_types=shard_feature_types())
+        self._it += 1
+        return True
+    
+    def reset(self):
+        self._it = 0
+
+def external_dmatrix(paths, name, ref=None):
+    """Quantised external-memory matrix when available, else paged DMatrix"""
+    cache_prefix = os.path.join(CONFIG['cache_dir'], 'xgb_pages', name)
+    os.makedirs(os.path.dirname(cache_prefix), exist_ok=True)
+    it = ShardIter(paths, cache_prefix)
+    native = CONFIG['categorical_mode'] == 'native'
+    if hasattr(xgb, 'ExtMemQuantileDMatrix'):
+        return xgb.ExtMemQuantileDMatrix(it, ref=ref, enable_categorical=native)
+    return xgb.DMatrix(it, enable_categorical=native)
+
+def train_external(train_paths, test_paths, device):
+    """Train from on-disk shards; only one shard is resident while building pages"""
+    step("TRAINING (external memory)...")
+    print(f"   Device: {device.upper()} | Train shards: {len(train_paths)} | Test shards: {len(test_paths)}")
+    
+    start = time.time()
+    dtrain = external_dmatrix(train_paths, 'train')
+    dtest = external_dmatrix(test_paths, 'test', ref=dtrain)
+    print(f"   Pages built in {time.time() - start:.1f}s")
+    
+    params = optimized_params(device)
+    model = xgb.train(
+        params,
+        dtrain,
+        num_boost_round=500,
+        evals=[(dtrain, 'train'), (dtest, 'test')],
+        early_stopping_rounds=50,
+        verbose_eval=50
+    )
+    
+    print(f"\n✓ Trained in {time.time() - start:.1f}s | Best iteration: {model.best_iteration}")
+    return model
+
+def evaluate_shards(model, test_paths):
+    """Accuracy/AUC over the test shards, predicted one shard at a time"""
+    step("EVALUATING...")
+    labels, proba = [], []
+    for path in test_paths:
+        shard = pd.read_parquet(path)
+        proba.append(model.predict(xgb.DMatrix(shard[FEATURE_COLUMNS].to_numpy(), feature_names=FEATURE_COLUMNS,
+                                               feature_types=shard_feature_types(),
+                                               enable_categorical=CONFIG['categorical_mode'] == 'native')))
+        labels.append(shard['success'].to_numpy())
+    y_test, y_proba = np.concatenate(labels), np.concatenate(proba)
+    
+    acc = accuracy_score(y_test, (y_proba > 0.5).astype(int))
+    auc = roc_auc_score(y_test, y_proba)
+    print(f"\n📊 PERFORMANCE:")
+    print(f"   Accuracy: {acc:.2%}")
+    print(f"   AUC: {auc:.4f}")
+    print(f"   Test rows: {len(y_test):,}")
+    return acc, auc
+
+def main_external(data_file):
+    """Out-of-core pipeline: CSV -> Parquet shards -> external-memory XGBoost"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("❌ External-memory training needs pyarrow for Parquet shards")
+        return
+    
     try:
         device = check_gpu()
         setup_directories()
-        data_file = download_data()
-        df = load_and_clean_advanced(data_file)
-        df = encode_features(df)
-        X_train, X_test, y_train, y_test, features = prepare_data(df)
-        model = train_optimized(X_train, y_train, X_test, y_test, device)
-        acc, auc = evaluate(model, X_test, y_test)
-        save_all(model, features, acc, auc)
+        os.makedirs(CONFIG['cache_dir'], exist_ok=True)
+        paths, vocab = write_feature_shards(data_file)
+        train_paths, test_paths = split_shards(paths)
+        model = train_external(train_paths, test_paths, device)
+        if 'categories' in vocab:
+            model.set_attr(categories=json.dumps(vocab['categories']))
+        acc, auc = evaluate_shards(model, test_paths)
+        # Percentiles and drift are measured on the held-out shards, the only ones read back into memory
+        X_valid = shard_frame(test_paths, vocab)
+        save_all(model, FEATURE_COLUMNS, acc, auc, reference=drift_reference(model, X_valid),
+                 scores=score_distribution(model, X_valid), top_locations=vocab['top_locations'])
         
+        print("\n" + "="*80)
+        print("✅ EXTERNAL-MEMORY TRAINING COMPLETE!")
+        print("="*80)
+        print(f"🎯 Accuracy: {acc:.2%}")
+        print(f"📊 AUC: {auc:.4f}")
+    except KeyboardInterrupt:
+        print("\n\n⚠ Training interrupted")
+    except Exception as e:
+        print(f"\n❌ Failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+# ==================== INCREMENTAL TRAINING ====================
+
+def encode_with_saved(encoder, values):
+    """Map labels through a saved LabelEncoder; unseen labels -> 0, as in serving"""
+    values = np.asarray(values, dtype=str)
+    classes = np.asarray(encoder.classes_, dtype=str)
+    idx = np.clip(np.searchsorted(classes, values), 0, len(classes) - 1)
+    known = classes[idx] == values
+    return np.where(known, idx, 0), int((~known).sum())
+
+def load_new_rows(data_file, top_locations=None):
+    """Clean rows for an already-trained model: real class mix, training-time location tiers"""
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(f"Data file not found: {data_file}")
+    df = read_source_data(data_file)
+    if df is None:
+        raise ValueError(f"Missing key columns in {data_file}")
+    df['success'] = df['status'].isin(SUCCESS_STATUSES).astype(int)
+    if top_locations is None:
+        # Models saved before tiers were recorded
+        print("⚠ No saved location tiers - using the new rows' top 10 locations")
+        top_locations = df['location'].value_counts().head(10).index
+    df = engineer_features(df, top_locations, np.random.default_rng(CONFIG['random_state']))
+    print(f"✓ New rows: {len(df):,} ({df['success'].mean():.1%} success)")
+    return df
+
+def holdout_auc(model, X, y):
+    """AUC on the held-out window (accuracy if it holds a single class)"""
+    proba = model.predict(xgb.DMatrix(X, enable_categorical=True))
+    if y.nunique() < 2:
+        return accuracy_score(y, (proba > 0.5).astype(int))
+    return roc_auc_score(y, proba)
+
+def train_incremental(new_data_file, device, mode='boost'):
+    """Continue the deployed model on new rows only, keep it only if the window agrees"""
+    models_dir = CONFIG['models_dir']
+    model_path = os.path.join(models_dir, 'xgboost_model.pkl')
+    
+    step("LOADING DEPLOYED MODEL...")
+    model = joblib.load(model_path)
+    features = joblib.load(os.path.join(models_dir, 'feature_columns.pkl'))
+    categories = json.loads(model.attr('categories') or '{}')
+    metadata_path = os.path.join(models_dir, 'model_metadata.pkl')
+    metadata = joblib.load(metadata_path) if os.path.exists(metadata_path) else {}
+    print(f"✓ {model.num_boosted_rounds()} trees | {len(features)} features")
+    
+    step("PREPARING NEW ROWS...")
+    df = load_new_rows(new_data_file, metadata.get('top_locations'))
+    if categories:
+        # Native categorical model: same category lists, unseen labels become missing
+        for feature, source in NATIVE_CATEGORICALS.items():
+            df[feature] = pd.Categorical(df[source].astype(str), categories=categories[feature])
+        unseen_cat, unseen_loc = (int(df[f].isna().sum()) for f in NATIVE_CATEGORICALS)
+        print(f"✓ Unseen labels treated as missing - category: {unseen_cat:,} | location: {unseen_loc:,}")
+    else:
+        le_category = joblib.load(os.path.join(models_dir, 'category_encoder.pkl'))
+        le_location = joblib.load(os.path.join(models_dir, 'location_encoder.pkl'))
+        df['category_encoded'], unseen_cat = encode_with_saved(le_category, df['category'])
+        df['location_encoded'], unseen_loc = encode_with_saved(le_location, df['location'])
+        print(f"✓ Unseen labels mapped to 0 - category: {unseen_cat:,} | location: {unseen_loc:,}")
+    
+    # Held-out window: the most recently founded companies, used only for the accept gate.
+    # Early stopping watches the next most recent slice, so the gate stays unbiased.
+    df = df.sort_values('founded_year', kind='stable')
+    n_holdout = max(1, int(len(df) * CONFIG['incremental_holdout']))
+    n_valid = max(1, int(len(df) * CONFIG['incremental_valid']))
+    fit_df, holdout_df = df.iloc[:-n_holdout], df.iloc[-n_holdout:]
+    train_df, valid_df = fit_df.iloc[:-n_valid], fit_df.iloc[-n_valid:]
+    X_fit, y_fit = fit_df[features], fit_df['success']
+    X_holdout, y_holdout = holdout_df[features], holdout_df['success']
+    print(f"✓ Fit: {len(X_fit):,} (early-stopping slice {len(valid_df):,}) | Held-out window: {len(X_holdout):,}")
+    
+    step(f"UPDATING MODEL ({mode})...")
+    start = time.time()
+    params = optimized_params(device)
+    
+    if mode == 'refresh':
+        # Same trees, leaf values re-fit to the new rows
+        params.update({'process_type': 'update', 'updater': 'refresh', 'refresh_leaf': True})
+        dfit = xgb.DMatrix(X_fit, label=y_fit, enable_categorical=True)
+        updated = xgb.train(params, dfit, num_boost_round=model.num_boosted_rounds(), xgb_model=model)
+    else:
+        dtrain = xgb.DMatrix(train_df[features], label=train_df['success'], enable_categorical=True)
+        dvalid = xgb.DMatrix(valid_df[features], label=valid_df['success'], enable_categorical=True)
+        updated = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=CONFIG['incremental_rounds'],
+            evals=[(dvalid, 'valid')],
+            early_stopping_rounds=20,
+            xgb_model=model,
+            verbose_eval=False
+        )
+    print(f"✓ Updated in {time.time() - start:.1f}s | {updated.num_boosted_rounds()} trees")
+    
+    step("EVALUATING ON HELD-OUT WINDOW...")
+    before = holdout_auc(model, X_holdout, y_holdout)
+    after = holdout_auc(updated, X_holdout, y_holdout)
+    print(f"   Deployed: {before:.4f} | Updated: {after:.4f}")
+    
+    step("SAVING...")
+    if after < before - CONFIG['incremental_max_auc_loss']:
+        print("⚠ Updated model is worse on the held-out window - keeping deployed model")
+        return model, before, after
+    
+    joblib.dump(model, os.path.join(models_dir, 'xgboost_model.prev.pkl'))
+    attach_categories(updated, X_fit)
+    joblib.dump(updated, model_path)
+    metadata.setdefault('incremental_updates', []).append({
+        'date': datetime.now().isoformat(),
+        'mode': mode,
+        'rows': int(len(df)),
+        'holdout_auc_before': float(before),
+        'holdout_auc_after': float(after)
+    })
+    metadata['trained_date'] = datetime.now().isoformat()
+    # Serving artifacts derived from the replaced model are rebuilt from the updated one on the new rows
+    metadata['drift_reference'] = drift_reference(updated, X_fit)
+    joblib.dump(metadata, metadata_path)
+    write_score_distribution(score_distribution(updated, df[features]))
+    print("✓ Saved (previous model kept as xgboost_model.prev.pkl)")
+    
+    if os.path.exists(os.path.join(models_dir, 'neighbors')):
+        build_neighbor_index(df[features], df['success'])
+    if os.path.exists(os.path.join(models_dir, 'xgboost_model_compact.pkl')):
+        compact_model(updated, X_fit, y_fit, X_holdout, y_holdout, device)
+    return updated, before, after
+
+def main_incremental(new_data_file, mode):
+    """Incremental refresh pipeline"""
+    try:
+        device = check_gpu()
+        train_incremental(new_data_file, device, mode)
+        print("\n" + "="*80)
+        print("✅ INCREMENTAL UPDATE COMPLETE!")
+        print("="*80)
+    except KeyboardInterrupt:
+        print("\n\n⚠ Training interrupted")
+    except Exception as e:
+        print(f"\n❌ Failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+# ==================== PIPELINE ====================
+
+class Stage:
+    """One named pipeline step; persisted stages are skipped when their fingerprint is unchanged"""
+    
+    def __init__(self, name, run, deps=(), code=(), key=None, persist=True):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.code = [run] + list(code)
+        self.key = key
+        self.persist = persist
+
+class MemorySampler:
+    """Peak RSS over a stage, sampled from a background thread"""
+    
+    def __init__(self, interval=0.05):
+        import threading
+        self.interval = interval
+        self.peak = current_rss_mb() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+    
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb() or 0)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb() or 0)
+
+def cpu_seconds():
+    """CPU time of this process plus finished worker processes"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+class Pipeline:
+    """Runs stages in order, persisting outputs so a rerun resumes after the last good stage"""
+    
+    def __init__(self, stages, options):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = [stage.name for stage in stages]
+        self.options = options
+        self.dir = CONFIG['pipeline_dir']
+        self.manifest_path = os.path.join(self.dir, 'manifest.json')
+        self.ctx = {}
+        self.fingerprints = {}
+        self.available = set()
+        self.report = []
+    
+    def output_path(self, name):
+        return os.path.join(self.dir, f'{name}.pkl')
+    
+    def fingerprint(self, stage):
+        digest = hashlib.blake2b(digest_size=16)
+        for fn in stage.code:
+            digest.update(inspect.getsource(fn).encode())
+        for dep in stage.deps:
+            digest.update(self.fingerprints[dep].encode())
+        if stage.key:
+            digest.update(str(stage.key(self.ctx)).encode())
+        digest.update(json.dumps(CONFIG, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+    
+    def load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {}
+    
+    def save_manifest(self, manifest):
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    
+    def materialize(self, name):
+        """Make a stage's outputs available: load persisted ones, re-run volatile ones"""
+        if name in self.available:
+            return
+        stage = self.stages[name]
+        if stage.persist:
+            path = self.output_path(name)
+            if not os.path.exists(path):
+                raise RuntimeError(f"No saved output for stage '{name}' - run the pipeline up to it first")
+            self.ctx.update(joblib.load(path))
+            self.available.add(name)
+        else:
+            self.execute(stage, self.load_manifest())
+    
+    def execute(self, stage, manifest):
+        for dep in stage.deps:
+            self.materialize(dep)
+        
+        start_wall, start_cpu = time.time(), cpu_seconds()
+        entry = {'stage': stage.name}
+        try:
+            with MemorySampler() as memory:
+                outputs = stage.run(self.ctx) or {}
+        except BaseException:
+            entry.update({'status': 'failed', 'wall_s': round(time.time() - start_wall, 3)})
+            self.report.append(entry)
+            raise
+        self.ctx.update(outputs)
+        self.available.add(stage.name)
+        
+        if stage.persist:
+            joblib.dump(outputs, self.output_path(stage.name))
+            manifest[stage.name] = self.fingerprints[stage.name] = self.fingerprint(stage)
+            self.save_manifest(manifest)
+        else:
+            self.fingerprints[stage.name] = self.fingerprint(stage)
+        
+        entry.update({
+            'status': 'ran',
+            'wall_s': round(time.time() - start_wall, 3),
+            'cpu_s': round(cpu_seconds() - start_cpu, 3),
+            'peak_rss_mb': round(memory.peak, 1)
+        })
+        self.report.append(entry)
+        print(f"   ⏱ {stage.name}: {entry['wall_s']:.1f}s wall | {entry['cpu_s']:.1f}s CPU | "
+              f"peak {entry['peak_rss_mb']:,.0f}MB")
+    
+    def run(self, only=None):
+        """Run every stage whose inputs changed, or just `only` (always re-run)"""
+        os.makedirs(self.dir, exist_ok=True)
+        manifest = self.load_manifest()
+        started = datetime.now().isoformat()
+        start = time.time()
+        
+        try:
+            if only:
+                if only not in self.stages:
+                    raise ValueError(f"Unknown stage '{only}' (stages: {', '.join(self.order)})")
+                for dep in self.stages[only].deps:
+                    self.fingerprints.setdefault(dep, manifest.get(dep, ''))
+                self.execute(self.stages[only], manifest)
+                return self.ctx
+            
+            for name in self.order:
+                stage = self.stages[name]
+                if not stage.persist:
+                    self.execute(stage, manifest)
+                    continue
+                fingerprint = self.fingerprint(stage)
+                if manifest.get(name) == fingerprint and os.path.exists(self.output_path(name)):
+                    self.fingerprints[name] = fingerprint
+                    self.report.append({'stage': name, 'status': 'cached'})
+                    print(f"\n   ↷ {name}: unchanged, skipped")
+                    continue
+                self.fingerprints[name] = fingerprint
+                self.execute(stage, manifest)
+            return self.ctx
+        finally:
+            with open(os.path.join(CONFIG['models_dir'], 'pipeline_report.json'), 'w') as f:
+                json.dump({
+                    'started': started,
+                    'wall_s': round(time.time() - start, 3),
+                    'options': self.options,
+                    'stages': self.report
+                }, f, indent=2)
+
+def training_stages(search_trials=None, cv_folds=None, distributed_workers=None):
+    """The training DAG; each stage reads its inputs from the shared context"""
+    def setup(ctx):
+        device = check_gpu()
+        setup_directories()
+        return {'device': device, 'data_file': download_data()}
+    
+    def dataset(ctx):
+        return {'df': load_or_build_dataset(ctx['data_file'])}
+    
+    def split(ctx):
+        X_train, X_test, y_train, y_test, features = prepare_data(ctx['df'])
+        return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test, 'features': features}
+    
+    def search(ctx):
+        if not search_trials:
+            return {'best_params': None}
+        return {'best_params': search_hyperparameters(ctx['X_train'], ctx['y_train'], search_trials)}
+    
+    def cv(ctx):
+        if not cv_folds:
+            return {'cv_rounds': None}
+        return {'cv_rounds': cross_validate(ctx['X_train'], ctx['y_train'], cv_folds, ctx['best_params'])['rounds']}
+    
+    def profile(ctx):
+        return {'cpu_profile': profile_cpu(ctx['X_train'], ctx['y_train'], ctx['device'])}
+    
+    def train(ctx):
+        overrides = dict(ctx['best_params'] or {})
+        if ctx['cpu_profile']:
+            overrides.update(nthread=ctx['cpu_profile']['nthread'], max_bin=ctx['cpu_profile']['max_bin'])
+        if distributed_workers and distributed_workers > 1:
+            return {'model': train_distributed(ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'],
+                                               ctx['device'], distributed_workers, overrides, ctx['cv_rounds'])}
+        return {'model': train_optimized(ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'],
+                                         ctx['device'], overrides, ctx['cv_rounds'])}
+    
+    def evaluation(ctx):
+        acc, auc = evaluate(ctx['model'], ctx['X_test'], ctx['y_test'])
+        return {'acc': acc, 'auc': auc}
+    
+    def save(ctx):
+        population = pd.concat([ctx['X_train'], ctx['X_test']])
+        save_all(ctx['model'], ctx['features'], ctx['acc'], ctx['auc'], ctx['cpu_profile'],
+                 drift_reference(ctx['model'], ctx['X_train']), score_distribution(ctx['model'], population),
+                 tier_one_locations(ctx['df']))
+    
+    def neighbors(ctx):
+        build_neighbor_index(pd.concat([ctx['X_train'], ctx['X_test']]), pd.concat([ctx['y_train'], ctx['y_test']]))
+    
+    def compact(ctx):
+        compact_model(ctx['model'], ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'], ctx['device'])
+    
+    return [
+        Stage('setup', setup, code=[check_gpu, download_data],
+              key=lambda ctx: (ctx['device'], ctx['data_file']), persist=False),
+        # The dataset keeps its own content-hashed Feather cache
+        Stage('dataset', dataset, deps=['setup'], key=lambda ctx: dataset_cache_key(ctx['data_file']), persist=False),
+        Stage('split', split, deps=['dataset'], code=[prepare_data]),
+        Stage('search', search, deps=['split'], code=[sample_config, _run_search_job, search_hyperparameters],
+              key=lambda ctx: search_trials),
+        Stage('cv', cv, deps=['split', 'search'], code=[_run_cv_fold, cross_validate], key=lambda ctx: cv_folds),
+        Stage('profile', profile, deps=['setup', 'split'], code=[profile_cpu, cpu_profile.autotune]),
+        Stage('train', train, deps=['setup', 'split', 'search', 'cv', 'profile'],
+              code=[optimized_params, train_optimized, _distributed_worker, train_distributed],
+              key=lambda ctx: distributed_workers),
+        Stage('evaluate', evaluation, deps=['train', 'split'], code=[evaluate]),
+        Stage('save', save, deps=['dataset', 'train', 'split', 'evaluate', 'profile'],
+              code=[save_all, write_score_distribution, drift_reference, score_distribution, model_fingerprint,
+                    group_labels, tier_one_locations],
+              persist=False),
+        Stage('neighbors', neighbors, deps=['split'],
+              code=[build_neighbor_index, group_labels, feature_array, neighbor_index.build]),
+        Stage('compact', compact, deps=['setup', 'train', 'split'], code=[compact_model, measure_latency])
+    ]
+
+def main(search_trials=None, cv_folds=None, distributed_workers=None, stage=None, fresh=False):
+    """Main training pipeline"""
+    try:
+        if fresh and os.path.isdir(CONFIG['pipeline_dir']):
+            import shutil
+            shutil.rmtree(CONFIG['pipeline_dir'])
+        
+        pipeline = Pipeline(training_stages(search_trials, cv_folds, distributed_workers),
+                            {'search_trials': search_trials, 'cv_folds': cv_folds,
+                             'distributed_workers': distributed_workers})
+        ctx = pipeline.run(only=stage)
+        
+        if stage:
+            print(f"\n✅ STAGE '{stage}' COMPLETE")
+            return
+        
+        acc, auc = ctx['acc'], ctx['auc']
+
         print("\n" + "="*80)
         print("✅ TRAINING COMPLETE!")
         print("="*80)
@@ -490,4 +1939,41 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Train the startup success model")
+    parser.add_argument('--incremental', metavar='CSV',
+                        help="continue boosting the deployed model on the new rows in CSV")
+    parser.add_argument('--refresh-leaves', action='store_true',
+                        help="with --incremental: refresh leaf values instead of adding trees")
+    parser.add_argument('--search', type=int, metavar='N',
+                        help="search N hyperparameter configs before the final training")
+    parser.add_argument('--cv', type=int, metavar='K',
+                        help="pick the boosting rounds by stratified K-fold cross-validation")
+    parser.add_argument('--distributed', type=int, metavar='N',
+                        help="train data-parallel across N local worker processes")
+    parser.add_argument('--scaling-benchmark', type=int, metavar='N',
+                        help="benchmark distributed training time for 1..N workers")
+    parser.add_argument('--synthetic-rows', type=int, metavar='N',
+                        help="size of the synthetic dataset when no real data is present")
+    parser.add_argument('--native-categorical', action='store_true',
+                        help="train category/location as native XGBoost categoricals (no LabelEncoders)")
+    parser.add_argument('--stage', metavar='NAME',
+                        help="run one pipeline stage in isolation, from its saved inputs")
+    parser.add_argument('--fresh', action='store_true',
+                        help="ignore saved stage outputs and run every stage")
+    parser.add_argument('--external-memory', metavar='CSV',
+                        help="train out-of-core from Parquet shards of CSV (larger-than-RAM data)")
+    args = parser.parse_args()
+    if args.native_categorical:
+        CONFIG['categorical_mode'] = 'native'
+    if args.synthetic_rows:
+        CONFIG['synthetic_rows'] = args.synthetic_rows
+    
+    if args.scaling_benchmark:
+        main_scaling_benchmark(args.scaling_benchmark)
+    elif args.external_memory:
+        main_external(args.external_memory)
+    elif args.incremental:
+        main_incremental(args.incremental, 'refresh' if args.refresh_leaves else 'boost')
+    else:
+        main(search_trials=args.search, cv_folds=args.cv, distributed_workers=args.distributed,
+             stage=args.stage, fresh=args.fresh)
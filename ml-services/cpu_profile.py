@@ -0,0 +1,102 @@
+"""
+CPU training profile: usable core count (cgroup-aware) and a short benchmark that picks
+nthread and max_bin for XGBoost's hist method on the actual training data.
+"""
+
+import os
+import math
+import time
+import numpy as np
+import xgboost as xgb
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import roc_auc_score
+
+def cgroup_cpu_limit():
+    """CPU quota of this container in cores, or None when unlimited / not in a cgroup"""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+def available_cpus():
+    """Cores this process may actually use: affinity mask capped by the cgroup quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return cpus
+
+def thread_candidates(cpus):
+    """1, 2, 4, ... up to the core count, plus the core count itself"""
+    counts = {cpus}
+    n = 1
+    while n < cpus:
+        counts.add(n)
+        n *= 2
+    return sorted(counts)
+
+def autotune(X, y, params, bin_options=(64, 128, 256), rounds=30, max_auc_loss=0.001,
+             max_rows=200_000, seed=42):
+    """Time a short run for every (nthread, max_bin); fastest setting within the AUC budget wins"""
+    if len(X) > max_rows:
+        keep = np.random.default_rng(seed).choice(len(X), max_rows, replace=False)
+        X, y = X.iloc[np.sort(keep)], y.iloc[np.sort(keep)]
+    X_fit, X_valid, y_fit, y_valid = train_test_split(X, y, test_size=0.2, random_state=seed, stratify=y)
+
+    cpus = available_cpus()
+    params = {**params, 'device': 'cpu', 'tree_method': 'hist'}
+    params.pop('n_estimators', None)
+    trials = []
+
+    for max_bin in bin_options:
+        dfit = xgb.QuantileDMatrix(X_fit, label=y_fit, max_bin=max_bin, enable_categorical=True)
+        dvalid = xgb.DMatrix(X_valid, enable_categorical=True)
+        # Untimed warm-up so the first timing does not pay for allocation
+        xgb.train({**params, 'max_bin': max_bin, 'nthread': cpus}, dfit, num_boost_round=2)
+
+        for nthread in thread_candidates(cpus):
+            start = time.perf_counter()
+            model = xgb.train({**params, 'max_bin': max_bin, 'nthread': nthread}, dfit, num_boost_round=rounds)
+            seconds = time.perf_counter() - start
+            trials.append({
+                'nthread': nthread,
+                'max_bin': max_bin,
+                'seconds': round(seconds, 4),
+                'auc': float(roc_auc_score(y_valid, model.predict(dvalid)))
+            })
+
+    # Every trial is held to the best AUC of any trial, so a coarser max_bin must stay within the budget
+    best_auc = max(t['auc'] for t in trials)
+    eligible = [t for t in trials if t['auc'] >= best_auc - max_auc_loss]
+    best = min(eligible, key=lambda t: t['seconds'])
+    default = next((t for t in trials if t['max_bin'] == 256 and t['nthread'] == cpus), None)
+
+    return {
+        'nthread': best['nthread'],
+        'max_bin': best['max_bin'],
+        'available_cpus': cpus,
+        'host_cpus': os.cpu_count(),
+        'cgroup_cpu_limit': cgroup_cpu_limit(),
+        'rows': len(X),
+        'rounds': rounds,
+        'seconds': best['seconds'],
+        'default_seconds': default['seconds'] if default else None,
+        'trials': trials
+    }
@@ -1,6 +1,7 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 from typing import Dict, List, Optional, Any
 import pandas as pd
 import numpy as np
@@ -9,7 +10,16 @@ import joblib
 import torch
 import os
 import re
+import time
+import math
+import asyncio
+import json
+import uuid
+import hashlib
+from collections import OrderedDict, deque
 from datetime import datetime
+from neighbor_index import NeighborIndex
+import cpu_profile
 
 app = FastAPI(title="Startup ML + AI Advisor Service")
 
@@ -23,6 +33,8 @@ app.add_middleware(
 
 DEVICE = 'cuda' if torch.cuda.is_available() else 'cpu'
 MODEL_DIR = "./models"
+# Set MODEL_FILE=xgboost_model_compact.pkl to serve the compacted ensemble
+MODEL_FILE = os.environ.get('MODEL_FILE', 'xgboost_model.pkl')
 
 print("="*70)
 print("🚀 STARTUP ML + AI ADVISOR SERVICE")
@@ -33,23 +45,40 @@ if DEVICE == 'cuda':
 
 # ==================== MODEL LOADING ====================
 
-def load_model_auto():
+# Named models served side by side: name -> (directory, model file).
+# auto_train writes feature_columns.pkl; train_model_gpu's booster carries its own feature names.
+MODEL_SPECS = {
+    'auto_train': (MODEL_DIR, MODEL_FILE),
+    'gpu': (os.environ.get('GPU_MODEL_DIR', '../models'), 'xgboost_gpu_model.pkl'),
+}
+PRIMARY_MODEL = os.environ.get('PRIMARY_MODEL', 'auto_train')
+# Comma-separated models scored after the response is sent, for comparison only
+SHADOW_MODELS = [name for name in os.environ.get('SHADOW_MODELS', '').split(',') if name]
+
+def load_model_auto(model_dir=MODEL_DIR, model_file=MODEL_FILE):
     """Auto-load trained model"""
     try:
-        model_path = os.path.join(MODEL_DIR, 'xgboost_model.pkl')
-        features_path = os.path.join(MODEL_DIR, 'feature_columns.pkl')
-        metadata_path = os.path.join(MODEL_DIR, 'model_metadata.pkl')
-        category_path = os.path.join(MODEL_DIR, 'category_encoder.pkl')
-        location_path = os.path.join(MODEL_DIR, 'location_encoder.pkl')
+        model_path = os.path.join(model_dir, model_file)
+        features_path = os.path.join(model_dir, 'feature_columns.pkl')
+        metadata_path = os.path.join(model_dir, 'model_metadata.pkl')
+        category_path = os.path.join(model_dir, 'category_encoder.pkl')
+        location_path = os.path.join(model_dir, 'location_encoder.pkl')
         
-        if not all(os.path.exists(p) for p in [model_path, features_path]):
-            print("\n⚠️ MODEL NOT FOUND! Run: python auto_train_improved.py")
+        if not os.path.exists(model_path):
+            print(f"\n⚠️ MODEL NOT FOUND: {model_path}")
             return None, None, None, None, None
         
         model = joblib.load(model_path)
-        features = joblib.load(features_path)
-        category_enc = joblib.load(category_path) if os.path.exists(category_path) else None
-        location_enc = joblib.load(location_path) if os.path.exists(location_path) else None
+        features = joblib.load(features_path) if os.path.exists(features_path) else model.feature_names
+        if not features:
+            print(f"\n⚠️ No feature list for {model_path}")
+            return None, None, None, None, None
+        if model.attr('categories'):
+            # Native categorical model carries its own category lists
+            category_enc = location_enc = None
+        else:
+            category_enc = joblib.load(category_path) if os.path.exists(category_path) else None
+            location_enc = joblib.load(location_path) if os.path.exists(location_path) else None
         metadata = joblib.load(metadata_path) if os.path.exists(metadata_path) else None
         
         print(f"\n✓ Model loaded: {model_path}")
@@ -65,7 +94,405 @@ def load_model_auto():
         print(f"❌ Error: {e}")
         return None, None, None, None, None
 
-xgb_model, feature_columns, category_encoder, location_encoder, model_metadata = load_model_auto()
+def load_native_categories(model):
+    """Sorted category arrays stored on a native-categorical booster ({} for label-encoded models)"""
+    raw = model.attr('categories') if model is not None else None
+    return {name: np.asarray(values, dtype=str) for name, values in json.loads(raw).items()} if raw else {}
+
+# ==================== PERCENTILE RANKING ====================
+
+def model_fingerprint(booster) -> str:
+    """Same hash auto_train stores with the score distribution"""
+    return hashlib.blake2b(bytes(booster.save_raw('ubj')), digest_size=16).hexdigest()
+
+# Raw request column behind each encoded categorical feature
+CATEGORY_SOURCES = {'category_encoded': 'category', 'location_encoded': 'location'}
+
+def midrank(sorted_values: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Number of values below each query, counting ties as half (two binary searches)"""
+    return (np.searchsorted(sorted_values, queries, side='left') +
+            np.searchsorted(sorted_values, queries, side='right')) / 2
+
+class ScoreIndex:
+    """Sorted training-population scores (score_distribution.npz from auto_train).
+
+    Per-group scores are searched in one array by keying each score as group * 2 + score,
+    so a batch of startups from different groups is ranked with a single searchsorted."""
+
+    def __init__(self, arrays):
+        self.all = arrays['all'].astype(np.float64)
+        self.groups = {}
+        for source in CATEGORY_SOURCES.values():
+            if f'{source}_labels' not in arrays:
+                continue
+            offsets = arrays[f'{source}_offsets']
+            counts = np.diff(offsets)
+            keys = np.repeat(np.arange(len(counts)), counts) * 2.0 + arrays[f'{source}_scores']
+            self.groups[source] = (arrays[f'{source}_labels'].astype(str), offsets, counts, keys)
+
+    @staticmethod
+    def load(model_dir: str, booster) -> Optional['ScoreIndex']:
+        """The saved distribution, or None if it was scored by a different model than the one served"""
+        path = os.path.join(model_dir, 'score_distribution.npz')
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as arrays:
+            if 'model' not in arrays or str(arrays['model']) != model_fingerprint(booster):
+                print(f"⚠️ Ignoring {path}: scored by a different model (percentiles disabled)")
+                return None
+            return ScoreIndex(arrays)
+
+    def percentile(self, probabilities: np.ndarray) -> np.ndarray:
+        """Percent of the training population scoring below each probability"""
+        scores = np.asarray(probabilities, dtype=np.float32).astype(np.float64)
+        return midrank(self.all, scores) / len(self.all) * 100
+
+    def group_percentile(self, source: str, values, probabilities: np.ndarray):
+        """Percentile within each startup's own category/location; NaN for unseen labels"""
+        labels, offsets, counts, keys = self.groups[source]
+        values = np.asarray(values, dtype=str)
+        group = np.clip(np.searchsorted(labels, values), 0, len(labels) - 1)
+        known = labels[group] == values
+        scores = np.asarray(probabilities, dtype=np.float32).astype(np.float64)
+        rank = midrank(keys, group * 2.0 + scores) - offsets[group]
+        population = np.where(known, counts[group], 0)
+        return np.where(known, rank / np.maximum(counts[group], 1) * 100, np.nan), population
+
+    def rank(self, probabilities: np.ndarray, cols: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Overall and per-group percentiles for a batch, one dict per startup"""
+        result = {'percentile': self.percentile(probabilities)}
+        for source in self.groups:
+            result[f'{source}_percentile'], result[f'{source}_population'] = \
+                self.group_percentile(source, cols[source], probabilities)
+        rows = []
+        for i in range(len(probabilities)):
+            row = {'population': len(self.all)}
+            for key, values in result.items():
+                value = values[i]
+                if key.endswith('_population'):
+                    row[key] = int(value)
+                else:
+                    row[key] = None if np.isnan(value) else round(float(value), 1)
+            rows.append(row)
+        return rows
+
+# ==================== MODEL REGISTRY ====================
+
+class ServedModel:
+    """One loaded model with its own feature order and category encoders"""
+
+    def __init__(self, name: str, model_file: str, booster, features, category_enc, location_enc, metadata,
+                 scores: Optional[ScoreIndex] = None):
+        self.name = name
+        self.booster = booster
+        self.features = list(features)
+        self.encoders = {'category_encoded': category_enc, 'location_encoded': location_enc}
+        self.metadata = metadata
+        self.scores = scores
+        self.native_categories = load_native_categories(booster)
+        self.feature_types = ['c' if f in self.native_categories else 'q' for f in self.features]
+        self.version = f"{model_file}@{(metadata or {}).get('trained_date', 'unknown')}"
+        self.union_index = None   # set by the registry
+        self.prefix = False
+
+    def matrix(self, union: np.ndarray, cols: Dict[str, np.ndarray]) -> np.ndarray:
+        """This model's input columns out of the shared union matrix"""
+        if self.prefix:
+            return union[:, :len(self.features)]
+        matrix = union[:, self.union_index]
+        # The union encodes categories with the primary model's encoders; re-encode with ours
+        for j, name in enumerate(self.features):
+            if name in CATEGORY_SOURCES:
+                matrix[:, j] = encode_category(name, self.encoders[name], cols[CATEGORY_SOURCES[name]],
+                                               self.native_categories)
+        return matrix
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        return self.booster.predict(xgb.DMatrix(matrix, feature_names=self.features, feature_types=self.feature_types,
+                                                enable_categorical=bool(self.native_categories)))
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'version': self.version,
+            'features': len(self.features),
+            'native_categorical': bool(self.native_categories),
+            'score_population': len(self.scores.all) if self.scores else None,
+            'accuracy': (self.metadata or {}).get('accuracy'),
+            'auc': (self.metadata or {}).get('auc')
+        }
+
+class ModelRegistry:
+    """Named models sharing one feature-engineering pass per request"""
+
+    def __init__(self, models: Dict[str, ServedModel], primary: str, shadows: List[str]):
+        self.models = models
+        self.primary = models.get(primary) or next(iter(models.values()), None)
+        self.shadows = [models[n] for n in shadows if n in models and models[n] is not self.primary]
+
+        # Union of feature sets, primary first so its matrix is a prefix of the union
+        ordered = [self.primary] + [m for m in models.values() if m is not self.primary] if self.primary else []
+        self.union = []
+        for model in ordered:
+            self.union += [f for f in model.features if f not in self.union]
+        position = {name: j for j, name in enumerate(self.union)}
+        for model in ordered:
+            model.union_index = np.array([position[f] for f in model.features])
+            model.prefix = model is self.primary
+
+        self.shadow_stats = {m.name: {'scored': 0, 'errors': 0, 'abs_diff_sum': 0.0, 'agree': 0, 'seconds': 0.0}
+                             for m in self.shadows}
+
+    def get(self, name: Optional[str]) -> ServedModel:
+        if name is None:
+            return self.primary
+        if name not in self.models:
+            raise HTTPException(status_code=404, detail=f"Unknown model '{name}'. Available: {sorted(self.models)}")
+        return self.models[name]
+
+    def score(self, names: List[str], union: np.ndarray, cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        return {name: self.get(name).predict(self.get(name).matrix(union, cols)) for name in names}
+
+    def run_shadows(self, union: np.ndarray, cols: Dict[str, np.ndarray], primary_probabilities: np.ndarray):
+        """Score the shadow models and compare with what the caller was given (runs after the response)"""
+        for model in self.shadows:
+            stats = self.shadow_stats[model.name]
+            try:
+                start = time.perf_counter()
+                probabilities = model.predict(model.matrix(union, cols))
+                stats['seconds'] += time.perf_counter() - start
+                stats['scored'] += len(probabilities)
+                stats['abs_diff_sum'] += float(np.abs(probabilities - primary_probabilities).sum())
+                stats['agree'] += int(((probabilities >= 0.5) == (primary_probabilities >= 0.5)).sum())
+            except Exception as e:
+                stats['errors'] += 1
+                print(f"⚠️ Shadow model {model.name} failed: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        shadows = {}
+        for name, stats in self.shadow_stats.items():
+            n = stats['scored']
+            shadows[name] = {
+                'scored': n,
+                'errors': stats['errors'],
+                'mean_abs_diff': round(stats['abs_diff_sum'] / n, 6) if n else None,
+                'agreement': round(stats['agree'] / n, 4) if n else None,
+                'mean_ms': round(stats['seconds'] * 1000 / n, 3) if n else None
+            }
+        return {
+            'primary': self.primary.name if self.primary else None,
+            'models': {name: model.info() for name, model in self.models.items()},
+            'union_features': len(self.union),
+            'shadows': shadows
+        }
+
+def load_registry() -> ModelRegistry:
+    models = {}
+    for name, (model_dir, model_file) in MODEL_SPECS.items():
+        booster, features, category_enc, location_enc, metadata = load_model_auto(model_dir, model_file)
+        if booster is not None:
+            models[name] = ServedModel(name, model_file, booster, features, category_enc, location_enc, metadata,
+                                       ScoreIndex.load(model_dir, booster))
+    registry = ModelRegistry(models, PRIMARY_MODEL, SHADOW_MODELS)
+    print(f"✓ Models: {sorted(models)} | primary: {registry.primary.name if registry.primary else None}"
+          f" | shadows: {[m.name for m in registry.shadows]}")
+    return registry
+
+model_registry = load_registry()
+
+# The primary model backs every endpoint that does not name a model
+primary_model = model_registry.primary
+xgb_model = primary_model.booster if primary_model else None
+feature_columns = primary_model.features if primary_model else None
+category_encoder = primary_model.encoders['category_encoded'] if primary_model else None
+location_encoder = primary_model.encoders['location_encoded'] if primary_model else None
+model_metadata = primary_model.metadata if primary_model else None
+native_categories = primary_model.native_categories if primary_model else {}
+feature_types = primary_model.feature_types if primary_model else None
+
+# ==================== ADMISSION CONTROL ====================
+
+# Per-endpoint concurrency limit and bounded wait queue
+ADMISSION_LIMITS = {
+    '/predict/success': {'concurrency': 8, 'queue': 64},
+    '/predict/compare': {'concurrency': 8, 'queue': 64},
+    '/predict/sweep': {'concurrency': 2, 'queue': 8},
+    '/predict/counterfactual': {'concurrency': 2, 'queue': 16},
+    '/advisor/ask': {'concurrency': 4, 'queue': 16},
+    '/advisor/portfolio': {'concurrency': 2, 'queue': 8},
+    '/investors/match': {'concurrency': 8, 'queue': 64},
+    '/pitch/analyze': {'concurrency': 4, 'queue': 32},
+    '/startups/similar': {'concurrency': 8, 'queue': 64},
+}
+# Queue wait budget when the caller sends no deadline (Node backend times out at 30s)
+ADMISSION_DEFAULT_TIMEOUT_S = float(os.environ.get('ADMISSION_DEFAULT_TIMEOUT_S', 25))
+# Per-client token bucket: sustained requests/sec and burst size
+RATE_LIMIT_PER_SEC = float(os.environ.get('RATE_LIMIT_PER_SEC', 20))
+RATE_LIMIT_BURST = float(os.environ.get('RATE_LIMIT_BURST', 40))
+RATE_LIMIT_MAX_CLIENTS = 10000
+
+class EndpointGate:
+    """Concurrency limit + bounded queue for one endpoint"""
+
+    def __init__(self, concurrency: int, queue_size: int):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.avg_service_s = 0.05
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.shed_rate_limited = 0
+
+    def expected_wait(self) -> float:
+        """Estimated queueing delay for a newly arriving request"""
+        if self.in_flight < self.concurrency:
+            return 0.0
+        return (self.waiting + 1) / self.concurrency * self.avg_service_s
+
+    def record_service_time(self, elapsed: float):
+        self.avg_service_s = 0.9 * self.avg_service_s + 0.1 * elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'concurrency': self.concurrency,
+            'in_flight': self.in_flight,
+            'queue_depth': self.waiting,
+            'queue_size': self.queue_size,
+            'avg_service_ms': round(self.avg_service_s * 1000, 2),
+            'admitted': self.admitted,
+            'shed_queue_full': self.shed_queue_full,
+            'shed_deadline': self.shed_deadline,
+            'shed_rate_limited': self.shed_rate_limited
+        }
+
+class ClientRateLimiter:
+    """Per-client token buckets, LRU-bounded"""
+
+    def __init__(self, rate: float, burst: float, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets = OrderedDict()
+
+    def take(self, client_id: str) -> float:
+        """Consume one token; returns 0 if allowed, else seconds until next token"""
+        now = time.monotonic()
+        tokens, updated = self.buckets.pop(client_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            self.buckets[client_id] = (tokens - 1, now)
+            retry_after = 0.0
+        else:
+            self.buckets[client_id] = (tokens, now)
+            retry_after = (1 - tokens) / self.rate
+
+        if len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+admission_gates = {path: EndpointGate(cfg['concurrency'], cfg['queue']) for path, cfg in ADMISSION_LIMITS.items()}
+rate_limiter = ClientRateLimiter(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST, RATE_LIMIT_MAX_CLIENTS)
+
+def request_deadline(request: Request, now: float) -> float:
+    """Absolute deadline (epoch seconds) from request headers
+
+    X-Request-Deadline: absolute epoch milliseconds
+    X-Request-Timeout-Ms: remaining budget in milliseconds
+    """
+    try:
+        if 'x-request-deadline' in request.headers:
+            return float(request.headers['x-request-deadline']) / 1000
+        if 'x-request-timeout-ms' in request.headers:
+            return now + float(request.headers['x-request-timeout-ms']) / 1000
+    except ValueError:
+        pass
+    return now + ADMISSION_DEFAULT_TIMEOUT_S
+
+def shed_response(status_code: int, retry_after: float, detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={'detail': detail},
+        headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+    )
+
+class ReleaseAfterSend:
+    """ASGI app that sends a downstream response, then releases its admission slot"""
+
+    def __init__(self, response: Response, release):
+        self.response = response
+        self.release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            self.release()
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Reject work early instead of letting it time out in the queue"""
+    gate = admission_gates.get(request.url.path)
+    if gate is None:
+        return await call_next(request)
+
+    client_id = request.headers.get('x-client-id') or (request.client.host if request.client else 'unknown')
+    retry_after = rate_limiter.take(client_id)
+    if retry_after > 0:
+        gate.shed_rate_limited += 1
+        return shed_response(429, retry_after, 'Rate limit exceeded')
+
+    now = time.time()
+    deadline = request_deadline(request, now)
+    expected_wait = gate.expected_wait()
+
+    if gate.waiting >= gate.queue_size:
+        gate.shed_queue_full += 1
+        return shed_response(503, expected_wait, 'Server overloaded, queue full')
+    if now + expected_wait + gate.avg_service_s > deadline:
+        gate.shed_deadline += 1
+        return shed_response(503, expected_wait, 'Deadline cannot be met')
+
+    if gate.semaphore.locked():
+        gate.waiting += 1
+        try:
+            # Cancelled in this task rather than in a wait_for helper task, so a slot granted
+            # as the deadline fires is handed back by Semaphore.acquire's cancellation path
+            async with asyncio.timeout(deadline - now):
+                await gate.semaphore.acquire()
+        except TimeoutError:
+            gate.shed_deadline += 1
+            return shed_response(503, gate.expected_wait(), 'Deadline expired while queued')
+        finally:
+            gate.waiting -= 1
+    else:
+        # A free slot is taken without yielding, so it is never counted as queued
+        await gate.semaphore.acquire()
+
+    gate.admitted += 1
+    gate.in_flight += 1
+    start = time.perf_counter()
+
+    def release():
+        gate.in_flight -= 1
+        gate.semaphore.release()
+        gate.record_service_time(time.perf_counter() - start)
+
+    try:
+        response = await call_next(request)
+    except BaseException:
+        release()
+        raise
+
+    # call_next returns once the headers are ready; streamed endpoints (/advisor/portfolio)
+    # do their work while the body is sent, so the slot is held until the body ends
+    return ReleaseAfterSend(response, release)
+
+def admission_stats() -> Dict[str, Any]:
+    return {path: gate.stats() for path, gate in admission_gates.items()}
 
 # ==================== PYDANTIC MODELS ====================
 
@@ -94,11 +521,116 @@ class PredictionOutput(BaseModel):
     explanation: Dict[str, float]
     processing_device: str
     model_info: Dict[str, Any] = Field(default_factory=dict)
+    # Rank against the training population: percent of startups scoring lower, overall and in-group
+    percentiles: Dict[str, Any] = Field(default_factory=dict)
+
+class ModelCompareInput(BaseModel):
+    startup: StartupInput
+    models: Optional[List[str]] = None     # default: every registered model
+
+class ModelCompareOutput(BaseModel):
+    primary: Optional[str]
+    probabilities: Dict[str, float]
+    versions: Dict[str, str]
+    processing_time_ms: float
+
+class SweepAxis(BaseModel):
+    field: str
+    values: Optional[List[float]] = None
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    steps: int = Field(default=20, ge=2, le=200)
+    log_scale: bool = False
+
+class SweepInput(BaseModel):
+    startup: StartupInput
+    axes: List[SweepAxis]
+
+class SweepOutput(BaseModel):
+    axes: List[Dict[str, Any]]
+    probabilities: List[Any]
+    base_probability: float
+    n_variants: int
+
+class CounterfactualInput(BaseModel):
+    startup: StartupInput
+    target_probability: float = Field(default=70, gt=0, lt=100)
+    max_changes: int = Field(default=2, ge=1, le=5)
+
+class CounterfactualOutput(BaseModel):
+    current_probability: float
+    target_probability: float
+    reachable: bool
+    options: List[Dict[str, Any]]
+    candidates_scored: int
+    iterations: int
+    elapsed_ms: float
+    cached: bool
+
+class InvestorMatchInput(BaseModel):
+    startup: StartupInput
+    top_k: int = Field(default=10, ge=1, le=500)
+    raise_amount: Optional[float] = None
+    require_category_match: bool = False
+    use_success_probability: bool = False
+
+class InvestorMatchOutput(BaseModel):
+    investors: List[Dict[str, Any]]
+    candidates_scored: int
+    total_investors: int
+    success_probability: Optional[float] = None
+
+class SimilarStartupsInput(BaseModel):
+    startup: StartupInput
+    k: int = Field(10, ge=1, le=100)
+
+class SimilarStartupsOutput(BaseModel):
+    k: int
+    population: int
+    success_rate: float
+    neighbors: List[Dict[str, Any]]
+    search_ms: float
+
+class PitchInput(BaseModel):
+    pitch_text: str
+    startup_name: Optional[str] = None
+    category: Optional[str] = None
+    team_size: Optional[int] = None
+    funding_total: Optional[float] = None
+
+class PitchBatchInput(BaseModel):
+    pitches: List[PitchInput] = Field(..., min_length=1, max_length=1000)
+
+class PitchBatchOutput(BaseModel):
+    results: List[Dict[str, Any]]
+    count: int
+
+ADVISOR_HISTORY_TURNS = int(os.environ.get('ADVISOR_HISTORY_TURNS', 20))
 
 class AdvisorInput(BaseModel):
     question: str
     startup_data: Optional[Dict] = None
     conversation_history: Optional[List[Dict]] = []
+    session_id: Optional[str] = None
+    include_paths: bool = False   # lead with counterfactual paths to success (~60ms per new startup)
+
+    @field_validator('conversation_history')
+    @classmethod
+    def keep_recent_history(cls, history):
+        return history[-ADVISOR_HISTORY_TURNS:] if history else history
+
+class PortfolioReportInput(BaseModel):
+    startups: List[Dict] = Field(min_length=1, max_length=1000)
+    questions: List[str] = Field(min_length=1, max_length=10)
+
+class AdvisorSessionInput(BaseModel):
+    startup_data: Dict
+    include_paths: bool = False
+
+class AdvisorSessionOutput(BaseModel):
+    session_id: str
+    expires_in: int
+    insights: List[str]
 
 class AdvisorOutput(BaseModel):
     answer: str
@@ -108,82 +640,128 @@ class AdvisorOutput(BaseModel):
     relevant_metrics: Dict[str, Any]
     source: str
 
+# ==================== FEATURE ENGINEERING ====================
+
+def encode_labels(encoder, values) -> np.ndarray:
+    """Vectorized LabelEncoder.transform; unseen labels map to 0"""
+    values = np.asarray(values, dtype=str)
+    if encoder is None:
+        return np.zeros(len(values), dtype=np.int64)
+    classes = np.asarray(encoder.classes_, dtype=str)
+    idx = np.clip(np.searchsorted(classes, values), 0, len(classes) - 1)
+    return np.where(classes[idx] == values, idx, 0)
+
+def encode_category(feature: str, encoder, values, categories: Dict[str, np.ndarray]) -> np.ndarray:
+    """Model input for a categorical feature: native category code (NaN if unseen) or label index"""
+    if feature not in categories:
+        return encode_labels(encoder, values)
+    classes = categories[feature]
+    values = np.asarray(values, dtype=str)
+    idx = np.clip(np.searchsorted(classes, values), 0, len(classes) - 1)
+    return np.where(classes[idx] == values, idx, np.nan)
+
+def startup_columns(startups: List[StartupInput]) -> Dict[str, np.ndarray]:
+    """Column-wise raw inputs for a batch of startups (float32, as the model consumes them)"""
+    f32 = np.float32
+    return {
+        'funding_total': np.array([s.funding_total for s in startups], dtype=f32),
+        'founded_year': np.array([s.founded_year for s in startups], dtype=f32),
+        'team_size': np.array([s.team_size for s in startups], dtype=f32),
+        'funding_rounds': np.array([s.funding_rounds for s in startups], dtype=f32),
+        'monthly_revenue': np.array([s.monthly_revenue for s in startups], dtype=f32),
+        'user_growth_rate': np.array([s.user_growth_rate for s in startups], dtype=f32),
+        'burn_rate': np.array([s.burn_rate for s in startups], dtype=f32),
+        'market_size': np.array([s.market_size for s in startups], dtype=f32),
+        'category': np.array([s.category for s in startups], dtype=str),
+        'location': np.array([s.location for s in startups], dtype=str),
+        'num_strengths': np.array([len(s.key_strengths or []) for s in startups], dtype=f32),
+        'num_challenges': np.array([len(s.main_challenges or []) for s in startups], dtype=f32),
+        'description_length': np.array([len(s.description or '') for s in startups], dtype=f32),
+        'problem_length': np.array([len(s.problem_solving or '') for s in startups], dtype=f32),
+    }
+
+def build_feature_matrix(cols: Dict[str, np.ndarray]) -> np.ndarray:
+    """Engineer every registered model's features for a batch into one float32 matrix (registry union order,
+    which starts with feature_columns)"""
+    funding_total = cols['funding_total']
+    founded_year = cols['founded_year']
+    team_size = cols['team_size']
+    funding_rounds = cols['funding_rounds']
+    burn_rate = cols['burn_rate']
+    num_strengths = cols['num_strengths']
+    num_challenges = cols['num_challenges']
+
+    company_age = 2025 - founded_year
+    n = len(funding_total)
+
+    features = {
+        'funding_total': funding_total,
+        'founded_year': founded_year,
+        'team_size': team_size,
+        'funding_rounds': funding_rounds,
+        'monthly_revenue': cols['monthly_revenue'],
+        'user_growth_rate': cols['user_growth_rate'],
+        'burn_rate': burn_rate,
+        'market_size': cols['market_size'],
+        'company_age': company_age,
+        'funding_per_round': funding_total / (funding_rounds + 1),
+        'funding_velocity': funding_total / (company_age + 1),
+        'revenue_to_burn_ratio': cols['monthly_revenue'] / (burn_rate + 1),
+        'funding_efficiency': cols['user_growth_rate'] * funding_total / 1e6,
+        'category_encoded': encode_category('category_encoded', category_encoder, cols['category'], native_categories),
+        'location_encoded': encode_category('location_encoded', location_encoder, cols['location'], native_categories),
+        'num_strengths': num_strengths,
+        'num_challenges': num_challenges,
+        'strength_to_challenge_ratio': num_strengths / (num_challenges + 1),
+        'description_length': cols['description_length'],
+        'problem_length': cols['problem_length'],
+        'runway_months': np.where(burn_rate > 0, funding_total / (burn_rate * 12 + 1), 12),
+        'location_tier': 1,
+        'founded_in_recession': np.isin(founded_year, [2008, 2009, 2020, 2023]),
+        'is_well_funded': funding_total > 1_000_000,
+        'optimal_age': (company_age >= 2) & (company_age <= 6),
+        'optimal_team': (team_size >= 5) & (team_size <= 50)
+    }
+
+    # Written column by column into one float32 block, in the registry's union order
+    matrix = np.empty((n, len(model_registry.union)), dtype=np.float32)
+    for j, name in enumerate(model_registry.union):
+        matrix[:, j] = features[name]
+    return matrix
+
+def model_dmatrix(matrix: np.ndarray) -> xgb.DMatrix:
+    return xgb.DMatrix(matrix, feature_names=feature_columns, feature_types=feature_types,
+                       enable_categorical=bool(native_categories))
+
+def feature_dmatrix(cols: Dict[str, np.ndarray]) -> xgb.DMatrix:
+    return model_dmatrix(primary_model.matrix(build_feature_matrix(cols), cols))
+
 # ==================== PREDICTION ENDPOINT ====================
 
 @app.post("/predict/success", response_model=PredictionOutput)
-async def predict_success(startup: StartupInput):
-    """Predict startup success probability"""
+async def predict_success(startup: StartupInput, background_tasks: BackgroundTasks, model: Optional[str] = None):
+    """Predict startup success probability (primary model unless ?model=<name>)"""
     try:
-        # Feature engineering
         company_age = 2025 - startup.founded_year
-        funding_per_round = startup.funding_total / (startup.funding_rounds + 1)
-        funding_velocity = startup.funding_total / (company_age + 1)
-        revenue_to_burn_ratio = startup.monthly_revenue / (startup.burn_rate + 1)
-        funding_efficiency = startup.user_growth_rate * startup.funding_total / 1e6
-        
         num_strengths = len(startup.key_strengths) if startup.key_strengths else 0
         num_challenges = len(startup.main_challenges) if startup.main_challenges else 0
-        strength_to_challenge_ratio = num_strengths / (num_challenges + 1)
-        
-        description_length = len(startup.description) if startup.description else 0
-        problem_length = len(startup.problem_solving) if startup.problem_solving else 0
-        
-        runway_months = startup.funding_total / (startup.burn_rate * 12 + 1) if startup.burn_rate > 0 else 12
-        location_tier = 1
-        founded_in_recession = 1 if startup.founded_year in [2008, 2009, 2020, 2023] else 0
-        is_well_funded = 1 if startup.funding_total > 1_000_000 else 0
-        optimal_age = 1 if 2 <= company_age <= 6 else 0
-        optimal_team = 1 if 5 <= startup.team_size <= 50 else 0
-        
-        # Encode categories
-        try:
-            category_encoded = category_encoder.transform([startup.category])[0] if category_encoder else 0
-        except:
-            category_encoded = 0
-        
-        try:
-            location_encoded = location_encoder.transform([startup.location])[0] if location_encoder else 0
-        except:
-            location_encoded = 0
-        
-        # Build feature dictionary
-        feature_dict = {
-            'funding_total': startup.funding_total,
-            'founded_year': startup.founded_year,
-            'team_size': startup.team_size,
-            'funding_rounds': startup.funding_rounds,
-            'monthly_revenue': startup.monthly_revenue,
-            'user_growth_rate': startup.user_growth_rate,
-            'burn_rate': startup.burn_rate,
-            'market_size': startup.market_size,
-            'company_age': company_age,
-            'funding_per_round': funding_per_round,
-            'funding_velocity': funding_velocity,
-            'revenue_to_burn_ratio': revenue_to_burn_ratio,
-            'funding_efficiency': funding_efficiency,
-            'category_encoded': category_encoded,
-            'location_encoded': location_encoded,
-            'num_strengths': num_strengths,
-            'num_challenges': num_challenges,
-            'strength_to_challenge_ratio': strength_to_challenge_ratio,
-            'description_length': description_length,
-            'problem_length': problem_length,
-            'runway_months': runway_months,
-            'location_tier': location_tier,
-            'founded_in_recession': founded_in_recession,
-            'is_well_funded': is_well_funded,
-            'optimal_age': optimal_age,
-            'optimal_team': optimal_team
-        }
+        served = model_registry.get(model)
         
         # Predict
-        if xgb_model and feature_columns:
-            features = pd.DataFrame([feature_dict])
-            features = features[feature_columns]
-            dmatrix = xgb.DMatrix(features)
-            probability = float(xgb_model.predict(dmatrix)[0]) * 100
+        if served is not None:
+            cols = startup_columns([startup])
+            union = build_feature_matrix(cols)
+            matrix = served.matrix(union, cols)
+            probabilities = served.predict(matrix)
+            if served is primary_model:
+                record_predictions(matrix, probabilities)
+                if model_registry.shadows:
+                    background_tasks.add_task(model_registry.run_shadows, union, cols, probabilities)
+            percentiles = served.scores.rank(probabilities, cols)[0] if served.scores else {}
+            probability = float(probabilities[0]) * 100
         else:
             probability = simple_prediction(startup, company_age, num_strengths, num_challenges)
+            percentiles = {}
         
         # Explanation
         explanation = {
@@ -199,14 +777,16 @@ async def predict_success(startup: StartupInput):
         
         # Model info
         model_info_dict = {
-            'available': xgb_model is not None,
+            'available': served is not None,
             'device': DEVICE,
-            'features': len(feature_columns) if feature_columns else 0
+            'features': len(served.features) if served else 0
         }
-        if model_metadata:
+        if served is not None:
+            model_info_dict.update({'name': served.name, 'version': served.version})
+        if served is not None and served.metadata:
             model_info_dict.update({
-                'accuracy': model_metadata.get('accuracy', 0),
-                'auc': model_metadata.get('auc', 0)
+                'accuracy': served.metadata.get('accuracy', 0),
+                'auc': served.metadata.get('auc', 0)
             })
         
         return PredictionOutput(
@@ -215,9 +795,232 @@ async def predict_success(startup: StartupInput):
             confidence=round(confidence, 2),
             explanation=explanation,
             processing_device=DEVICE,
-            model_info=model_info_dict
+            model_info=model_info_dict,
+            percentiles=percentiles
         )
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict/compare", response_model=ModelCompareOutput)
+async def compare_models(input: ModelCompareInput):
+    """Score one startup with several models from a single feature-engineering pass"""
+    if model_registry.primary is None:
+        raise HTTPException(status_code=503, detail="No model loaded")
+    names = input.models or list(model_registry.models)
+    try:
+        start = time.perf_counter()
+        cols = startup_columns([input.startup])
+        scores = model_registry.score(names, build_feature_matrix(cols), cols)
+        return ModelCompareOutput(
+            primary=model_registry.primary.name,
+            probabilities={name: round(float(p[0]) * 100, 2) for name, p in scores.items()},
+            versions={name: model_registry.models[name].version for name in scores},
+            processing_time_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/models")
+async def list_models():
+    """Registered models, the primary, and shadow comparison stats"""
+    return model_registry.snapshot()
+
+# ==================== WHAT-IF SWEEP ENDPOINT ====================
+
+SWEEP_FIELDS = {
+    'funding_total': float, 'founded_year': int, 'team_size': int, 'funding_rounds': int,
+    'monthly_revenue': float, 'user_growth_rate': float, 'burn_rate': float, 'market_size': float
+}
+SWEEP_MAX_STEPS = 200
+
+def sweep_axis_values(axis: SweepAxis) -> np.ndarray:
+    """Materialize the values of one sweep axis"""
+    if axis.field not in SWEEP_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Cannot sweep '{axis.field}'. Options: {list(SWEEP_FIELDS)}")
+
+    if axis.values:
+        values = np.asarray(axis.values, dtype=float)
+    elif axis.start is not None and axis.stop is not None:
+        if axis.log_scale:
+            if axis.start <= 0 or axis.stop <= 0:
+                raise HTTPException(status_code=400, detail="log_scale axes need positive start/stop")
+            values = np.geomspace(axis.start, axis.stop, axis.steps)
+        else:
+            values = np.linspace(axis.start, axis.stop, axis.steps)
+    else:
+        raise HTTPException(status_code=400, detail=f"Axis '{axis.field}' needs values or start/stop")
+
+    if SWEEP_FIELDS[axis.field] is int:
+        values = np.unique(np.round(values))
+    if len(values) > SWEEP_MAX_STEPS:
+        raise HTTPException(status_code=400, detail=f"At most {SWEEP_MAX_STEPS} values per axis")
+    return values
+
+@app.post("/predict/sweep", response_model=SweepOutput)
+async def predict_sweep(input: SweepInput):
+    """Score a 1D/2D what-if grid around a base startup in one booster call"""
+    if not 1 <= len(input.axes) <= 2:
+        raise HTTPException(status_code=400, detail="Provide one or two axes")
+    if len({axis.field for axis in input.axes}) != len(input.axes):
+        raise HTTPException(status_code=400, detail="Axes must sweep different fields")
+    if not (xgb_model and feature_columns):
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    axis_values = [sweep_axis_values(axis) for axis in input.axes]
+    grid = np.meshgrid(*axis_values, indexing='ij')
+    n_variants = grid[0].size
+
+    # Base row repeated n times, swept fields overwritten with the grid
+    base = startup_columns([input.startup])
+    cols = {name: np.repeat(values, n_variants) for name, values in base.items()}
+    for axis, mesh in zip(input.axes, grid):
+        cols[axis.field] = mesh.ravel().astype(np.float32)
+
+    try:
+        probabilities = xgb_model.predict(feature_dmatrix(cols)) * 100
+        base_probability = float(xgb_model.predict(feature_dmatrix(base))[0]) * 100
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    surface = np.round(probabilities.astype(float).reshape(grid[0].shape), 2)
+
+    return SweepOutput(
+        axes=[{'field': axis.field, 'values': values.tolist()} for axis, values in zip(input.axes, axis_values)],
+        probabilities=surface.tolist(),
+        base_probability=round(base_probability, 2),
+        n_variants=int(n_variants)
+    )
+
+# ==================== COUNTERFACTUAL SEARCH ====================
+
+# Actionable inputs. Changes are measured in log2 units of (x + offset), so doubling funding and
+# doubling revenue cost the same; low/high bound the step sampled for each field.
+COUNTERFACTUAL_FIELDS = {
+    'funding_total': {'low': 0.0, 'high': 3.3, 'offset': 100_000, 'integer': False},
+    'monthly_revenue': {'low': 0.0, 'high': 4.0, 'offset': 10_000, 'integer': False},
+    'burn_rate': {'low': -2.0, 'high': 1.0, 'offset': 10_000, 'integer': False},
+    'team_size': {'low': -1.5, 'high': 2.0, 'offset': 2, 'integer': True},
+    'funding_rounds': {'low': 0.0, 'high': 1.5, 'offset': 1, 'integer': True},
+}
+COUNTERFACTUAL_CHANGE_COST = 0.5     # extra cost per changed field: prefer fewer changes
+COUNTERFACTUAL_BATCH = 2048          # candidates scored per booster call
+COUNTERFACTUAL_MAX_ITERATIONS = 20
+COUNTERFACTUAL_BUDGET_MS = float(os.environ.get('COUNTERFACTUAL_BUDGET_MS', 60))
+COUNTERFACTUAL_CACHE_SIZE = 4096
+COUNTERFACTUAL_OPTIONS = 3
+
+counterfactual_cache = OrderedDict()
+
+def sample_steps(rng, n: int, max_changes: int, incumbent: Optional[np.ndarray]) -> np.ndarray:
+    """Candidate log2 steps: random sparse changes, half of them shrunk from the best so far"""
+    fields = list(COUNTERFACTUAL_FIELDS.values())
+    low = np.array([f['low'] for f in fields])
+    high = np.array([f['high'] for f in fields])
+
+    # Keep a random subset of at most max_changes fields per candidate (at least one)
+    keys = rng.random((n, len(fields)))
+    keys[np.arange(n), rng.integers(0, len(fields), n)] = 0
+    rank = np.argsort(np.argsort(keys, axis=1), axis=1)
+    mask = (keys < 0.4) & (rank < max_changes)
+    steps = rng.uniform(low, high, (n, len(fields))) * mask
+
+    if incumbent is not None:
+        local = n // 2
+        shrink = rng.uniform(0.3, 1.05, (local, len(fields))) * (rng.random((local, len(fields))) > 0.15)
+        steps[:local] = incumbent * shrink
+    return steps
+
+def apply_steps(base: Dict[str, np.ndarray], steps: np.ndarray):
+    """Candidate input columns plus the steps actually taken after rounding and clipping"""
+    n = len(steps)
+    cols = {name: np.repeat(values, n) for name, values in base.items()}
+    actual = np.empty_like(steps)
+    for j, (name, spec) in enumerate(COUNTERFACTUAL_FIELDS.items()):
+        start = float(base[name][0])
+        values = (start + spec['offset']) * np.exp2(steps[:, j]) - spec['offset']
+        if spec['integer']:
+            values = np.round(values)
+        values = np.maximum(values, 1 if name == 'team_size' else 0)
+        cols[name] = values.astype(np.float32)
+        actual[:, j] = np.log2((values + spec['offset']) / (start + spec['offset']))
+    return cols, actual
+
+def search_counterfactuals(startup: StartupInput, target: float, max_changes: int,
+                           budget_ms: float = COUNTERFACTUAL_BUDGET_MS) -> Dict[str, Any]:
+    """Cheapest changes to the actionable fields that lift the primary model's probability to target (0-1)"""
+    start = time.perf_counter()
+    base = startup_columns([startup])
+    current = float(primary_model.predict(primary_model.matrix(build_feature_matrix(base), base))[0])
+    result = {'current_probability': round(current * 100, 2), 'target_probability': round(target * 100, 2),
+              'reachable': current >= target, 'options': [], 'candidates_scored': 0, 'iterations': 0}
+    if current >= target:
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    # Seeded from the request so the same startup always gets the same answer
+    rng = np.random.default_rng(int.from_bytes(hashlib.blake2b(
+        startup.model_dump_json().encode(), digest_size=8).digest(), 'little'))
+    names = list(COUNTERFACTUAL_FIELDS)
+    best_by_fields = {}   # changed-field set -> (cost, steps, values, probability)
+    incumbent = None
+
+    while (result['iterations'] < COUNTERFACTUAL_MAX_ITERATIONS and
+           (time.perf_counter() - start) * 1000 < budget_ms):
+        steps = sample_steps(rng, COUNTERFACTUAL_BATCH, max_changes, incumbent)
+        cols, actual = apply_steps(base, steps)
+        probabilities = primary_model.predict(primary_model.matrix(build_feature_matrix(cols), cols))
+        changed = np.abs(actual) > 1e-6
+        cost = np.abs(actual).sum(axis=1) + COUNTERFACTUAL_CHANGE_COST * changed.sum(axis=1)
+        result['candidates_scored'] += len(steps)
+        result['iterations'] += 1
+
+        feasible = np.flatnonzero((probabilities >= target) & changed.any(axis=1))
+        for i in feasible[np.argsort(cost[feasible])]:
+            key = tuple(np.flatnonzero(changed[i]))
+            if key not in best_by_fields or cost[i] < best_by_fields[key][0]:
+                best_by_fields[key] = (float(cost[i]), actual[i], {n: float(cols[n][i]) for n in names},
+                                       float(probabilities[i]))
+        if best_by_fields:
+            incumbent = min(best_by_fields.values(), key=lambda option: option[0])[1]
+
+    for key, (cost, _, values, probability) in sorted(best_by_fields.items(), key=lambda kv: kv[1][0])[:COUNTERFACTUAL_OPTIONS]:
+        result['options'].append({
+            'changes': {names[j]: {'from': round(float(base[names[j]][0]), 2), 'to': round(values[names[j]], 2)}
+                        for j in key},
+            'probability': round(probability * 100, 2),
+            'cost': round(cost, 3)
+        })
+    result['reachable'] = bool(result['options'])
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+def cached_counterfactuals(startup: StartupInput, target: float, max_changes: int) -> Dict[str, Any]:
+    """search_counterfactuals memoized per (startup, target, model) fingerprint"""
+    fingerprint = hashlib.blake2b(json.dumps(
+        [startup.model_dump(), round(target, 4), max_changes, primary_model.version],
+        sort_keys=True).encode(), digest_size=16).hexdigest()
+    if fingerprint in counterfactual_cache:
+        counterfactual_cache.move_to_end(fingerprint)
+        return {**counterfactual_cache[fingerprint], 'cached': True}
+    result = search_counterfactuals(startup, target, max_changes)
+    counterfactual_cache[fingerprint] = result
+    if len(counterfactual_cache) > COUNTERFACTUAL_CACHE_SIZE:
+        counterfactual_cache.popitem(last=False)
+    return {**result, 'cached': False}
+
+@app.post("/predict/counterfactual", response_model=CounterfactualOutput)
+async def predict_counterfactual(input: CounterfactualInput):
+    """Smallest changes to team, funding, revenue and burn that reach the target probability"""
+    if primary_model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    try:
+        return CounterfactualOutput(**cached_counterfactuals(input.startup, input.target_probability / 100,
+                                                             input.max_changes))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -266,90 +1069,95 @@ def analyze_question_intent(question: str) -> Dict[str, Any]:
         'question_type': 'specific' if len(question.split()) > 5 else 'general'
     }
 
-def analyze_startup_with_ml(startup_data: Dict) -> Dict[str, Any]:
-    """Use XGBoost model to analyze startup and generate insights"""
-    if not xgb_model or not startup_data:
-        return {}
+def advisor_startup_input(startup_data: Dict) -> StartupInput:
+    """Advisor startup_data as a StartupInput, with the same defaults analyze_startup_with_ml uses"""
+    funding_total = startup_data.get('funding', {}).get('total', 0)
+    return StartupInput(
+        funding_total=funding_total,
+        founded_year=startup_data.get('founded_year', 2023),
+        category=startup_data.get('category', 'Technology'),
+        location=startup_data.get('location', 'USA'),
+        team_size=startup_data.get('team_size', 3),
+        funding_rounds=startup_data.get('funding', {}).get('rounds', 0),
+        burn_rate=funding_total / 18 / 12 if funding_total > 0 else 5000,
+        market_size=10000000,
+        description=startup_data.get('description', ''),
+        problem_solving=startup_data.get('problem_solving', ''),
+        key_strengths=startup_data.get('key_strengths', []),
+        main_challenges=startup_data.get('main_challenges', [])
+    )
+
+def describe_change(field: str, before: float, after: float) -> str:
+    if field == 'funding_total':
+        return f"raise total funding to ${after / 1e6:.1f}M"
+    if field == 'monthly_revenue':
+        return f"reach ${after:,.0f}/month in revenue"
+    if field == 'burn_rate':
+        return f"{'cut' if after < before else 'raise'} burn to ${after:,.0f}/month"
+    if field == 'team_size':
+        return f"{'grow' if after > before else 'trim'} the team to {after:.0f}"
+    rounds = int(after - before)
+    return f"close {rounds} more funding round{'s' if rounds != 1 else ''}"
+
+def analyze_startups_with_ml(startups: List[Dict], paths: bool = False) -> List[Dict[str, Any]]:
+    """Use XGBoost model to analyze a batch of startups: one booster call, one percentile lookup
+    and one neighbour search for all of them; with paths, counterfactual paths are searched per startup"""
+    if not xgb_model or not startups:
+        return [{} for _ in startups]
     
     try:
-        # Calculate features
-        company_age = 2025 - startup_data.get('founded_year', 2023)
-        funding_total = startup_data.get('funding', {}).get('total', 0)
-        team_size = startup_data.get('team_size', 3)
+        # Same inputs and feature engineering as /predict/success and the counterfactual search
+        inputs = [advisor_startup_input(s) for s in startups]
+        cols = startup_columns(inputs)
+        matrix = primary_model.matrix(build_feature_matrix(cols), cols)
+        probabilities = primary_model.predict(matrix)
+        percentiles = primary_model.scores.rank(probabilities, cols) if primary_model.scores else [{} for _ in startups]
+        neighbors = similar_startups(matrix, ADVISOR_NEIGHBORS) if similar_index else [[] for _ in startups]
         
-        funding_per_round = funding_total / (startup_data.get('funding', {}).get('rounds', 0) + 1)
-        funding_velocity = funding_total / (company_age + 1)
-        
-        num_strengths = len(startup_data.get('key_strengths', []))
-        num_challenges = len(startup_data.get('main_challenges', []))
-        
-        # Encode category
-        try:
-            category_encoded = category_encoder.transform([startup_data.get('category', 'Technology')])[0] if category_encoder else 0
-        except:
-            category_encoded = 0
-        
-        try:
-            location_encoded = location_encoder.transform([startup_data.get('location', 'USA')])[0] if location_encoder else 0
-        except:
-            location_encoded = 0
-        
-        # Build feature dict
-        feature_dict = {
-            'funding_total': funding_total,
-            'founded_year': startup_data.get('founded_year', 2023),
-            'team_size': team_size,
-            'funding_rounds': startup_data.get('funding', {}).get('rounds', 0),
-            'monthly_revenue': 0,
-            'user_growth_rate': 0.5,
-            'burn_rate': funding_total / 18 / 12 if funding_total > 0 else 5000,
-            'market_size': 10000000,
-            'company_age': company_age,
-            'funding_per_round': funding_per_round,
-            'funding_velocity': funding_velocity,
-            'revenue_to_burn_ratio': 0,
-            'funding_efficiency': 0.5,
-            'category_encoded': category_encoded,
-            'location_encoded': location_encoded,
-            'num_strengths': num_strengths,
-            'num_challenges': num_challenges,
-            'strength_to_challenge_ratio': num_strengths / (num_challenges + 1),
-            'description_length': len(startup_data.get('description', '')),
-            'problem_length': len(startup_data.get('problem_solving', '')),
-            'runway_months': funding_total / (funding_total / 18 + 1) if funding_total > 0 else 12,
-            'location_tier': 1,
-            'founded_in_recession': 1 if startup_data.get('founded_year', 2023) in [2008, 2009, 2020, 2023] else 0,
-            'is_well_funded': 1 if funding_total > 1000000 else 0,
-            'optimal_age': 1 if 2 <= company_age <= 6 else 0,
-            'optimal_team': 1 if 5 <= team_size <= 50 else 0
-        }
-        
-        # Predict with XGBoost
-        features = pd.DataFrame([feature_dict])
-        features = features[feature_columns]
-        dmatrix = xgb.DMatrix(features)
-        success_probability = float(xgb_model.predict(dmatrix)[0]) * 100
-        
-        # Get feature importance for this prediction
-        importance = {}
-        for feat in feature_columns[:10]:
-            importance[feat] = float(feature_dict.get(feat, 0))
-        
-        return {
-            'success_probability': success_probability,
-            'company_age': company_age,
-            'funding_status': 'well-funded' if funding_total > 1000000 else 'bootstrap' if funding_total == 0 else 'seed-stage',
-            'team_status': 'optimal' if 5 <= team_size <= 50 else 'small' if team_size < 5 else 'large',
-            'stage': 'early' if company_age < 2 else 'growth' if company_age < 5 else 'mature',
-            'key_metrics': importance,
-            'funding_total': funding_total,
-            'team_size': team_size,
-            'num_strengths': num_strengths,
-            'num_challenges': num_challenges
-        }
+        results = []
+        for i, startup in enumerate(inputs):
+            company_age = 2025 - startup.founded_year
+            funding_total = startup.funding_total
+            team_size = startup.team_size
+            
+            insights = {
+                'success_probability': float(probabilities[i]) * 100,
+                'company_age': company_age,
+                'funding_status': 'well-funded' if funding_total > 1000000 else 'bootstrap' if funding_total == 0 else 'seed-stage',
+                'team_status': 'optimal' if 5 <= team_size <= 50 else 'small' if team_size < 5 else 'large',
+                'stage': 'early' if company_age < 2 else 'growth' if company_age < 5 else 'mature',
+                # Get feature importance for this prediction
+                'key_metrics': {feat: float(value) for feat, value in zip(feature_columns[:10], matrix[i])},
+                'percentiles': percentiles[i],
+                'similar_startups': {
+                    'k': len(neighbors[i]),
+                    'success_rate': neighbor_success_rate(neighbors[i]),
+                    'examples': neighbors[i][:3]
+                } if neighbors[i] else {},
+                'funding_total': funding_total,
+                'team_size': team_size,
+                'num_strengths': len(startup.key_strengths or []),
+                'num_challenges': len(startup.main_challenges or [])
+            }
+            if paths:
+                # Aim ten points above today, at least 70%
+                target = min(max(0.7, probabilities[i] + 0.1), 0.95)
+                path = cached_counterfactuals(startup, float(target), 2)
+                insights['path_to_success'] = {
+                    'target_probability': path['target_probability'],
+                    'options': path['options']
+                }
+            results.append(insights)
+        return results
     except Exception as e:
         print(f"ML analysis error: {e}")
+        return [{} for _ in startups]
+
+def analyze_startup_with_ml(startup_data: Dict, paths: bool = False) -> Dict[str, Any]:
+    """Use XGBoost model to analyze startup and generate insights"""
+    if not startup_data:
         return {}
+    return analyze_startups_with_ml([startup_data], paths)[0]
 
 def generate_dynamic_response(question: str, intent_analysis: Dict, ml_insights: Dict, startup_data: Dict) -> str:
     """Generate response dynamically based on ML analysis"""
@@ -412,8 +1220,17 @@ def generate_funding_advice(startup_data: Dict, ml_insights: Dict, question: str
     
     # ML-based assessment
     response += f"### ML Model Assessment\n\n"
-    response += f"Based on analysis of your metrics against {12000} similar startups:\n"
-    response += f"- **Success Probability:** {success_prob:.1f}%\n"
+    percentiles = ml_insights.get('percentiles', {})
+    if percentiles:
+        response += f"Based on analysis of your metrics against {percentiles['population']:,} startups:\n"
+        response += f"- **Success Probability:** {success_prob:.1f}% (scores above {percentiles['percentile']:.0f}% of startups)\n"
+    else:
+        response += f"Based on analysis of your metrics:\n"
+        response += f"- **Success Probability:** {success_prob:.1f}%\n"
+    similar = ml_insights.get('similar_startups', {})
+    if similar:
+        response += (f"- **Similar Startups:** {round(similar['success_rate'] * similar['k'])} of the "
+                     f"{similar['k']} most similar succeeded\n")
     response += f"- **Recommended Action:** "
     
     if success_prob > 70:
@@ -535,8 +1352,12 @@ def generate_pros_cons(startup_data: Dict, ml_insights: Dict, question: str) ->
     category = startup_data.get('category', 'Technology')
     name = startup_data.get('name', 'Your Startup')
     
+    percentiles = ml_insights.get('percentiles', {})
     response += f"**Overall ML Score:** {success_prob:.1f}% success probability\n"
-    response += f"*Analysis based on comparison with 12,000 similar startups*\n\n"
+    if percentiles:
+        response += f"*Analysis based on comparison with {percentiles['population']:,} startups*\n\n"
+    else:
+        response += f"\n"
     response += f"---\n\n"
     
     # STRENGTHS
@@ -548,8 +1369,12 @@ def generate_pros_cons(startup_data: Dict, ml_insights: Dict, question: str) ->
         pros_count += 1
         response += f"### {pros_count}. Strong ML Success Signal ({success_prob:.0f}%)\n\n"
         response += f"**Why This Matters:**\n"
-        response += f"- Model analyzed 26 features across your startup\n"
-        response += f"- Your score is in the top 30% of all startups\n"
+        response += f"- Model analyzed {len(feature_columns)} features across your startup\n"
+        if percentiles:
+            response += f"- Your score is in the top {max(100 - percentiles['percentile'], 0.1):.1f}% of all startups\n"
+            if percentiles.get('category_percentile') is not None:
+                response += (f"- Top {max(100 - percentiles['category_percentile'], 0.1):.1f}% of "
+                             f"{percentiles['category_population']:,} {category} startups\n")
         response += f"- Indicates strong fundamentals and execution\n\n"
         response += f"**Leverage This:**\n"
         response += f"- Use in investor pitches as third-party validation\n"
@@ -951,60 +1776,873 @@ def generate_general_advice(startup_data: Dict, ml_insights: Dict, question: str
 
 # ==================== AI ADVISOR ENDPOINT ====================
 
+def build_advisor_output(question: str, ml_insights: Dict, startup_data: Dict) -> AdvisorOutput:
+    """Render the advisor answer from precomputed ML insights"""
+    # Analyze question intent using NLP
+    intent_analysis = analyze_question_intent(question)
+    
+    # Generate dynamic response based on ML insights
+    answer = generate_dynamic_response(
+        question,
+        intent_analysis,
+        ml_insights,
+        startup_data
+    )
+    
+    # Calculate confidence based on ML model accuracy
+    confidence = 0.85 if xgb_model else 0.5  # 85% confidence if using trained model
+    
+    return AdvisorOutput(
+        answer=answer,
+        confidence=confidence,
+        insights=advisor_insights(ml_insights),
+        recommendations=advisor_recommendations(ml_insights),
+        relevant_metrics=ml_insights.get('key_metrics', {}),
+        source="XGBoost ML-Powered Advisor"
+    )
+
+def advisor_insights(ml_insights: Dict) -> List[str]:
+    """Generate insights from ML model"""
+    insights = []
+    if ml_insights:
+        success_prob = ml_insights.get('success_probability', 50)
+        insights.append(f"Success probability: {success_prob:.1f}%")
+        if ml_insights.get('percentiles'):
+            insights.append(f"Percentile: scores above {ml_insights['percentiles']['percentile']:.0f}% of "
+                            f"{ml_insights['percentiles']['population']:,} startups")
+        if ml_insights.get('similar_startups'):
+            similar = ml_insights['similar_startups']
+            insights.append(f"Similar startups: {similar['success_rate']:.0%} of the {similar['k']} nearest succeeded")
+        insights.append(f"Company stage: {ml_insights.get('stage', 'early').title()}")
+        insights.append(f"Funding status: {ml_insights.get('funding_status', 'unknown').title()}")
+        insights.append(f"Team size: {ml_insights.get('team_status', 'unknown').title()}")
+    return insights
+
+def advisor_recommendations(ml_insights: Dict) -> List[str]:
+    """Generate action recommendations"""
+    recommendations = []
+    path = ml_insights.get('path_to_success', {})
+    for option in path.get('options', [])[:2]:
+        steps = [describe_change(field, change['from'], change['to']) for field, change in option['changes'].items()]
+        recommendations.append(f"Path to {path['target_probability']:.0f}%: {' and '.join(steps)} "
+                               f"(model estimate {option['probability']:.0f}%)")
+    if ml_insights.get('success_probability', 50) < 50:
+        recommendations.append("CRITICAL: Focus on improving product-market fit immediately")
+    if ml_insights.get('funding_status') == 'bootstrap' and ml_insights.get('success_probability', 50) > 60:
+        recommendations.append("Consider raising seed round - you have strong leverage")
+    if ml_insights.get('team_status') == 'small':
+        recommendations.append("Make 1-2 strategic hires to accelerate growth")
+    if ml_insights.get('company_age', 0) < 1:
+        recommendations.append("Focus on validation: talk to 50+ customers this month")
+    return recommendations
+
 @app.post("/advisor/ask", response_model=AdvisorOutput)
 async def ai_advisor(input: AdvisorInput):
     """Dynamic AI advisor using XGBoost ML model"""
+    if input.session_id:
+        session = advisor_sessions.get(input.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Advisor session not found or expired")
+        try:
+            output = build_advisor_output(input.question, session.ml_insights, session.startup_data)
+            advisor_sessions.record_turn(session, input.question, output.answer)
+            return output
+        except Exception as e:
+            print(f"Advisor error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     try:
-        # Analyze question intent using NLP
-        intent_analysis = analyze_question_intent(input.question)
-        
         # Run ML analysis on startup data
-        ml_insights = analyze_startup_with_ml(input.startup_data) if input.startup_data else {}
+        ml_insights = analyze_startup_with_ml(input.startup_data, input.include_paths) if input.startup_data else {}
+        return build_advisor_output(input.question, ml_insights, input.startup_data or {})
         
-        # Generate dynamic response based on ML insights
-        answer = generate_dynamic_response(
-            input.question,
-            intent_analysis,
-            ml_insights,
-            input.startup_data or {}
+    except Exception as e:
+        print(f"Advisor error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== ADVISOR SESSIONS ====================
+
+ADVISOR_SESSION_TTL_S = int(os.environ.get('ADVISOR_SESSION_TTL_S', 1800))
+ADVISOR_MAX_SESSIONS = int(os.environ.get('ADVISOR_MAX_SESSIONS', 10000))
+ADVISOR_MAX_BYTES = int(os.environ.get('ADVISOR_MAX_BYTES', 64 * 1024 * 1024))
+ADVISOR_TURN_CHARS = 2000
+
+class AdvisorSession:
+    """Startup profile, its ML insights and a bounded history ring"""
+    __slots__ = ('session_id', 'startup_data', 'ml_insights', 'history', 'last_used', 'base_bytes', 'history_bytes')
+
+    def __init__(self, session_id: str, startup_data: Dict, ml_insights: Dict):
+        self.session_id = session_id
+        self.startup_data = startup_data
+        self.ml_insights = ml_insights
+        self.history = deque(maxlen=ADVISOR_HISTORY_TURNS)
+        self.last_used = time.monotonic()
+        self.base_bytes = len(json.dumps(startup_data, default=str)) + len(json.dumps(ml_insights, default=str))
+        self.history_bytes = 0
+
+    @property
+    def size(self) -> int:
+        return self.base_bytes + self.history_bytes
+
+class AdvisorSessionStore:
+    """LRU + TTL session cache with a global memory cap"""
+
+    def __init__(self, max_sessions: int, ttl_s: int, max_bytes: int):
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.sessions = OrderedDict()
+        self.total_bytes = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def create(self, startup_data: Dict, ml_insights: Dict) -> AdvisorSession:
+        session = AdvisorSession(uuid.uuid4().hex, startup_data, ml_insights)
+        self.sessions[session.session_id] = session
+        self.total_bytes += session.size
+        self.evict()
+        return session
+
+    def get(self, session_id: str) -> Optional[AdvisorSession]:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        if time.monotonic() - session.last_used > self.ttl_s:
+            self.remove(session_id)
+            self.expired += 1
+            return None
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def record_turn(self, session: AdvisorSession, question: str, answer: str):
+        """Append a compacted Q/A turn; the ring drops the oldest"""
+        turn = {'question': question[:ADVISOR_TURN_CHARS], 'answer': answer[:ADVISOR_TURN_CHARS]}
+        turn_bytes = len(turn['question']) + len(turn['answer'])
+        if len(session.history) == session.history.maxlen:
+            oldest = session.history[0]
+            session.history_bytes -= len(oldest['question']) + len(oldest['answer'])
+            self.total_bytes -= len(oldest['question']) + len(oldest['answer'])
+        session.history.append(turn)
+        session.history_bytes += turn_bytes
+        self.total_bytes += turn_bytes
+        self.evict()
+
+    def remove(self, session_id: str) -> bool:
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self.total_bytes -= session.size
+        return True
+
+    def evict(self):
+        """Drop expired sessions, then least recently used until within caps"""
+        now = time.monotonic()
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if now - session.last_used > self.ttl_s:
+                self.remove(session_id)
+                self.expired += 1
+            elif len(self.sessions) > self.max_sessions or self.total_bytes > self.max_bytes:
+                self.remove(session_id)
+                self.evicted += 1
+            else:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'sessions': len(self.sessions),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'evicted': self.evicted,
+            'expired': self.expired
+        }
+
+advisor_sessions = AdvisorSessionStore(ADVISOR_MAX_SESSIONS, ADVISOR_SESSION_TTL_S, ADVISOR_MAX_BYTES)
+
+@app.post("/advisor/session", response_model=AdvisorSessionOutput)
+async def create_advisor_session(input: AdvisorSessionInput):
+    """Score the startup once; follow-up questions reuse the insights"""
+    try:
+        ml_insights = analyze_startup_with_ml(input.startup_data, input.include_paths)
+        session = advisor_sessions.create(input.startup_data, ml_insights)
+        return AdvisorSessionOutput(
+            session_id=session.session_id,
+            expires_in=ADVISOR_SESSION_TTL_S,
+            insights=advisor_insights(ml_insights)
         )
-        
-        # Generate insights from ML model
-        insights = []
-        if ml_insights:
-            success_prob = ml_insights.get('success_probability', 50)
-            insights.append(f"Success probability: {success_prob:.1f}%")
-            insights.append(f"Company stage: {ml_insights.get('stage', 'early').title()}")
-            insights.append(f"Funding status: {ml_insights.get('funding_status', 'unknown').title()}")
-            insights.append(f"Team size: {ml_insights.get('team_status', 'unknown').title()}")
-        
-        # Generate action recommendations
-        recommendations = []
-        if ml_insights.get('success_probability', 50) < 50:
-            recommendations.append("CRITICAL: Focus on improving product-market fit immediately")
-        if ml_insights.get('funding_status') == 'bootstrap' and ml_insights.get('success_probability', 50) > 60:
-            recommendations.append("Consider raising seed round - you have strong leverage")
-        if ml_insights.get('team_status') == 'small':
-            recommendations.append("Make 1-2 strategic hires to accelerate growth")
-        if ml_insights.get('company_age', 0) < 1:
-            recommendations.append("Focus on validation: talk to 50+ customers this month")
-        
-        # Calculate confidence based on ML model accuracy
-        confidence = 0.85 if xgb_model else 0.5  # 85% confidence if using trained model
-        
-        return AdvisorOutput(
-            answer=answer,
-            confidence=confidence,
-            insights=insights,
-            recommendations=recommendations,
-            relevant_metrics=ml_insights.get('key_metrics', {}),
-            source="XGBoost ML-Powered Advisor"
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/advisor/session/{session_id}")
+async def get_advisor_session(session_id: str):
+    """Session history and ML insights"""
+    session = advisor_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Advisor session not found or expired")
+    return {
+        'session_id': session.session_id,
+        'insights': advisor_insights(session.ml_insights),
+        'history': list(session.history)
+    }
+
+@app.delete("/advisor/session/{session_id}")
+async def delete_advisor_session(session_id: str):
+    """End a session early"""
+    return {'deleted': advisor_sessions.remove(session_id)}
+
+# ==================== PORTFOLIO REPORTS ====================
+
+PORTFOLIO_WORKERS = int(os.environ.get('PORTFOLIO_WORKERS', 0)) or cpu_profile.available_cpus()
+# Rendering one answer takes ~50us, so companies go to the workers in chunks, and small
+# portfolios are rendered in-process where shipping them to a worker would cost more
+PORTFOLIO_CHUNK_ANSWERS = 500
+PORTFOLIO_INLINE_ANSWERS = 500
+
+portfolio_pool = None
+
+def get_portfolio_pool():
+    """Worker processes, started on first use. Workers are forked so they inherit the loaded
+    models; a spawned worker would re-import this module and load everything again, so where
+    fork is unavailable the chunks run on threads instead"""
+    global portfolio_pool
+    if portfolio_pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if 'fork' in multiprocessing.get_all_start_methods():
+            portfolio_pool = ProcessPoolExecutor(max_workers=PORTFOLIO_WORKERS,
+                                                 mp_context=multiprocessing.get_context('fork'))
+        else:
+            print("⚠️ fork unavailable - portfolio reports render on threads")
+            portfolio_pool = ThreadPoolExecutor(max_workers=PORTFOLIO_WORKERS)
+    return portfolio_pool
+
+@app.on_event("shutdown")
+async def stop_portfolio_pool():
+    if portfolio_pool is not None:
+        portfolio_pool.shutdown(wait=False, cancel_futures=True)
+
+def render_company_reports(companies: List[tuple], questions: List[str]) -> List[Dict[str, Any]]:
+    """Markdown answers to every question for a chunk of (index, startup_data, ml_insights)"""
+    reports = []
+    for index, startup_data, ml_insights in companies:
+        answers = []
+        for question in questions:
+            output = build_advisor_output(question, ml_insights, startup_data)
+            answers.append({'question': question, **output.model_dump()})
+        reports.append({
+            'type': 'company',
+            'index': index,
+            'name': startup_data.get('name'),
+            'success_probability': round(ml_insights['success_probability'], 2) if ml_insights else None,
+            'answers': answers
+        })
+    return reports
+
+@app.post("/advisor/portfolio")
+async def portfolio_report(input: PortfolioReportInput):
+    """Advisor report for every company in a portfolio, streamed as NDJSON as companies finish"""
+    start = time.perf_counter()
+    try:
+        insights = analyze_startups_with_ml(input.startups)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    scored_ms = (time.perf_counter() - start) * 1000
+    companies = list(zip(range(len(input.startups)), input.startups, insights))
+    questions = input.questions
+
+    async def stream():
+        n_answers = len(companies) * len(questions)
+        workers = 0
+        if n_answers <= PORTFOLIO_INLINE_ANSWERS:
+            pending = [asyncio.to_thread(render_company_reports, companies, questions)]
+        else:
+            chunk = max(1, PORTFOLIO_CHUNK_ANSWERS // len(questions))
+            pool = get_portfolio_pool()
+            workers = PORTFOLIO_WORKERS
+            loop = asyncio.get_running_loop()
+            pending = [loop.run_in_executor(pool, render_company_reports, companies[i:i + chunk], questions)
+                       for i in range(0, len(companies), chunk)]
+        for finished in asyncio.as_completed(pending):
+            try:
+                reports = await finished
+            except Exception as e:
+                yield json.dumps({'type': 'error', 'detail': str(e)}) + '\n'
+                continue
+            for report in reports:
+                yield json.dumps(report) + '\n'
+        yield json.dumps({
+            'type': 'done',
+            'companies': len(companies),
+            'questions': len(questions),
+            'workers': workers,
+            'scoring_ms': round(scored_ms, 3),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 3)
+        }) + '\n'
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+# ==================== INVESTOR MATCHING ====================
+
+INVESTORS_PATH = os.environ.get('INVESTORS_PATH', './data/investors.json')
+# Stage terms looked up by substring of the investor's stage text, as the Node fallback does
+# ('seed' also matches 'Pre-seed-Seed', 'series a' does not match 'Seed-Series C')
+STAGE_TERMS = ['pre-seed', 'seed', 'series a', 'series b', 'series c', 'accelerator']
+TICKET_BANDS = [0, 250_000, 1_000_000, 5_000_000, 20_000_000, float('inf')]
+# Startup locations that earn the location bonus
+LOCATION_TERMS = ['us', 'san francisco', 'new york']
+AMOUNT_PATTERN = re.compile(r'\$?\s*([\d.]+)\s*([kmb])?', re.IGNORECASE)
+AMOUNT_UNITS = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+def stage_terms(stage: str) -> List[str]:
+    """'Seed-Series B' -> ['seed', 'series b']"""
+    stage = stage.lower()
+    return [term for term in STAGE_TERMS if term in stage]
+
+def parse_ticket_range(ticket: str):
+    """'$1M - $20M' -> (1e6, 2e7)"""
+    amounts = [float(v) * AMOUNT_UNITS.get((u or '').lower(), 1) for v, u in AMOUNT_PATTERN.findall(ticket or '')]
+    if not amounts:
+        return 0.0, float('inf')
+    return min(amounts), max(amounts)
+
+def ticket_band(amount: float) -> int:
+    return int(np.searchsorted(TICKET_BANDS, amount, side='right') - 1)
+
+def build_posting_lists(keys_per_row) -> Dict[Any, np.ndarray]:
+    """Inverted index: key -> sorted array of row ids"""
+    postings = {}
+    for row, keys in enumerate(keys_per_row):
+        for key in keys:
+            postings.setdefault(key, []).append(row)
+    return {key: np.asarray(rows, dtype=np.int64) for key, rows in postings.items()}
+
+class InvestorIndex:
+    """Investor table with inverted indexes and columnar match features"""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        self.size = len(self.table)
+
+        focus = [[f.strip().lower() for f in (v if isinstance(v, (list, tuple, np.ndarray)) else str(v).split('|'))]
+                 for v in self.table['focus']]
+        stages = [stage_terms(str(v)) for v in self.table['stage']]
+        tickets = [parse_ticket_range(str(v)) for v in self.table['ticketSize']]
+
+        self.ticket_min = np.array([t[0] for t in tickets], dtype=np.float64)
+        self.ticket_max = np.array([t[1] for t in tickets], dtype=np.float64)
+        self.is_accelerator = self.table['type'].str.lower().str.contains('accelerator').to_numpy()
+        self.all_sectors = np.array(['all sectors' in f for f in focus])
+        # Selective investors care more about the model's success signal
+        self.selectivity = np.where(self.is_accelerator, 0.3, 0.7).astype(np.float32)
+
+        self.by_category = build_posting_lists(focus)
+        self.by_stage = build_posting_lists(stages)
+        self.by_ticket_band = build_posting_lists(
+            range(ticket_band(lo), ticket_band(min(hi, TICKET_BANDS[-2])) + 1) for lo, hi in tickets
+        )
+
+    def lookup(self, postings: Dict[Any, np.ndarray], keys) -> np.ndarray:
+        """Boolean mask of rows present in any of the keys' posting lists"""
+        mask = np.zeros(self.size, dtype=bool)
+        for key in keys:
+            if key in postings:
+                mask[postings[key]] = True
+        return mask
+
+    def category_keys(self, category: str) -> List[str]:
+        """Focus terms that contain the category or are contained in it"""
+        category = category.lower()
+        return [term for term in self.by_category if term in category or category in term]
+
+    def match(self, startup: StartupInput, top_k: int, raise_amount: Optional[float],
+              require_category_match: bool, success_probability: Optional[float]):
+        """Score every candidate in one vectorized pass and return the top-k (ties in table order)"""
+        category_hit = self.lookup(self.by_category, self.category_keys(startup.category))
+
+        funding = startup.funding_total
+        if funding == 0:
+            target_stages = ['pre-seed', 'accelerator', 'seed']
+        elif funding < 1_000_000:
+            target_stages = ['seed']
+        elif funding < 5_000_000:
+            target_stages = ['series a']
+        else:
+            target_stages = ['series b', 'series c']
+        stage_hit = self.lookup(self.by_stage, target_stages)
+
+        if require_category_match:
+            ids = np.flatnonzero(category_hit | self.all_sectors)
+            rows = ids
+        else:
+            ids = np.arange(self.size)
+            rows = slice(None)
+
+        score = np.full(len(ids), 50.0, dtype=np.float32)
+        score += np.where(category_hit[rows], 20, np.where(self.all_sectors[rows], 15, 0))
+        score += np.where(stage_hit[rows], 20, 5)
+
+        if 5 <= startup.team_size <= 50:
+            score += 10
+        else:
+            score += np.where((startup.team_size < 5) & self.is_accelerator[rows], 10, 5)
+
+        location = startup.location.lower()
+        if any(term in location for term in LOCATION_TERMS):
+            score += 10
+
+        age = datetime.now().year - startup.founded_year
+        score += 10 if 1 <= age <= 3 else 5 if 0 <= age <= 5 else 0
+
+        if raise_amount is not None:
+            score += np.where(self.lookup(self.by_ticket_band, [ticket_band(raise_amount)])[rows], 10, 0)
+        if success_probability is not None:
+            score += 20 * self.selectivity[rows] * (success_probability / 100 - 0.5)
+
+        score = np.clip(score, 0, 100)
+
+        k = min(top_k, len(ids))
+        if k == 0:
+            return ids, score, 0
+        # Everything above the k-th score, then ties in table order: same as a stable full sort
+        kth = -np.partition(-score, k - 1)[k - 1]
+        above = np.flatnonzero(score > kth)
+        top = np.concatenate([above, np.flatnonzero(score == kth)[:k - len(above)]])
+        top = top[np.lexsort((top, -score[top]))]
+        return ids[top], score[top], len(ids)
+
+def load_investor_index() -> Optional[InvestorIndex]:
+    """Load the investor table (json/csv/parquet) and build its indexes"""
+    if not os.path.exists(INVESTORS_PATH):
+        print(f"⚠️ Investor table not found: {INVESTORS_PATH}")
+        return None
+    try:
+        if INVESTORS_PATH.endswith('.parquet'):
+            table = pd.read_parquet(INVESTORS_PATH)
+        elif INVESTORS_PATH.endswith('.csv'):
+            table = pd.read_csv(INVESTORS_PATH)
+        else:
+            table = pd.read_json(INVESTORS_PATH)
+        index = InvestorIndex(table)
+        print(f"✓ Investors indexed: {index.size:,}")
+        return index
+    except Exception as e:
+        print(f"❌ Investor table error: {e}")
+        return None
+
+investor_index = load_investor_index()
+
+@app.post("/investors/match", response_model=InvestorMatchOutput)
+async def match_investors(input: InvestorMatchInput):
+    """Top-k investors for a startup profile"""
+    if investor_index is None:
+        raise HTTPException(status_code=503, detail="Investor table not loaded")
+
+    try:
+        success_probability = None
+        if input.use_success_probability and xgb_model and feature_columns:
+            success_probability = float(xgb_model.predict(feature_dmatrix(startup_columns([input.startup])))[0]) * 100
+
+        ids, scores, candidates_scored = investor_index.match(
+            input.startup, input.top_k, input.raise_amount,
+            input.require_category_match, success_probability
+        )
+
+        investors = investor_index.table.iloc[ids].to_dict('records')
+        for investor, score in zip(investors, scores):
+            investor['matchScore'] = int(round(float(score)))
+
+        return InvestorMatchOutput(
+            investors=investors,
+            candidates_scored=int(candidates_scored),
+            total_investors=investor_index.size,
+            success_probability=round(success_probability, 2) if success_probability is not None else None
         )
-        
     except Exception as e:
-        print(f"Advisor error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== PITCH ANALYZER ====================
+
+# One alternation scanned once per pitch; each hit reports its group name
+PITCH_PATTERN = re.compile(
+    r'(?P<problem>problem|challenge|issue|pain)'
+    r'|(?P<solution>solution|solve|fix|help|platform)'
+    r'|(?P<market>market|customers|users|target)'
+    r'|(?P<metrics>\$|%|million|thousand|billion)'
+    r'|(?P<number>\d)'
+    r'|(?P<space>\s+)',
+    re.IGNORECASE
+)
+
+def scan_pitch(text: str) -> Dict[str, Any]:
+    """Single pass over the pitch: signal flags and word count"""
+    found = set()
+    whitespace_runs = 0
+    for match in PITCH_PATTERN.finditer(text):
+        group = match.lastgroup
+        if group == 'space':
+            whitespace_runs += 1
+        else:
+            found.add(group)
+    # A trailing/leading whitespace run still counts, like JS split(/\s+/)
+    return {'word_count': whitespace_runs + 1, 'signals': found}
+
+def analyze_pitch(pitch: PitchInput) -> Dict[str, Any]:
+    """Score one pitch for clarity, completeness and persuasiveness"""
+    text = pitch.pitch_text
+    if len(text.strip()) < 50:
+        return {'error': 'Pitch must be at least 50 characters'}
+
+    scan = scan_pitch(text)
+    word_count = scan['word_count']
+    signals = scan['signals']
+    has_problem = 'problem' in signals
+    has_solution = 'solution' in signals
+    has_market = 'market' in signals
+    has_metrics = 'metrics' in signals
+    has_numbers = 'number' in signals
+
+    mentions_own_startup = bool(pitch.startup_name) and pitch.startup_name.casefold() in text.casefold()
+
+    clarity = 50
+    if 50 <= word_count <= 150: clarity += 30
+    if has_problem and has_solution: clarity += 20
+
+    completeness = 40 + 15 * (has_problem + has_solution + has_market + has_metrics)
+
+    persuasiveness = 50
+    if has_numbers: persuasiveness += 20
+    if has_metrics: persuasiveness += 20
+    if word_count > 100: persuasiveness += 10
+
+    overall_score = round((clarity + completeness + persuasiveness) / 3)
+
+    strengths = []
+    improvements = []
+
+    if has_problem: strengths.append("Clear problem statement")
+    if has_solution: strengths.append("Solution is well explained")
+    if has_metrics: strengths.append("Includes specific numbers/metrics")
+    if has_market: strengths.append("Mentions target market")
+    if mentions_own_startup:
+        strengths.append(f"Good use of your startup name: {pitch.startup_name}")
+
+    if not has_problem: improvements.append("Add a clear problem statement")
+    if not has_solution: improvements.append("Explain your solution more clearly")
+    if not has_metrics: improvements.append("Include specific metrics or traction")
+    if not has_market: improvements.append("Mention your target market size")
+    if word_count < 75: improvements.append("Expand your pitch with more details")
+    if word_count > 200: improvements.append("Make it more concise (aim for 100-150 words)")
+
+    if pitch.funding_total and pitch.funding_total > 0:
+        improvements.append(f"Mention your ${pitch.funding_total:,.0f} funding in the pitch")
+    if pitch.team_size and pitch.team_size > 10:
+        improvements.append(f"Highlight your {pitch.team_size}-person team as a strength")
+    if pitch.category:
+        improvements.append(f"Emphasize your {pitch.category} sector expertise")
+
+    sentiment = "Positive" if overall_score >= 70 else "Neutral" if overall_score >= 50 else "Needs Work"
+
+    return {
+        'overall_score': overall_score,
+        'clarity': clarity,
+        'completeness': completeness,
+        'persuasiveness': persuasiveness,
+        'strengths': strengths or ["Keep working on it!"],
+        'improvements': improvements[:6] or ["Looks good overall!"],
+        'sentiment': sentiment,
+        'word_count': word_count,
+        'startup_context': {
+            'name': pitch.startup_name,
+            'category': pitch.category,
+            'mentioned': mentions_own_startup
+        } if pitch.startup_name else None
+    }
+
+@app.post("/pitch/analyze", response_model=PitchBatchOutput)
+async def analyze_pitches(input: PitchBatchInput):
+    """Analyze one or many pitches (e.g. an accelerator cohort) in one call"""
+    try:
+        results = [analyze_pitch(pitch) for pitch in input.pitches]
+        return PitchBatchOutput(results=results, count=len(results))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== SIMILAR STARTUPS ====================
+
+NEIGHBOR_INDEX_DIR = os.path.join(MODEL_DIR, 'neighbors')
+ADVISOR_NEIGHBORS = 10
+
+def load_similar_index() -> Optional[NeighborIndex]:
+    """Memory-mapped neighbour index written by auto_train"""
+    if not os.path.exists(os.path.join(NEIGHBOR_INDEX_DIR, 'meta.json')):
+        print(f"⚠️ Neighbour index not found: {NEIGHBOR_INDEX_DIR}")
+        return None
+    index = NeighborIndex(NEIGHBOR_INDEX_DIR)
+    if index.features != feature_columns:
+        print("⚠️ Neighbour index was built for a different feature set - retrain to rebuild it")
+        return None
+    print(f"✓ Neighbour index: {len(index):,} startups")
+    return index
+
+similar_index = load_similar_index()
+
+def similar_startups(matrix: np.ndarray, k: int) -> List[List[Dict[str, Any]]]:
+    """k nearest training startups for each row of a feature_columns-ordered matrix"""
+    distances, positions = similar_index.search(matrix, k)
+    return [similar_index.describe(p, d) for p, d in zip(positions, distances)]
+
+def neighbor_success_rate(neighbors: List[Dict[str, Any]]) -> float:
+    return sum(n['success'] for n in neighbors) / len(neighbors) if neighbors else 0.0
+
+@app.post("/startups/similar", response_model=SimilarStartupsOutput)
+async def find_similar_startups(input: SimilarStartupsInput):
+    """k most similar historical startups and how they turned out"""
+    if similar_index is None:
+        raise HTTPException(status_code=503, detail="Neighbour index not loaded")
+    try:
+        start = time.perf_counter()
+        cols = startup_columns([input.startup])
+        neighbors = similar_startups(primary_model.matrix(build_feature_matrix(cols), cols), input.k)[0]
+        return SimilarStartupsOutput(
+            k=len(neighbors),
+            population=len(similar_index),
+            success_rate=round(neighbor_success_rate(neighbors), 4),
+            neighbors=neighbors,
+            search_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== DRIFT MONITORING ====================
+
+# Population stability index bands
+DRIFT_PSI_MODERATE = 0.1
+DRIFT_PSI_SIGNIFICANT = 0.25
+DRIFT_UPDATE_CHUNK = 8192
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index of two histograms (add-half smoothing for empty bins)"""
+    p = (expected + 0.5) / (expected.sum() + 0.5 * len(expected))
+    q = (actual + 0.5) / (actual.sum() + 0.5 * len(actual))
+    return float(np.sum((q - p) * np.log(q / p)))
+
+def ks_distance(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Kolmogorov-Smirnov distance between two binned distributions"""
+    if not expected.sum() or not actual.sum():
+        return 0.0
+    return float(np.max(np.abs(np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum())))
+
+class DriftSketch:
+    """Fixed-bin histograms of live inputs and outputs, on the training reference's bin cuts"""
+
+    def __init__(self, reference: Dict[str, Any], features: List[str]):
+        names = reference['features']
+        self.features = [name for name in features if name in names]
+        self.columns = np.array([features.index(name) for name in self.features])
+        cuts = [reference['cuts'][names.index(name)] for name in self.features]
+
+        # One padded cut matrix so a batch is binned in a single comparison
+        self.n_bins = np.array([len(c) + 1 for c in cuts])
+        width = max(len(c) for c in cuts) if cuts else 0
+        self.cuts = np.full((len(cuts), max(width, 1)), np.inf, dtype=np.float32)
+        for j, c in enumerate(cuts):
+            self.cuts[j, :len(c)] = c
+        self.reference = [np.asarray(reference['counts'][names.index(name)], dtype=np.int64) for name in self.features]
+        self.counts = np.zeros((len(cuts), self.cuts.shape[1] + 1), dtype=np.int64)
+        self.offsets = np.arange(len(cuts))[None, :] * self.counts.shape[1]
+
+        self.prediction_cuts = np.asarray(reference['prediction']['cuts'], dtype=np.float32)
+        self.prediction_reference = np.asarray(reference['prediction']['counts'], dtype=np.int64)
+        self.prediction_counts = np.zeros_like(self.prediction_reference)
+        self.observed = 0
+
+    def update(self, matrix: np.ndarray, probabilities: np.ndarray):
+        """Fold in a batch of any size. Runs on the event loop, so no lock is needed"""
+        for start in range(0, len(matrix), DRIFT_UPDATE_CHUNK):
+            x = matrix[start:start + DRIFT_UPDATE_CHUNK, self.columns]
+            bins = (x[:, :, None] >= self.cuts[None]).sum(axis=2) + self.offsets
+            self.counts += np.bincount(bins.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.prediction_counts += np.bincount(
+            np.searchsorted(self.prediction_cuts, probabilities, side='right'),
+            minlength=len(self.prediction_counts)
+        )
+        self.observed += len(matrix)
+
+    def reset(self):
+        self.counts[:] = 0
+        self.prediction_counts[:] = 0
+        self.observed = 0
+
+    def report(self) -> Dict[str, Any]:
+        def distance(expected, actual):
+            value = psi(expected, actual)
+            status = ('significant' if value >= DRIFT_PSI_SIGNIFICANT
+                      else 'moderate' if value >= DRIFT_PSI_MODERATE else 'stable')
+            return {'psi': round(value, 4), 'ks': round(ks_distance(expected, actual), 4), 'status': status}
+
+        features = [
+            {'feature': name, **distance(self.reference[j], self.counts[j, :self.n_bins[j]])}
+            for j, name in enumerate(self.features)
+        ]
+        features.sort(key=lambda f: f['psi'], reverse=True)
+        return {
+            'observed': self.observed,
+            'prediction': distance(self.prediction_reference, self.prediction_counts),
+            'features': features,
+            'drifted': [f['feature'] for f in features if f['status'] != 'stable']
+        }
+
+drift_sketch = (DriftSketch(model_metadata['drift_reference'], feature_columns)
+                if model_metadata and model_metadata.get('drift_reference') and feature_columns else None)
+
+def record_drift(matrix: np.ndarray, probabilities: np.ndarray):
+    if drift_sketch is not None:
+        drift_sketch.update(matrix, probabilities)
+
+@app.get("/drift")
+async def get_drift():
+    """PSI/KS of live /predict/success inputs and outputs against the training data"""
+    if drift_sketch is None:
+        raise HTTPException(status_code=503, detail="Model has no drift reference; retrain with auto_train.py")
+    if drift_sketch.observed == 0:
+        return {'observed': 0, 'features': [], 'drifted': []}
+    return drift_sketch.report()
+
+@app.delete("/drift")
+async def reset_drift():
+    """Start a new observation window"""
+    if drift_sketch is None:
+        raise HTTPException(status_code=503, detail="Model has no drift reference; retrain with auto_train.py")
+    drift_sketch.reset()
+    return {'status': 'reset'}
+
+# ==================== PREDICTION LOG ====================
+
+PREDICTION_LOG_ENABLED = os.environ.get('PREDICTION_LOG_ENABLED', '1') == '1'
+PREDICTION_LOG_DIR = os.environ.get('PREDICTION_LOG_DIR', './data/prediction_logs')
+PREDICTION_LOG_FORMAT = os.environ.get('PREDICTION_LOG_FORMAT', 'jsonl')   # jsonl | parquet
+PREDICTION_LOG_CAPACITY = int(os.environ.get('PREDICTION_LOG_CAPACITY', 100_000))
+PREDICTION_LOG_FLUSH_ROWS = int(os.environ.get('PREDICTION_LOG_FLUSH_ROWS', 5_000))
+PREDICTION_LOG_FLUSH_S = float(os.environ.get('PREDICTION_LOG_FLUSH_S', 5))
+PREDICTION_LOG_MAX_FILE_MB = float(os.environ.get('PREDICTION_LOG_MAX_FILE_MB', 256))
+
+MODEL_VERSION = primary_model.version if primary_model else 'none'
+
+class PredictionLogSink:
+    """Fixed-capacity ring of scored feature vectors, flushed in batches by a background task"""
+
+    def __init__(self, features: List[str], capacity: int):
+        self.features = features
+        self.capacity = capacity
+        self.matrix = np.zeros((capacity, len(features)), dtype=np.float32)
+        self.probability = np.zeros(capacity, dtype=np.float32)
+        self.timestamp = np.zeros(capacity, dtype=np.float64)
+        self.head = 0      # oldest buffered row
+        self.size = 0
+        self.flush_needed = asyncio.Event()
+        self.stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'flushes': 0, 'write_errors': 0}
+
+    def enqueue(self, matrix: np.ndarray, probabilities: np.ndarray):
+        """Copy a batch into the ring; rows that do not fit are dropped and counted"""
+        n = min(len(matrix), self.capacity - self.size)
+        self.stats['dropped'] += len(matrix) - n
+        if n == 0:
+            return
+        slots = (self.head + self.size + np.arange(n)) % self.capacity
+        self.matrix[slots] = matrix[:n]
+        self.probability[slots] = probabilities[:n]
+        self.timestamp[slots] = time.time()
+        self.size += n
+        self.stats['enqueued'] += n
+        if self.size >= PREDICTION_LOG_FLUSH_ROWS:
+            self.flush_needed.set()
+
+    def drain(self) -> Optional[pd.DataFrame]:
+        """Take everything buffered as a DataFrame (copies, so the ring is free again)"""
+        if self.size == 0:
+            return None
+        slots = (self.head + np.arange(self.size)) % self.capacity
+        frame = pd.DataFrame(self.matrix[slots], columns=self.features)
+        frame.insert(0, 'probability', self.probability[slots])
+        frame.insert(0, 'model_version', MODEL_VERSION)
+        frame.insert(0, 'ts', pd.to_datetime(self.timestamp[slots], unit='s'))
+        self.head = (self.head + self.size) % self.capacity
+        self.size = 0
+        return frame
+
+    def target_path(self) -> str:
+        """Hourly files for JSONL, rolled over by size; one file per flush for Parquet"""
+        stamp = datetime.now().strftime('%Y%m%d-%H')
+        if PREDICTION_LOG_FORMAT == 'parquet':
+            return os.path.join(PREDICTION_LOG_DIR, f"predictions-{stamp}-{self.stats['flushes']:06d}.parquet")
+        part = 0
+        while True:
+            path = os.path.join(PREDICTION_LOG_DIR, f"predictions-{stamp}.{part}.jsonl")
+            if not os.path.exists(path) or os.path.getsize(path) < PREDICTION_LOG_MAX_FILE_MB * 1024 * 1024:
+                return path
+            part += 1
+
+    def write(self, frame: pd.DataFrame):
+        os.makedirs(PREDICTION_LOG_DIR, exist_ok=True)
+        path = self.target_path()
+        if PREDICTION_LOG_FORMAT == 'parquet':
+            frame.to_parquet(path, index=False)
+        else:
+            with open(path, 'a') as f:
+                f.write(frame.to_json(orient='records', lines=True, date_format='iso'))
+                f.write('\n')
+
+    async def flush(self):
+        frame = self.drain()
+        if frame is None:
+            return
+        try:
+            # File I/O happens off the event loop
+            await asyncio.to_thread(self.write, frame)
+            self.stats['written'] += len(frame)
+            self.stats['flushes'] += 1
+        except Exception as e:
+            self.stats['write_errors'] += 1
+            self.stats['dropped'] += len(frame)
+            print(f"⚠️ Prediction log write failed: {e}")
+
+    async def run(self):
+        """Flush when the ring reaches the batch size or the interval elapses"""
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_needed.wait(), timeout=PREDICTION_LOG_FLUSH_S)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_needed.clear()
+            await self.flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, 'buffered': self.size, 'capacity': self.capacity,
+                'format': PREDICTION_LOG_FORMAT, 'model_version': MODEL_VERSION}
+
+prediction_log = (PredictionLogSink(feature_columns, PREDICTION_LOG_CAPACITY)
+                  if PREDICTION_LOG_ENABLED and feature_columns else None)
+prediction_log_task = None
+
+@app.on_event("startup")
+async def start_prediction_log():
+    global prediction_log_task
+    if prediction_log is not None:
+        prediction_log_task = asyncio.create_task(prediction_log.run())
+
+@app.on_event("shutdown")
+async def stop_prediction_log():
+    if prediction_log_task is not None:
+        prediction_log_task.cancel()
+        await prediction_log.flush()
+
+def record_predictions(matrix: np.ndarray, probabilities: np.ndarray):
+    """Per-prediction bookkeeping on the request path: drift sketch + log ring, no I/O"""
+    record_drift(matrix, probabilities)
+    if prediction_log is not None:
+        prediction_log.enqueue(matrix, probabilities)
+
 # ==================== HEALTH CHECK ====================
 
 @app.get("/health")
@@ -1016,9 +2654,17 @@ async def health():
         "device": DEVICE,
         "model_accuracy": model_metadata.get('accuracy', 0) if model_metadata else 0,
         "features": len(feature_columns) if feature_columns else 0,
+        "admission": admission_stats(),
+        "advisor_sessions": advisor_sessions.stats(),
+        "prediction_log": prediction_log.snapshot() if prediction_log else None,
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/admission/stats")
+async def get_admission_stats():
+    """Queue depth, in-flight and shed counters per endpoint"""
+    return admission_stats()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -1027,8 +2673,19 @@ async def root():
         "version": "2.0",
         "endpoints": {
             "prediction": "/predict/success",
+            "compare": "/predict/compare",
+            "models": "/models",
+            "sweep": "/predict/sweep",
+            "counterfactual": "/predict/counterfactual",
             "advisor": "/advisor/ask",
+            "advisor_session": "/advisor/session",
+            "portfolio": "/advisor/portfolio",
+            "investors": "/investors/match",
+            "pitch": "/pitch/analyze",
+            "similar": "/startups/similar",
+            "drift": "/drift",
             "health": "/health",
+            "admission": "/admission/stats",
             "docs": "/docs"
         }
     }
@@ -0,0 +1,195 @@
+"""
+Seeded, chunked synthetic startup data for training, scoring and ingestion benchmarks.
+
+Every chunk draws from its own np.random.Generator stream derived from (seed, chunk index),
+so for a given seed and chunk size a dataset is identical however many processes produce
+it. Changing the chunk size changes the streams, and so the data.
+
+    python synthetic_data.py --rows 100000000 --out ./data/synthetic
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# auto_train schema: the 26-feature training set (before category/location encoding)
+AUTO_TRAIN_CATEGORIES = ['Technology', 'Healthcare', 'Fintech', 'E-commerce',
+                         'SaaS', 'AI/ML', 'Consumer', 'Enterprise']
+AUTO_TRAIN_LOCATIONS = ['USA', 'UK', 'India', 'China', 'Germany', 'Canada']
+
+# train_model_gpu schema: the 15-feature set
+GPU_CATEGORIES = ['Technology', 'Healthcare', 'Fintech', 'E-commerce',
+                  'Education', 'SaaS', 'AI/ML', 'Blockchain', 'Other']
+GPU_LOCATIONS = ['San Francisco', 'New York', 'Boston', 'Austin',
+                 'London', 'Berlin', 'Singapore', 'Bangalore']
+GPU_HIGH_SCORE_CATEGORIES = ['Technology', 'AI/ML', 'Fintech', 'SaaS']
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+def chunk_rng(seed, chunk_index):
+    """Independent stream per chunk; same as SeedSequence(seed).spawn(n)[chunk_index]"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+
+def choice_categorical(rng, labels, n):
+    codes = rng.integers(0, len(labels), n, dtype=np.int8)
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+def bucket_integers(rng, bucket, lows, highs, dtype):
+    """rng.integers(low, high) per row, with low/high picked by bucket, from one draw"""
+    lows = np.asarray(lows)[bucket]
+    highs = np.asarray(highs)[bucket]
+    return (lows + rng.random(len(bucket)) * (highs - lows)).astype(dtype)
+
+def auto_train_chunk(rng, n):
+    """Rows for auto_train (same distributions and success rule as before, compact dtypes)"""
+    df = pd.DataFrame({
+        'category': choice_categorical(rng, AUTO_TRAIN_CATEGORIES, n),
+        'location': choice_categorical(rng, AUTO_TRAIN_LOCATIONS, n),
+        'founded_year': rng.integers(2010, 2024, n, dtype=np.int16)
+    })
+    df['company_age'] = (2025 - df['founded_year']).astype(np.int16)
+
+    # Funding (realistic distribution)
+    funding = rng.lognormal(13, 2, n).astype(np.float32)
+    df['funding_total'] = funding
+    funding_bucket = np.searchsorted([1_000_000, 10_000_000], funding, side='right')
+    df['funding_rounds'] = bucket_integers(rng, funding_bucket, [0, 1, 2], [2, 4, 6], np.int8)
+
+    # Team
+    df['team_size'] = bucket_integers(rng, funding_bucket, [2, 8, 30], [10, 40, 150], np.int16)
+
+    # Financial
+    df['funding_per_round'] = (funding / (df['funding_rounds'] + 1)).astype(np.float32)
+    df['funding_velocity'] = (funding / (df['company_age'] + 1)).astype(np.float32)
+
+    has_revenue = rng.random(n) < 0.35
+    df['has_revenue'] = has_revenue.astype(np.int8)
+    df['monthly_revenue'] = np.where(has_revenue, funding * np.float32(0.02), np.float32(0))
+    df['burn_rate'] = funding / np.float32(18 * 12)
+    df['user_growth_rate'] = rng.uniform(-0.2, 2.0, n).astype(np.float32)
+    df['market_size'] = np.float32(10_000_000_000)
+
+    df['revenue_to_burn_ratio'] = df['monthly_revenue'] / (df['burn_rate'] + 1)
+    df['funding_efficiency'] = df['user_growth_rate'] * funding / np.float32(1e6)
+
+    # Strengths/challenges
+    df['num_strengths'] = rng.integers(0, 6, n, dtype=np.int8)
+    df['num_challenges'] = rng.integers(1, 6, n, dtype=np.int8)
+    df['strength_to_challenge_ratio'] = (df['num_strengths'] / (df['num_challenges'] + 1)).astype(np.float32)
+
+    # Other
+    df['description_length'] = np.int16(100)
+    df['problem_length'] = np.int16(50)
+    df['runway_months'] = np.int16(12)
+    df['is_well_funded'] = (funding > 1_000_000).astype(np.int8)
+    df['optimal_age'] = ((df['company_age'] >= 2) & (df['company_age'] <= 6)).astype(np.int8)
+    df['optimal_team'] = ((df['team_size'] >= 5) & (df['team_size'] <= 50)).astype(np.int8)
+    df['location_tier'] = np.where(df['location'] == 'USA', 1, 2).astype(np.int8)
+    df['founded_in_recession'] = np.int8(0)
+
+    # SUCCESS (realistic formula)
+    df['success_score'] = (
+        df['is_well_funded'] * 15 +
+        df['optimal_age'] * 15 +
+        df['optimal_team'] * 15 +
+        (df['num_strengths'] > 2) * 10 +
+        (df['num_challenges'] < 3) * 10 +
+        has_revenue * 20 +
+        (df['user_growth_rate'] > 0.5) * 15 +
+        rng.normal(0, 15, n)
+    ).astype(np.float32)
+    df['success'] = (df['success_score'] > 50).astype(np.int8)
+
+    return df
+
+def gpu_chunk(rng, n):
+    """Rows for train_model_gpu's 15-feature model"""
+    df = pd.DataFrame({
+        'funding_total': rng.lognormal(13, 2.5, n).astype(np.float32),
+        'founded_year': rng.integers(2010, 2024, n, dtype=np.int16),
+        'team_size': rng.integers(2, 150, n, dtype=np.int16),
+        'funding_rounds': rng.integers(0, 8, n, dtype=np.int8),
+        'monthly_revenue': rng.lognormal(10, 2, n).astype(np.float32),
+        'user_growth_rate': rng.uniform(-0.2, 2.5, n).astype(np.float32),
+        'burn_rate': rng.lognormal(11, 1.8, n).astype(np.float32),
+        'market_size': rng.lognormal(15, 2, n).astype(np.float32),
+        'category': choice_categorical(rng, GPU_CATEGORIES, n),
+        'location': choice_categorical(rng, GPU_LOCATIONS, n),
+    })
+
+    # Feature engineering
+    df['company_age'] = (2025 - df['founded_year']).astype(np.int16)
+    df['funding_per_round'] = (df['funding_total'] / (df['funding_rounds'] + 1)).astype(np.float32)
+    df['funding_velocity'] = (df['funding_total'] / (df['company_age'] + 1)).astype(np.float32)
+    df['revenue_to_burn_ratio'] = df['monthly_revenue'] / (df['burn_rate'] + 1)
+    df['funding_efficiency'] = df['user_growth_rate'] * df['funding_total'] / np.float32(1e6)
+
+    # Create target; the population median of lognormal(13, 2.5) is e^13, which keeps
+    # every chunk on the same threshold instead of a per-chunk sample median
+    df['success_score'] = (
+        (df['funding_total'] > np.exp(13)) * 20 +
+        (df['funding_rounds'] >= 2) * 15 +
+        ((df['team_size'] >= 5) & (df['team_size'] <= 80)) * 15 +
+        ((df['company_age'] >= 2) & (df['company_age'] <= 6)) * 15 +
+        (df['user_growth_rate'] > 0.5) * 15 +
+        (df['revenue_to_burn_ratio'] > 0.5) * 10 +
+        df['category'].isin(GPU_HIGH_SCORE_CATEGORIES) * 10 +
+        rng.normal(0, 10, n)
+    ).astype(np.float32)
+    df['success'] = (df['success_score'] >= 55).astype(np.int8)
+
+    return df
+
+SCHEMAS = {
+    'auto_train': auto_train_chunk,
+    'gpu': gpu_chunk
+}
+
+def chunk_sizes(n_rows, chunk_rows):
+    n_chunks = -(-n_rows // chunk_rows)
+    return [min(chunk_rows, n_rows - i * chunk_rows) for i in range(n_chunks)]
+
+def generate_chunk(schema, seed, chunk_index, n):
+    return SCHEMAS[schema](chunk_rng(seed, chunk_index), n)
+
+def generate(n_rows, schema='auto_train', seed=42, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """In-memory dataset, built chunk by chunk"""
+    chunks = [generate_chunk(schema, seed, i, n) for i, n in enumerate(chunk_sizes(n_rows, chunk_rows))]
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def _write_shard(schema, seed, chunk_index, n, out_dir):
+    path = os.path.join(out_dir, f'part_{chunk_index:05d}.parquet')
+    generate_chunk(schema, seed, chunk_index, n).to_parquet(path, index=False)
+    return path
+
+def write_shards(out_dir, n_rows, schema='auto_train', seed=42,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, workers=None):
+    """Generate and write one Parquet shard per chunk across a process pool"""
+    from concurrent.futures import ProcessPoolExecutor
+    import cpu_profile
+
+    os.makedirs(out_dir, exist_ok=True)
+    sizes = chunk_sizes(n_rows, chunk_rows)
+    workers = min(workers or cpu_profile.available_cpus(), len(sizes))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_write_shard, schema, seed, i, n, out_dir) for i, n in enumerate(sizes)]
+        return [f.result() for f in futures]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic dataset as Parquet shards")
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--out', required=True, help="output directory")
+    parser.add_argument('--schema', choices=sorted(SCHEMAS), default='auto_train')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, help="processes (default: usable cores)")
+    args = parser.parse_args()
+
+    start = time.time()
+    paths = write_shards(args.out, args.rows, args.schema, args.seed, args.chunk_rows, args.workers)
+    elapsed = time.time() - start
+    print(f"✓ {args.rows:,} rows in {len(paths)} shards -> {os.path.abspath(args.out)} "
+          f"| {elapsed:.1f}s ({args.rows / elapsed / 1e6:.1f}M rows/s)")
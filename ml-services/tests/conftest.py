@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+# The services resolve ./models and ./data relative to ml-services, as when started from there
+ML_SERVICES = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_SERVICES)
+os.chdir(ML_SERVICES)
+os.environ.setdefault('PREDICTION_LOG_ENABLED', '0')
+
+@pytest.fixture(scope='session')
+def synthetic_model():
+    """Small native-categorical model on auto_train's synthetic schema: (booster, X, y)"""
+    import auto_train
+    import synthetic_data
+
+    df = synthetic_data.generate(4000, seed=7)
+    for feature, source in auto_train.NATIVE_CATEGORICALS.items():
+        values = df[source].astype(str)
+        df[feature] = pd.Categorical(values, categories=sorted(values.unique()))
+    X, y = df[auto_train.FEATURE_COLUMNS], df['success']
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 3, 'nthread': 1},
+                        xgb.DMatrix(X, label=y, enable_categorical=True), num_boost_round=20)
+    return booster, X, y
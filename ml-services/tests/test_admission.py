@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import main_gpu
+
+def request_all(requests):
+    """Send (path, headers) pairs concurrently; optionally with the gate's slot already taken"""
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await asyncio.gather(*[client.get(path, headers=headers) for path, headers in requests])
+    return asyncio.run(run())
+
+def request_while_busy(gate, path, headers):
+    """One request while another holds the gate's only slot"""
+    async def run():
+        await gate.semaphore.acquire()
+        try:
+            transport = httpx.ASGITransport(app=main_gpu.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await client.get(path, headers=headers)
+        finally:
+            gate.semaphore.release()
+    return asyncio.run(run())
+
+@pytest.fixture
+def health_gate(monkeypatch):
+    gate = main_gpu.EndpointGate(concurrency=1, queue_size=2)
+    monkeypatch.setitem(main_gpu.admission_gates, '/health', gate)
+    monkeypatch.setattr(main_gpu, 'rate_limiter', main_gpu.ClientRateLimiter(rate=1, burst=2, max_clients=100))
+    return gate
+
+def test_rate_limiter_allows_burst_then_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main_gpu.time, 'monotonic', lambda: now[0])
+    limiter = main_gpu.ClientRateLimiter(rate=2, burst=3, max_clients=10)
+
+    assert [limiter.take('a') for _ in range(3)] == [0, 0, 0]
+    assert limiter.take('a') == pytest.approx(0.5)
+    assert limiter.take('b') == 0
+    now[0] += 0.5
+    assert limiter.take('a') == 0
+
+def test_rate_limiter_forgets_least_recent_clients():
+    limiter = main_gpu.ClientRateLimiter(rate=1, burst=1, max_clients=2)
+    for client in ['a', 'b', 'c']:
+        limiter.take(client)
+    assert list(limiter.buckets) == ['b', 'c']
+
+def test_rate_limited_client_gets_429(health_gate):
+    responses = request_all([('/health', {'x-client-id': 'same'})] * 3)
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert int(responses[2].headers['retry-after']) >= 1
+    assert health_gate.shed_rate_limited == 1
+
+def test_ungated_paths_are_not_limited(health_gate):
+    responses = request_all([('/admission/stats', {'x-client-id': 'same'})] * 5)
+    assert all(r.status_code == 200 for r in responses)
+
+def test_full_queue_is_shed(health_gate):
+    health_gate.waiting = health_gate.queue_size
+    response, = request_all([('/health', {})])
+    assert response.status_code == 503
+    assert response.json()['detail'] == 'Server overloaded, queue full'
+
+def test_unmeetable_deadline_is_shed_before_queueing(health_gate):
+    health_gate.avg_service_s = 5.0
+    response = request_while_busy(health_gate, '/health', {'x-request-timeout-ms': '1000'})
+    assert response.status_code == 503
+    assert response.json()['detail'] == 'Deadline cannot be met'
+    assert health_gate.shed_deadline == 1
+
+def test_deadline_expiring_in_queue_is_shed(health_gate):
+    health_gate.avg_service_s = 0.001
+    start = time.perf_counter()
+    response = request_while_busy(health_gate, '/health', {'x-request-timeout-ms': '200'})
+    assert response.status_code == 503
+    assert response.json()['detail'] == 'Deadline expired while queued'
+    assert time.perf_counter() - start < 2
+    assert health_gate.waiting == 0
+
+def test_admitted_request_releases_its_slot(health_gate):
+    response, = request_all([('/health', {})])
+    assert response.status_code == 200
+    assert health_gate.admitted == 1
+    assert health_gate.in_flight == 0
+    assert not health_gate.semaphore.locked()
+
+def test_slots_survive_deadlines_racing_releases(health_gate):
+    """The holder frees the slot just as the queued request's deadline fires"""
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            statuses = []
+            for i, delay in enumerate([0.045, 0.05, 0.055] * 4):
+                await health_gate.semaphore.acquire()
+                asyncio.get_running_loop().call_later(delay, health_gate.semaphore.release)
+                response = await client.get('/health', headers={'x-request-timeout-ms': '50', 'x-client-id': str(i)})
+                statuses.append(response.status_code)
+                await asyncio.sleep(0.06)
+            return statuses
+
+    health_gate.avg_service_s = 0.001
+    statuses = asyncio.run(run())
+    assert set(statuses) <= {200, 503}
+    assert health_gate.semaphore._value == health_gate.concurrency
+    assert health_gate.in_flight == 0 and health_gate.waiting == 0
+
+def test_response_wrapper_is_a_plain_asgi_app(health_gate):
+    response, = request_all([('/health', {'x-client-id': 'wrapper'})])
+    assert response.status_code == 200 and response.json()
+    assert not issubclass(main_gpu.ReleaseAfterSend, main_gpu.Response)
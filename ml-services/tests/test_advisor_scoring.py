@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+import xgboost as xgb
+
+import auto_train
+import main_gpu
+
+FUNDED = {
+    'name': 'Acme', 'founded_year': 2021, 'category': 'Fintech', 'location': 'USA', 'team_size': 12,
+    'funding': {'total': 4_000_000, 'rounds': 2}, 'key_strengths': ['team'], 'main_challenges': ['growth']
+}
+UNFUNDED = {'name': 'Garage', 'founded_year': 2024, 'category': 'SaaS', 'location': 'UK', 'team_size': 2}
+
+@pytest.fixture
+def runway_model(synthetic_model, monkeypatch):
+    """A primary model whose score turns on runway_months and funding_efficiency"""
+    _, X, _ = synthetic_model
+    rng = np.random.default_rng(0)
+    X = X.assign(runway_months=rng.uniform(0, 24, len(X)))
+    y = (X['runway_months'] > 6) != (X['funding_efficiency'] > 1)
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 3, 'nthread': 1},
+                        xgb.DMatrix(X, label=y, enable_categorical=True), num_boost_round=20)
+    auto_train.attach_categories(booster, X)
+    model = main_gpu.ServedModel('runway', 'runway.pkl', booster, auto_train.FEATURE_COLUMNS, None, None, {})
+    registry = main_gpu.ModelRegistry({'runway': model}, 'runway', [])
+    for name, value in [('model_registry', registry), ('primary_model', model), ('xgb_model', booster),
+                        ('feature_columns', model.features), ('category_encoder', None), ('location_encoder', None),
+                        ('native_categories', model.native_categories), ('feature_types', model.feature_types),
+                        ('similar_index', None)]:
+        monkeypatch.setattr(main_gpu, name, value)
+    return model
+
+@pytest.mark.parametrize('startup_data', [FUNDED, UNFUNDED], ids=['funded', 'unfunded'])
+def test_advisor_scores_like_predict_success(runway_model, startup_data):
+    """The advisor's defaults, fed through the /predict/success pipeline, give the advisor's own score"""
+    insights, = main_gpu.analyze_startups_with_ml([startup_data], paths=False)
+    cols = main_gpu.startup_columns([main_gpu.advisor_startup_input(startup_data)])
+    predicted = runway_model.predict(runway_model.matrix(main_gpu.build_feature_matrix(cols), cols))[0]
+    assert insights['success_probability'] == pytest.approx(float(predicted) * 100, abs=1e-4)
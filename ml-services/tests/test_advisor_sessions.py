@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main_gpu
+
+STARTUP = {'funding_total': 750_000, 'founded_year': 2022, 'team_size': 6, 'funding_rounds': 1,
+           'category': 'Fintech', 'location': 'New York'}
+
+def call_all(calls):
+    """Run (method, path, body) calls in order against one in-process client"""
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return [await client.request(method, path, json=body) for method, path, body in calls]
+    return asyncio.run(run())
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main_gpu.time, 'monotonic', lambda: now[0])
+    return now
+
+def test_session_answers_match_stateless_advisor(monkeypatch):
+    monkeypatch.setattr(main_gpu, 'advisor_sessions', main_gpu.AdvisorSessionStore(10, 60, 1 << 20))
+    created, = call_all([('POST', '/advisor/session', {'startup_data': STARTUP})])
+    session_id = created.json()['session_id']
+    question = 'How much should we raise next?'
+
+    asked, stateless, history, deleted, gone = call_all([
+        ('POST', '/advisor/ask', {'question': question, 'session_id': session_id}),
+        ('POST', '/advisor/ask', {'question': question, 'startup_data': STARTUP}),
+        ('GET', f'/advisor/session/{session_id}', None),
+        ('DELETE', f'/advisor/session/{session_id}', None),
+        ('POST', '/advisor/ask', {'question': question, 'session_id': session_id}),
+    ])
+    assert asked.json() == stateless.json()
+    assert history.json()['history'] == [{'question': question, 'answer': asked.json()['answer']}]
+    assert deleted.json() == {'deleted': True}
+    assert gone.status_code == 404
+
+def test_idle_sessions_expire(clock):
+    store = main_gpu.AdvisorSessionStore(max_sessions=10, ttl_s=60, max_bytes=1 << 20)
+    session = store.create(STARTUP, {})
+    clock[0] += 59
+    assert store.get(session.session_id) is session
+    clock[0] += 61
+    assert store.get(session.session_id) is None
+    assert store.stats()['expired'] == 1
+    assert store.total_bytes == 0
+
+def test_least_recently_used_session_is_evicted(clock):
+    store = main_gpu.AdvisorSessionStore(max_sessions=2, ttl_s=60, max_bytes=1 << 20)
+    first, second = store.create(STARTUP, {}), store.create(STARTUP, {})
+    store.get(first.session_id)
+    third = store.create(STARTUP, {})
+    assert list(store.sessions) == [first.session_id, third.session_id]
+    assert store.stats()['evicted'] == 1
+
+def test_history_ring_keeps_byte_accounting_exact(clock):
+    store = main_gpu.AdvisorSessionStore(max_sessions=10, ttl_s=60, max_bytes=1 << 20)
+    session = store.create(STARTUP, {'success_probability': 55.0})
+    for i in range(main_gpu.ADVISOR_HISTORY_TURNS + 5):
+        store.record_turn(session, f'q{i}', 'a' * 5000)
+
+    assert len(session.history) == main_gpu.ADVISOR_HISTORY_TURNS
+    assert session.history[0]['question'] == 'q5'
+    assert len(session.history[-1]['answer']) == main_gpu.ADVISOR_TURN_CHARS
+    assert store.total_bytes == session.size == session.base_bytes + sum(
+        len(t['question']) + len(t['answer']) for t in session.history)
+
+def test_byte_cap_evicts_oldest_sessions(clock):
+    store = main_gpu.AdvisorSessionStore(max_sessions=100, ttl_s=60, max_bytes=2200)
+    sessions = [store.create(STARTUP, {}) for _ in range(3)]
+    store.record_turn(sessions[2], 'q', 'a' * 2000)
+    assert list(store.sessions) == [sessions[2].session_id]
+    assert store.total_bytes <= 2200
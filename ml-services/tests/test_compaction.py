@@ -0,0 +1,51 @@
+import json
+import os
+
+import joblib
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.datasets import make_classification
+
+import auto_train
+
+@pytest.fixture
+def trained(tmp_path, monkeypatch):
+    """Deliberately oversized model on a small separable problem: (model, X_train, y_train, X_test, y_test)"""
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    X, y = make_classification(n_samples=3000, n_features=8, n_informative=5, random_state=0)
+    X = pd.DataFrame(X, columns=[f'f{i}' for i in range(8)])
+    X_train, X_test, y_train, y_test = X[:2000], X[2000:], y[:2000], y[2000:]
+    model = xgb.train({'objective': 'binary:logistic', 'max_depth': 6, 'nthread': 1},
+                      xgb.DMatrix(X_train, label=y_train), num_boost_round=60)
+    return model, X_train, y_train, X_test, y_test
+
+def test_count_tree_nodes_sums_every_tree(trained):
+    model = trained[0]
+    assert auto_train.count_tree_nodes(model) == len(model.trees_to_dataframe())
+    assert auto_train.count_tree_nodes(model[:10]) < auto_train.count_tree_nodes(model)
+
+def test_compaction_picks_smallest_candidate_within_budget(trained, tmp_path):
+    model, X_train, y_train, X_test, y_test = trained
+    auto_train.compact_model(model, X_train, y_train, X_test, y_test, 'cpu')
+
+    with open(tmp_path / 'compaction_report.json') as f:
+        report = json.load(f)
+    eligible = [row for row in report['candidates'] if row['within_budget']]
+    assert report['compact']['within_budget']
+    assert report['compact']['nodes'] == min(row['nodes'] for row in eligible)
+    assert report['compact']['nodes'] <= report['full']['nodes']
+    assert report['compact']['valid_auc'] >= report['full']['valid_auc'] - report['max_auc_loss']
+
+    compact = joblib.load(tmp_path / 'xgboost_model_compact.pkl')
+    assert auto_train.count_tree_nodes(compact) == report['compact']['nodes']
+
+def test_test_labels_do_not_influence_selection(trained, tmp_path):
+    model, X_train, y_train, X_test, y_test = trained
+    selected = []
+    for labels in (y_test, 1 - y_test):
+        auto_train.compact_model(model, X_train, y_train, X_test, labels, 'cpu')
+        with open(tmp_path / 'compaction_report.json') as f:
+            report = json.load(f)
+        selected.append((report['selected'], [row['valid_auc'] for row in report['candidates']]))
+    assert selected[0] == selected[1]
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import main_gpu
+from test_sweep import STARTUP, post
+
+pytestmark = pytest.mark.skipif(main_gpu.xgb_model is None, reason='no trained model in ./models')
+
+def probability(startup):
+    cols = main_gpu.startup_columns([startup])
+    model = main_gpu.primary_model
+    return float(model.predict(model.matrix(main_gpu.build_feature_matrix(cols), cols))[0])
+
+def test_sampled_steps_are_sparse_and_bounded():
+    rng = np.random.default_rng(0)
+    steps = main_gpu.sample_steps(rng, 500, 2, None)
+    changed = (steps != 0).sum(axis=1)
+    assert changed.max() <= 2 and changed.min() >= 1
+    low = [f['low'] for f in main_gpu.COUNTERFACTUAL_FIELDS.values()]
+    high = [f['high'] for f in main_gpu.COUNTERFACTUAL_FIELDS.values()]
+    assert (steps >= low).all() and (steps <= high).all()
+
+def test_applied_steps_round_integers_and_report_actual_change():
+    base = main_gpu.startup_columns([main_gpu.StartupInput(**STARTUP)])
+    names = list(main_gpu.COUNTERFACTUAL_FIELDS)
+    steps = np.zeros((2, len(names)))
+    steps[0, names.index('team_size')] = 1.0     # (12 + 2) * 2 - 2 = 26
+    steps[1, names.index('team_size')] = -10.0   # floors at one person
+    cols, actual = main_gpu.apply_steps(base, steps)
+    assert cols['team_size'].tolist() == [26, 1]
+    assert actual[0, names.index('team_size')] == pytest.approx(1.0)
+    assert actual[1, names.index('team_size')] == pytest.approx(np.log2(3 / 14))
+    assert cols['funding_total'].tolist() == [2_000_000] * 2
+
+def test_options_reach_target_with_few_changes():
+    startup = main_gpu.StartupInput(**STARTUP)
+    current = probability(startup)
+    target = min(current + 0.1, 0.95)
+    result = main_gpu.search_counterfactuals(startup, target, 2, budget_ms=10_000)
+
+    assert result['current_probability'] == pytest.approx(current * 100, abs=0.01)
+    assert result['iterations'] == main_gpu.COUNTERFACTUAL_MAX_ITERATIONS
+    assert result['reachable'] and result['options']
+    costs = [option['cost'] for option in result['options']]
+    assert costs == sorted(costs)
+    for option in result['options']:
+        assert 1 <= len(option['changes']) <= 2
+        changed = startup.model_copy(update={f: c['to'] for f, c in option['changes'].items()})
+        assert probability(changed) * 100 >= target * 100 - 0.01
+        assert option['probability'] == pytest.approx(probability(changed) * 100, abs=0.01)
+
+def test_search_is_deterministic_and_skips_reachable_targets():
+    startup = main_gpu.StartupInput(**STARTUP)
+    target = min(probability(startup) + 0.1, 0.95)
+    first = main_gpu.search_counterfactuals(startup, target, 2, budget_ms=10_000)
+    second = main_gpu.search_counterfactuals(startup, target, 2, budget_ms=10_000)
+    assert first['options'] == second['options']
+
+    already = main_gpu.search_counterfactuals(startup, probability(startup) / 2, 2)
+    assert already['reachable'] and already['options'] == [] and already['iterations'] == 0
+
+def test_endpoint_memoizes_per_startup_and_target(monkeypatch):
+    monkeypatch.setattr(main_gpu, 'counterfactual_cache', type(main_gpu.counterfactual_cache)())
+    body = {'startup': STARTUP, 'target_probability': 90, 'max_changes': 3}
+    first = post('/predict/counterfactual', body).json()
+    second = post('/predict/counterfactual', body).json()
+    assert not first['cached'] and second['cached']
+    assert {k: v for k, v in first.items() if k != 'cached'} == {k: v for k, v in second.items() if k != 'cached'}
+    assert not post('/predict/counterfactual', {**body, 'target_probability': 91}).json()['cached']
+    assert post('/predict/counterfactual', {**body, 'target_probability': 100}).status_code == 422
+
+ADVISOR_STARTUP = {'name': 'Acme', 'founded_year': 2021, 'category': 'Fintech', 'location': 'USA', 'team_size': 12,
+                   'funding': {'total': 1_500_000, 'rounds': 2}}
+
+def test_advisor_searches_paths_only_when_asked(monkeypatch):
+    searched = []
+    search = main_gpu.cached_counterfactuals
+    monkeypatch.setattr(main_gpu, 'cached_counterfactuals', lambda *args: searched.append(args) or search(*args))
+
+    body = {'question': 'How do I improve my odds?', 'startup_data': ADVISOR_STARTUP}
+    plain = post('/advisor/ask', body).json()
+    assert searched == []
+    assert not any(r.startswith('Path to') for r in plain['recommendations'])
+
+    guided = post('/advisor/ask', {**body, 'include_paths': True}).json()
+    assert len(searched) == 1
+    assert guided['recommendations'][0].startswith('Path to')
+
+def test_session_opts_in_once_for_every_question(monkeypatch):
+    searched = []
+    search = main_gpu.cached_counterfactuals
+    monkeypatch.setattr(main_gpu, 'cached_counterfactuals', lambda *args: searched.append(args) or search(*args))
+
+    session_id = post('/advisor/session', {'startup_data': ADVISOR_STARTUP, 'include_paths': True}).json()['session_id']
+    for question in ['How do I improve my odds?', 'What should I do next?']:
+        answer = post('/advisor/ask', {'question': question, 'session_id': session_id}).json()
+        assert answer['recommendations'][0].startswith('Path to')
+    assert len(searched) == 1
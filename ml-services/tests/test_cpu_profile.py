@@ -0,0 +1,71 @@
+import io
+
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+
+import auto_train
+import cpu_profile
+
+def fake_files(monkeypatch, files):
+    def fake_open(path, *args, **kwargs):
+        if path not in files:
+            raise FileNotFoundError(path)
+        return io.StringIO(files[path])
+    monkeypatch.setattr(cpu_profile, 'open', fake_open, raising=False)
+
+@pytest.mark.parametrize('files, limit', [
+    ({'/sys/fs/cgroup/cpu.max': '150000 100000\n'}, 1.5),
+    ({'/sys/fs/cgroup/cpu.max': 'max 100000\n'}, None),
+    ({'/sys/fs/cgroup/cpu/cpu.cfs_quota_us': '200000', '/sys/fs/cgroup/cpu/cpu.cfs_period_us': '100000'}, 2.0),
+    ({'/sys/fs/cgroup/cpu/cpu.cfs_quota_us': '-1', '/sys/fs/cgroup/cpu/cpu.cfs_period_us': '100000'}, None),
+    ({}, None),
+])
+def test_cgroup_quota_is_read_from_v2_then_v1(monkeypatch, files, limit):
+    fake_files(monkeypatch, files)
+    assert cpu_profile.cgroup_cpu_limit() == limit
+
+def test_available_cpus_rounds_quota_up_and_caps_affinity(monkeypatch):
+    monkeypatch.setattr(cpu_profile.os, 'sched_getaffinity', lambda pid: set(range(16)), raising=False)
+    monkeypatch.setattr(cpu_profile, 'cgroup_cpu_limit', lambda: 2.5)
+    assert cpu_profile.available_cpus() == 3
+    monkeypatch.setattr(cpu_profile, 'cgroup_cpu_limit', lambda: None)
+    assert cpu_profile.available_cpus() == 16
+
+def test_thread_candidates_are_powers_of_two_and_the_core_count():
+    assert cpu_profile.thread_candidates(1) == [1]
+    assert cpu_profile.thread_candidates(6) == [1, 2, 4, 6]
+    assert cpu_profile.thread_candidates(8) == [1, 2, 4, 8]
+
+def test_autotune_picks_fastest_trial_within_auc_budget():
+    X, y = make_classification(n_samples=1500, n_features=6, random_state=4)
+    X, y = pd.DataFrame(X), pd.Series(y)
+    profile = cpu_profile.autotune(X, y, {'objective': 'binary:logistic', 'max_depth': 3},
+                                   bin_options=(16, 64), rounds=5, max_auc_loss=0.01)
+
+    trials = profile['trials']
+    assert len(trials) == 2 * len(cpu_profile.thread_candidates(profile['available_cpus']))
+    eligible = [t for t in trials if t['auc'] >= max(t['auc'] for t in trials) - 0.01]
+    fastest = min(eligible, key=lambda t: t['seconds'])
+    assert (profile['nthread'], profile['max_bin']) == (fastest['nthread'], fastest['max_bin'])
+    assert profile['rows'] == 1500
+
+def test_step_banners_are_numbered_in_run_order(monkeypatch, capsys):
+    monkeypatch.setattr(auto_train, 'step_number', 0)
+    auto_train.step("PROFILING CPU...")
+    auto_train.step("TRAINING...")
+    assert capsys.readouterr().out.split() == ['[1]', 'PROFILING', 'CPU...', '[2]', 'TRAINING...']
+
+def test_standalone_gpu_script_trains_with_the_autotuned_profile(monkeypatch):
+    import train_model_gpu
+
+    X, y = make_classification(n_samples=600, n_features=6, random_state=4)
+    X, y = pd.DataFrame(X), pd.Series(y)
+    monkeypatch.setattr(train_model_gpu.torch.cuda, 'is_available', lambda: False)
+    monkeypatch.setattr(train_model_gpu.cpu_profile, 'autotune', lambda X, y, params, seed: {'nthread': 1, 'max_bin': 64})
+    used = []
+    train = train_model_gpu.xgb.train
+    monkeypatch.setattr(train_model_gpu.xgb, 'train', lambda params, *args, **kwargs: used.append(params) or train(params, *args, **kwargs))
+
+    train_model_gpu.train_xgboost_gpu(X[:500], y[:500], X[500:], y[500:])
+    assert (used[0]['nthread'], used[0]['max_bin']) == (1, 64)
@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.model_selection import StratifiedKFold
+
+import auto_train
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    monkeypatch.setitem(auto_train.CONFIG, 'cv_max_rounds', 30)
+    X, y = make_classification(n_samples=1200, n_features=8, n_informative=5, random_state=2)
+    return pd.DataFrame(X, columns=[f'f{i}' for i in range(8)]), pd.Series(y)
+
+def test_report_picks_round_from_mean_curve(data, tmp_path):
+    X, y = data
+    overrides = {'max_depth': 3, 'learning_rate': 0.2}
+    report = auto_train.cross_validate(X, y, n_folds=3, overrides=overrides)
+
+    # Same folds, run in-process
+    X32, y32 = X.to_numpy(np.float32), y.to_numpy(np.float32)
+    auto_train._init_cv_worker(X32, y32, ['q'] * X.shape[1], 1)
+    params = {**auto_train.optimized_params('cpu'), **overrides}
+    splits = StratifiedKFold(3, shuffle=True, random_state=auto_train.CONFIG['random_state']).split(X32, y32)
+    curves = [auto_train._run_cv_fold(params, tr, va, 30) for tr, va in splits]
+    length = min(len(auc) for auc, _ in curves)
+    mean_auc = np.mean([auc[:length] for auc, _ in curves], axis=0)
+
+    assert report['rounds'] == int(mean_auc.argmax()) + 1
+    assert report['fold_auc'] == pytest.approx([auc[report['rounds'] - 1] for auc, _ in curves])
+    assert report['fold_accuracy'] == pytest.approx([1 - err[report['rounds'] - 1] for _, err in curves])
+    assert report['auc_mean'] == pytest.approx(np.mean(report['fold_auc']))
+    with open(tmp_path / 'cv_report.json') as f:
+        assert json.load(f) == report
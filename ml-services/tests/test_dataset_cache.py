@@ -0,0 +1,63 @@
+import json
+
+import pandas as pd
+import pytest
+
+import auto_train
+from test_ingest import write_source_csv
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setitem(auto_train.CONFIG, 'cache_dir', str(tmp_path / 'cache'))
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path / 'models'))
+    (tmp_path / 'cache').mkdir()
+    (tmp_path / 'models').mkdir()
+    source = tmp_path / 'startups.csv'
+    write_source_csv(source, n_rows=3000)
+    return source
+
+def test_second_build_is_served_from_cache(workspace, capsys):
+    first = auto_train.load_or_build_dataset(str(workspace))
+    assert 'Cached dataset' in capsys.readouterr().out
+
+    second = auto_train.load_or_build_dataset(str(workspace))
+    assert 'cached (' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), second, check_dtype=False)
+
+def test_key_tracks_content_and_config(workspace, monkeypatch):
+    key = auto_train.dataset_cache_key(str(workspace))
+    assert auto_train.dataset_cache_key(str(workspace)) == key
+
+    monkeypatch.setitem(auto_train.CONFIG, 'random_state', 7)
+    assert auto_train.dataset_cache_key(str(workspace)) != key
+    monkeypatch.setitem(auto_train.CONFIG, 'random_state', 42)
+
+    write_source_csv(workspace, n_rows=3000, seed=1)
+    assert auto_train.dataset_cache_key(str(workspace)) != key
+
+def test_fingerprint_is_memoized_on_size_and_mtime(workspace):
+    digest = auto_train.file_fingerprint(str(workspace))
+    with open(f"{auto_train.CONFIG['cache_dir']}/file_hashes.json") as f:
+        memo = json.load(f)
+    assert list(memo.values()) == [digest]
+
+    # A memo hit never re-reads the file
+    memo_key, = memo
+    memo[memo_key] = 'memoized'
+    with open(f"{auto_train.CONFIG['cache_dir']}/file_hashes.json", 'w') as f:
+        json.dump(memo, f)
+    assert auto_train.file_fingerprint(str(workspace)) == 'memoized'
+
+def test_fingerprint_memo_forgets_deleted_and_rewritten_files(workspace, tmp_path):
+    other = tmp_path / 'other.csv'
+    write_source_csv(other, n_rows=100)
+    auto_train.file_fingerprint(str(other))
+    auto_train.file_fingerprint(str(workspace))
+    other.unlink()
+
+    write_source_csv(workspace, n_rows=200, seed=1)
+    digest = auto_train.file_fingerprint(str(workspace))
+    with open(f"{auto_train.CONFIG['cache_dir']}/file_hashes.json") as f:
+        memo = json.load(f)
+    assert list(memo.values()) == [digest]
+    assert next(iter(memo)).startswith(str(workspace))
@@ -0,0 +1,59 @@
+import time
+
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.datasets import make_classification
+from sklearn.metrics import roc_auc_score
+
+import auto_train
+
+@pytest.fixture
+def split(tmp_path, monkeypatch):
+    monkeypatch.setitem(auto_train.CONFIG, 'cache_dir', str(tmp_path))
+    X, y = make_classification(n_samples=2000, n_features=8, n_informative=5, random_state=3)
+    X, y = pd.DataFrame(X, columns=[f'f{i}' for i in range(8)]), pd.Series(y)
+    return X[:1600], y[:1600], X[1600:], y[1600:]
+
+def test_partitions_cover_every_row_once(split):
+    import pyarrow.feather as feather
+    X, y, _, _ = split
+    paths = auto_train.write_partitions(X, y, 3, 'train')
+    parts = [feather.read_feather(p) for p in paths]
+
+    assert [len(p) for p in parts] == [534, 533, 533]
+    merged = pd.concat(parts).sort_values('f0', ignore_index=True)
+    expected = X.assign(success=y).sort_values('f0', ignore_index=True)
+    pd.testing.assert_frame_equal(merged, expected)
+
+def test_two_workers_train_one_model(split):
+    X_train, y_train, X_test, y_test = split
+    model = auto_train.train_distributed(X_train, y_train, X_test, y_test, 'cpu', 2,
+                                         overrides={'max_depth': 3}, num_rounds=15)
+    single = xgb.train({**auto_train.optimized_params('cpu'), 'max_depth': 3},
+                       xgb.DMatrix(X_train, label=y_train), num_boost_round=15)
+
+    assert model.num_boosted_rounds() == 15
+    auc = roc_auc_score(y_test, model.predict(xgb.DMatrix(X_test)))
+    single_auc = roc_auc_score(y_test, single.predict(xgb.DMatrix(X_test)))
+    # Allreduced histograms: the same data split across workers learns the same model, up to sketching
+    assert auc == pytest.approx(single_auc, abs=0.02)
+
+def test_failing_worker_fails_the_run(split):
+    X_train, y_train, X_test, y_test = split
+    with pytest.raises(RuntimeError, match='exited with code'):
+        auto_train.train_distributed(X_train, y_train, X_test, y_test, 'cpu', 2,
+                                     overrides={'objective': 'not:an_objective'}, num_rounds=5)
+
+def hung_worker(*args):
+    time.sleep(60)
+
+def test_hung_workers_time_out_and_are_stopped(split, monkeypatch):
+    X_train, y_train, X_test, y_test = split
+    monkeypatch.setattr(auto_train, '_distributed_worker', hung_worker)
+    monkeypatch.setitem(auto_train.CONFIG, 'distributed_timeout_s', 1)
+
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        auto_train.train_distributed(X_train, y_train, X_test, y_test, 'cpu', 2, num_rounds=5)
+    assert time.time() - start < 30
@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+import xgboost as xgb
+
+import auto_train
+import main_gpu
+
+@pytest.fixture(scope='module')
+def training(synthetic_model):
+    """(drift reference, training matrix, training probabilities)"""
+    booster, X, _ = synthetic_model
+    matrix, _ = auto_train.feature_array(X)
+    probabilities = booster.predict(xgb.DMatrix(X, enable_categorical=True))
+    return auto_train.drift_reference(booster, X), matrix, probabilities
+
+def new_sketch(training):
+    reference, _, _ = training
+    return main_gpu.DriftSketch(reference, reference['features'])
+
+def test_training_traffic_is_stable(training):
+    _, matrix, probabilities = training
+    sketch = new_sketch(training)
+    sketch.update(matrix, probabilities)
+
+    report = sketch.report()
+    assert report['observed'] == len(matrix)
+    assert report['drifted'] == []
+    assert report['prediction']['psi'] < 0.01
+    assert all(f['psi'] < 0.01 for f in report['features'])
+
+def test_counts_match_training_histograms(training):
+    reference, matrix, probabilities = training
+    sketch = new_sketch(training)
+    sketch.update(matrix, probabilities)
+
+    for j, name in enumerate(sketch.features):
+        assert sketch.counts[j, :sketch.n_bins[j]].tolist() == reference['counts'][reference['features'].index(name)]
+    assert sketch.prediction_counts.tolist() == reference['prediction']['counts']
+
+def test_chunked_updates_equal_one_batch(training, monkeypatch):
+    _, matrix, probabilities = training
+    whole = new_sketch(training)
+    whole.update(matrix, probabilities)
+
+    monkeypatch.setattr(main_gpu, 'DRIFT_UPDATE_CHUNK', 7)
+    pieces = new_sketch(training)
+    for start in range(0, len(matrix), 500):
+        pieces.update(matrix[start:start + 500], probabilities[start:start + 500])
+
+    assert np.array_equal(whole.counts, pieces.counts)
+    assert np.array_equal(whole.prediction_counts, pieces.prediction_counts)
+
+def test_shifted_feature_is_flagged(training):
+    reference, matrix, probabilities = training
+    shifted = matrix.copy()
+    funding = reference['features'].index('funding_total')
+    shifted[:, funding] *= 100
+
+    sketch = new_sketch(training)
+    sketch.update(shifted, probabilities)
+    report = sketch.report()
+
+    assert report['features'][0]['feature'] == 'funding_total'
+    assert report['features'][0]['status'] == 'significant'
+    assert report['drifted'] == ['funding_total']
+
+def test_reset_starts_a_new_window(training):
+    _, matrix, probabilities = training
+    sketch = new_sketch(training)
+    sketch.update(matrix, probabilities)
+    sketch.reset()
+    assert sketch.observed == 0
+    assert sketch.counts.sum() == 0
+    assert sketch.prediction_counts.sum() == 0
+
+def test_drift_endpoint_reports_and_resets(training, monkeypatch):
+    _, matrix, probabilities = training
+    sketch = new_sketch(training)
+    sketch.update(matrix[:100], probabilities[:100])
+    monkeypatch.setattr(main_gpu, 'drift_sketch', sketch)
+
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return (await client.get('/drift'), await client.delete('/drift'), await client.get('/drift'))
+
+    report, reset, empty = asyncio.run(run())
+    assert report.status_code == 200 and report.json()['observed'] == 100
+    assert reset.json() == {'status': 'reset'}
+    assert empty.json() == {'observed': 0, 'features': [], 'drifted': []}
+
+def test_drift_endpoint_without_reference(monkeypatch):
+    monkeypatch.setattr(main_gpu, 'drift_sketch', None)
+
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.get('/drift')
+
+    assert asyncio.run(run()).status_code == 503
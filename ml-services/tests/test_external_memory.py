@@ -0,0 +1,113 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import auto_train
+from test_ingest import write_source_csv
+
+@pytest.fixture
+def sharded(tmp_path, monkeypatch):
+    for key, name in [('cache_dir', 'cache'), ('models_dir', 'models')]:
+        (tmp_path / name).mkdir()
+        monkeypatch.setitem(auto_train.CONFIG, key, str(tmp_path / name))
+    monkeypatch.setitem(auto_train.CONFIG, 'ingest_chunk_rows', 1000)
+    source = tmp_path / 'startups.csv'
+    write_source_csv(source, n_rows=6000)
+    paths, _ = auto_train.write_feature_shards(str(source))
+    return str(source), paths
+
+def test_shards_hold_every_balanced_row_once(sharded):
+    source, paths = sharded
+    shards = [pd.read_parquet(p) for p in paths]
+    usable = auto_train.read_source_data(source)
+    n_success = usable['status'].isin(auto_train.SUCCESS_STATUSES).sum()
+
+    assert len(paths) == 6
+    assert all(list(s.columns) == auto_train.FEATURE_COLUMNS + ['success'] for s in shards)
+    rows = pd.concat(shards)
+    assert rows['success'].sum() <= n_success
+    assert len(rows) <= len(usable)
+    # Undersampling leaves neither class more than 1.5x the other
+    assert rows['success'].mean() == pytest.approx(0.5, abs=0.1)
+
+def test_shards_are_reused_when_inputs_are_unchanged(sharded, monkeypatch):
+    source, paths = sharded
+    read_csv = auto_train.pd.read_csv
+
+    def header_only(*args, **kwargs):
+        assert kwargs.get('nrows') == 0, 'shard cache hit re-read the CSV body'
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(auto_train.pd, 'read_csv', header_only)
+    assert auto_train.write_feature_shards(source)[0] == paths
+
+def test_split_keeps_shards_on_one_side(sharded):
+    _, paths = sharded
+    train, test = auto_train.split_shards(paths)
+    assert sorted(train + test) == sorted(paths)
+    assert not set(train) & set(test)
+    with pytest.raises(ValueError):
+        auto_train.split_shards(paths[:1])
+
+def test_external_training_learns_from_shards(sharded):
+    _, paths = sharded
+    train, test = auto_train.split_shards(paths)
+    model = auto_train.train_external(train, test, 'cpu')
+    acc, auc = auto_train.evaluate_shards(model, test)
+    assert model.num_features() == len(auto_train.FEATURE_COLUMNS)
+    assert auc > 0.6
+
+def test_location_tiers_come_from_the_balanced_rows(tmp_path, monkeypatch):
+    """Success-only locations lead before balancing; failure-only ones lead after it"""
+    monkeypatch.setitem(auto_train.CONFIG, 'cache_dir', str(tmp_path))
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    locations = ([f'S{i}' for i in range(10) for _ in range(200)] + [f'X{i}' for i in range(200) for _ in range(10)]
+                 + [f'F{i}' for i in range(10) for _ in range(100)])
+    statuses = ['acquired'] * 4000 + ['closed'] * 1000
+    source = tmp_path / 'tiers.csv'
+    pd.DataFrame({'status': statuses, 'funding_total_usd': 1e6, 'founded_year': 2015,
+                  'category_list': 'Software', 'country_code': locations, 'funding_rounds': 1}).to_csv(source, index=False)
+
+    _, vocab = auto_train.write_feature_shards(str(source))
+    assert vocab['top_locations'] == [f'F{i}' for i in range(10)]
+
+def test_native_categorical_shards_train_a_native_model(tmp_path, monkeypatch):
+    for key, name in [('cache_dir', 'cache'), ('models_dir', 'models')]:
+        (tmp_path / name).mkdir()
+        monkeypatch.setitem(auto_train.CONFIG, key, str(tmp_path / name))
+    monkeypatch.setitem(auto_train.CONFIG, 'ingest_chunk_rows', 1000)
+    monkeypatch.setitem(auto_train.CONFIG, 'categorical_mode', 'native')
+    (tmp_path / 'models' / 'category_encoder.pkl').write_bytes(b'stale')
+    source = tmp_path / 'startups.csv'
+    write_source_csv(source, n_rows=6000)
+
+    paths, vocab = auto_train.write_feature_shards(str(source))
+    assert vocab['categories']['location_encoded'] == ['GBR', 'IND', 'USA']
+    assert list((tmp_path / 'models').iterdir()) == []
+
+    train, test = auto_train.split_shards(paths)
+    model = auto_train.train_external(train, test, 'cpu')
+    assert [t for f, t in zip(model.feature_names, model.feature_types) if t == 'c'] == ['c', 'c']
+    frame = auto_train.shard_frame(test, vocab)
+    assert frame['location_encoded'].cat.categories.tolist() == ['GBR', 'IND', 'USA']
+
+def test_external_run_saves_serving_artifacts(sharded, tmp_path, monkeypatch):
+    source, paths = sharded
+    monkeypatch.setitem(auto_train.CONFIG, 'data_dir', str(tmp_path / 'data'))
+    auto_train.main_external(source)
+
+    models_dir = tmp_path / 'models'
+    model = joblib.load(models_dir / 'xgboost_model.pkl')
+    metadata = joblib.load(models_dir / 'model_metadata.pkl')
+    _, test = auto_train.split_shards(paths)
+    n_valid = sum(len(pd.read_parquet(p)) for p in test)
+    assert sum(metadata['drift_reference']['prediction']['counts']) == n_valid
+    with open(os.path.join(os.path.dirname(paths[0]), 'vocab.json')) as f:
+        assert metadata['top_locations'] == json.load(f)['top_locations']
+    with np.load(models_dir / 'score_distribution.npz') as scores:
+        assert len(scores['all']) == n_valid
+        assert str(scores['model']) == auto_train.model_fingerprint(model)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+import auto_train
+import main_gpu
+
+def cleaned_rows(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'status': 'acquired',
+        'funding_total': np.where(rng.random(n) < 0.1, 0, rng.lognormal(14, 2, n)).astype(np.float32),
+        'founded_year': rng.integers(1995, 2024, n).astype(np.int32),
+        'category': pd.Categorical(rng.choice(['Software', 'Biotech'], n)),
+        'location': pd.Categorical(rng.choice(['USA', 'GBR', 'IND'], n)),
+        'funding_rounds': rng.integers(0, 6, n).astype(np.int32),
+        'success': rng.integers(0, 2, n)
+    })
+
+def test_engineered_columns_use_schema_dtypes():
+    df = auto_train.engineer_features(cleaned_rows(), ['USA'], np.random.default_rng(0))
+    for name, dtype in auto_train.FEATURE_SCHEMA.items():
+        if name not in ('category_encoded', 'location_encoded'):
+            assert df[name].dtype == dtype, name
+    assert df.loc[df['location'] == 'USA', 'location_tier'].eq(1).all()
+
+def test_team_size_stays_in_its_funding_bucket():
+    df = auto_train.engineer_features(cleaned_rows(), ['USA'], np.random.default_rng(0))
+    unfunded = df['funding_total'] == 0
+    assert df.loc[unfunded, 'team_size'].between(2, 4).all()
+    assert df.loc[df['funding_total'] >= 50_000_000, 'team_size'].between(100, 499).all()
+
+def test_same_generator_same_features():
+    first = auto_train.engineer_features(cleaned_rows(), ['USA'], np.random.default_rng(9))
+    again = auto_train.engineer_features(cleaned_rows(), ['USA'], np.random.default_rng(9))
+    pd.testing.assert_frame_equal(first, again)
+
+STARTUPS = [
+    main_gpu.StartupInput(funding_total=2_500_000, founded_year=2019, team_size=14, funding_rounds=2,
+                          monthly_revenue=30_000, user_growth_rate=0.4, burn_rate=80_000, market_size=5e9,
+                          category='Fintech', location='USA', key_strengths=['a', 'b', 'c']),
+    main_gpu.StartupInput(funding_total=0, founded_year=2023, team_size=2, funding_rounds=0, burn_rate=0,
+                          category='Unknown', location='Nowhere', description='x' * 120),
+]
+
+def float64_frame(startups):
+    """The features built the pre-float32 way: one float64 DataFrame"""
+    cols = {k: v.astype(float) if v.dtype.kind == 'f' else v for k, v in main_gpu.startup_columns(startups).items()}
+    age = 2025 - cols['founded_year']
+    return pd.DataFrame({
+        **{k: cols[k] for k in ['funding_total', 'founded_year', 'team_size', 'funding_rounds', 'monthly_revenue',
+                                'user_growth_rate', 'burn_rate', 'market_size', 'num_strengths', 'num_challenges',
+                                'description_length', 'problem_length']},
+        'company_age': age,
+        'funding_per_round': cols['funding_total'] / (cols['funding_rounds'] + 1),
+        'funding_velocity': cols['funding_total'] / (age + 1),
+        'revenue_to_burn_ratio': cols['monthly_revenue'] / (cols['burn_rate'] + 1),
+        'funding_efficiency': cols['user_growth_rate'] * cols['funding_total'] / 1e6,
+        'category_encoded': main_gpu.encode_labels(main_gpu.category_encoder, cols['category']),
+        'location_encoded': main_gpu.encode_labels(main_gpu.location_encoder, cols['location']),
+        'strength_to_challenge_ratio': cols['num_strengths'] / (cols['num_challenges'] + 1),
+        'runway_months': np.where(cols['burn_rate'] > 0, cols['funding_total'] / (cols['burn_rate'] * 12 + 1), 12),
+        'location_tier': np.ones(len(startups)),
+        'founded_in_recession': np.isin(cols['founded_year'], [2008, 2009, 2020, 2023]).astype(int),
+        'is_well_funded': (cols['funding_total'] > 1_000_000).astype(int),
+        'optimal_age': ((age >= 2) & (age <= 6)).astype(int),
+        'optimal_team': ((cols['team_size'] >= 5) & (cols['team_size'] <= 50)).astype(int),
+    })[main_gpu.feature_columns]
+
+@pytest.mark.skipif(main_gpu.xgb_model is None, reason='no trained model in ./models')
+def test_float32_matrix_predicts_like_float64_frame():
+    matrix = main_gpu.build_feature_matrix(main_gpu.startup_columns(STARTUPS))
+    reference = float64_frame(STARTUPS)
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (len(STARTUPS), len(main_gpu.feature_columns))
+    assert np.allclose(matrix, reference.to_numpy(), rtol=1e-6)
+    # XGBoost casts its input to float32, so the two paths give the same scores
+    assert np.array_equal(main_gpu.xgb_model.predict(main_gpu.feature_dmatrix(main_gpu.startup_columns(STARTUPS))),
+                          main_gpu.xgb_model.predict(xgb.DMatrix(reference)))
@@ -0,0 +1,140 @@
+import json
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+import auto_train
+
+def write_source_csv(path, n, seed):
+    """Crunchbase-shaped rows: imbalanced statuses, a dominant location"""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'name': np.arange(n),
+        'status': rng.choice(['acquired', 'ipo', 'closed'], n, p=[0.6, 0.2, 0.2]),
+        'funding_total_usd': rng.lognormal(14, 2, n),
+        'founded_year': rng.integers(2000, 2024, n),
+        'category_list': rng.choice(['Technology', 'Fintech', 'SaaS'], n),
+        'country_code': rng.choice(['GBR', 'USA', 'IND'], n, p=[0.6, 0.2, 0.2]),
+        'funding_rounds': rng.integers(1, 6, n)
+    }).to_csv(path, index=False)
+
+@pytest.fixture
+def deployed(tmp_path, monkeypatch):
+    """A model trained on one export and deployed in a scratch models dir, with USA as the only tier-1 location"""
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir()
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(models_dir))
+
+    write_source_csv(tmp_path / 'initial.csv', 3000, seed=3)
+    df = auto_train.encode_features(auto_train.load_and_clean_advanced(str(tmp_path / 'initial.csv')))
+    X_train, _, y_train, _, features = auto_train.prepare_data(df)
+    model = xgb.train({'objective': 'binary:logistic', 'max_depth': 3, 'nthread': 1},
+                      xgb.DMatrix(X_train, label=y_train), num_boost_round=10)
+    joblib.dump(model, models_dir / 'xgboost_model.pkl')
+    joblib.dump(features, models_dir / 'feature_columns.pkl')
+    joblib.dump({'accuracy': 0.7, 'top_locations': ['USA']}, models_dir / 'model_metadata.pkl')
+
+    data_file = tmp_path / 'new_rows.csv'
+    write_source_csv(data_file, 2000, seed=5)
+    return models_dir, str(data_file)
+
+def test_unseen_labels_map_to_zero():
+    encoder = auto_train.LabelEncoder().fit(['Fintech', 'SaaS'])
+    codes, unseen = auto_train.encode_with_saved(encoder, ['SaaS', 'Biotech', 'Fintech'])
+    assert codes.tolist() == [1, 0, 0]
+    assert unseen == 1
+
+def test_new_rows_keep_class_mix_and_training_tiers(deployed):
+    _, data_file = deployed
+    df = auto_train.load_new_rows(data_file, ['USA'])
+
+    assert len(df) == len(pd.read_csv(data_file))
+    assert df['success'].mean() == pytest.approx(0.8, abs=0.05)
+    assert set(df.loc[df['location_tier'] == 1, 'location'].astype(str)) == {'USA'}
+    assert (df.loc[df['location'].astype(str) == 'GBR', 'location_tier'] == 2).all()
+
+def test_update_is_accepted_and_recorded(deployed):
+    models_dir, data_file = deployed
+    before_trees = joblib.load(models_dir / 'xgboost_model.pkl').num_boosted_rounds()
+
+    updated, before, after = auto_train.train_incremental(data_file, 'cpu')
+
+    assert after >= before - auto_train.CONFIG['incremental_max_auc_loss']
+    assert joblib.load(models_dir / 'xgboost_model.pkl').num_boosted_rounds() > before_trees
+    assert (models_dir / 'xgboost_model.prev.pkl').exists()
+    metadata = joblib.load(models_dir / 'model_metadata.pkl')
+    assert metadata['accuracy'] == 0.7
+    assert metadata['incremental_updates'][-1]['mode'] == 'boost'
+
+@pytest.fixture
+def stale_artifacts(deployed):
+    """Serving artifacts left behind by the deployed model"""
+    models_dir, _ = deployed
+    np.savez(models_dir / 'score_distribution.npz', all=np.zeros(5, dtype=np.float32))
+    (models_dir / 'neighbors').mkdir()
+    (models_dir / 'neighbors' / 'meta.json').write_text(json.dumps({'rows': 5}))
+    shutil.copy(models_dir / 'xgboost_model.pkl', models_dir / 'xgboost_model_compact.pkl')
+    return models_dir
+
+def test_accepted_update_rebuilds_serving_artifacts(deployed, stale_artifacts):
+    models_dir, data_file = deployed
+    stale_compact = (models_dir / 'xgboost_model_compact.pkl').read_bytes()
+
+    updated, _, _ = auto_train.train_incremental(data_file, 'cpu')
+
+    n = len(auto_train.load_new_rows(data_file, ['USA']))
+    n_fit = n - int(n * auto_train.CONFIG['incremental_holdout'])
+    with np.load(models_dir / 'score_distribution.npz') as scores:
+        assert len(scores['all']) == n
+        assert str(scores['model']) == auto_train.model_fingerprint(updated)
+    reference = joblib.load(models_dir / 'model_metadata.pkl')['drift_reference']
+    assert sum(reference['prediction']['counts']) == n_fit
+    assert json.loads((models_dir / 'neighbors' / 'meta.json').read_text())['rows'] == n
+    compact = (models_dir / 'xgboost_model_compact.pkl').read_bytes()
+    assert compact != stale_compact
+    assert json.loads((models_dir / 'compaction_report.json').read_text())['full']['trees'] == updated.num_boosted_rounds()
+
+def test_refresh_keeps_the_tree_structure(deployed):
+    models_dir, data_file = deployed
+    deployed_model = joblib.load(models_dir / 'xgboost_model.pkl')
+
+    updated, _, _ = auto_train.train_incremental(data_file, 'cpu', mode='refresh')
+
+    assert updated.num_boosted_rounds() == deployed_model.num_boosted_rounds()
+    assert updated.get_dump() != deployed_model.get_dump()
+
+def test_update_worse_than_deployed_is_rejected(deployed, stale_artifacts, monkeypatch):
+    models_dir, data_file = deployed
+    deployed_bytes = (models_dir / 'xgboost_model.pkl').read_bytes()
+    compact_bytes = (models_dir / 'xgboost_model_compact.pkl').read_bytes()
+    # No update can gain a full AUC point, so every update counts as a regression
+    monkeypatch.setitem(auto_train.CONFIG, 'incremental_max_auc_loss', -1.0)
+
+    kept, before, after = auto_train.train_incremental(data_file, 'cpu')
+
+    assert (models_dir / 'xgboost_model.pkl').read_bytes() == deployed_bytes
+    assert not (models_dir / 'xgboost_model.prev.pkl').exists()
+    assert 'incremental_updates' not in joblib.load(models_dir / 'model_metadata.pkl')
+    # The deployed model's artifacts still match it
+    assert (models_dir / 'xgboost_model_compact.pkl').read_bytes() == compact_bytes
+    with np.load(models_dir / 'score_distribution.npz') as scores:
+        assert len(scores['all']) == 5
+
+def test_early_stopping_never_sees_the_gate_window(deployed, monkeypatch):
+    _, data_file = deployed
+    watched = []
+    train = xgb.train
+
+    def recording_train(params, dtrain, *args, evals=(), **kwargs):
+        watched.extend(d.num_row() for d, _ in evals)
+        return train(params, dtrain, *args, evals=evals, **kwargs)
+
+    monkeypatch.setattr(auto_train.xgb, 'train', recording_train)
+    auto_train.train_incremental(data_file, 'cpu')
+
+    n = len(auto_train.load_new_rows(data_file, ['USA']))
+    assert watched == [int(n * auto_train.CONFIG['incremental_valid'])]
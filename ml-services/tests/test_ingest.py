@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import auto_train
+
+def write_source_csv(path, n_rows=500, seed=0):
+    """Crunchbase-shaped export with columns training never reads"""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'name': [f'co{i}' for i in range(n_rows)],
+        'homepage_url': 'https://example.com',
+        'status': rng.choice(['Acquired', 'operating', 'closed', 'IPO', None], n_rows),
+        'funding_total_usd': np.where(rng.random(n_rows) < 0.05, -1, rng.integers(0, 5e7, n_rows)),
+        'founded_at': [f'{y}-01-15' for y in rng.integers(1985, 2026, n_rows)],
+        'category_list': rng.choice(['Software', 'Biotech', None], n_rows),
+        'country_code': rng.choice(['USA', 'GBR', 'IND'], n_rows),
+        'funding_rounds': rng.integers(0, 6, n_rows),
+        'description': 'x' * 200,
+    }).to_csv(path, index=False)
+
+@pytest.fixture
+def source_csv(tmp_path):
+    path = tmp_path / 'startups.csv'
+    write_source_csv(path)
+    return str(path)
+
+def test_columns_are_found_from_the_header(source_csv):
+    cols, n_columns = auto_train.discover_columns(source_csv)
+    assert n_columns == 9
+    assert cols == {'status': 'status', 'funding': 'funding_total_usd', 'founded': 'founded_at', 'founded_year': None,
+                    'category': 'category_list', 'location': 'country_code', 'rounds': 'funding_rounds'}
+
+def test_rows_are_filtered_and_compact(source_csv):
+    df = auto_train.read_source_data(source_csv)
+    raw = pd.read_csv(source_csv)
+    years = pd.to_datetime(raw['founded_at']).dt.year
+    keep = (raw['status'].str.lower().isin(['acquired', 'ipo', 'closed', 'dead'])
+            & years.between(1990, 2024) & (raw['funding_total_usd'] >= 0))
+
+    assert len(df) == keep.sum()
+    assert list(df.columns) == ['status', 'funding_total', 'founded_year', 'category', 'location', 'funding_rounds']
+    assert df['funding_total'].dtype == np.float32
+    assert df['founded_year'].dtype == np.int32
+    assert isinstance(df['category'].dtype, pd.CategoricalDtype)
+    assert (df['category'] == 'other').sum() == raw.loc[keep, 'category_list'].isna().sum()
+
+def test_chunked_read_matches_single_read(source_csv, monkeypatch):
+    whole = auto_train.read_source_data(source_csv)
+    monkeypatch.setitem(auto_train.CONFIG, 'ingest_memory_budget_mb', 0)
+    monkeypatch.setitem(auto_train.CONFIG, 'ingest_chunk_rows', 64)
+    chunked = auto_train.read_source_data(source_csv)
+
+    for col in whole.columns:
+        assert whole[col].astype(str).tolist() == chunked[col].astype(str).tolist()
+
+def test_missing_key_columns_return_none(tmp_path):
+    path = tmp_path / 'bad.csv'
+    pd.DataFrame({'name': ['a'], 'status': ['ipo']}).to_csv(path, index=False)
+    assert auto_train.read_source_data(str(path)) is None
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import main_gpu
+
+TABLE = pd.DataFrame([
+    {'name': 'Seed Fintech', 'type': 'Venture Capital', 'stage': 'Pre-Seed-Seed', 'ticketSize': '$100K - $1M',
+     'location': 'Austin, USA', 'focus': ['Fintech']},
+    {'name': 'Growth Health', 'type': 'Venture Capital', 'stage': 'Series B-Series C', 'ticketSize': '$10M - $50M',
+     'location': 'London, UK', 'focus': ['Healthcare']},
+    {'name': 'Generalist', 'type': 'Venture Capital', 'stage': 'Seed-Series A', 'ticketSize': '$500K - $5M',
+     'location': 'Boston, USA', 'focus': ['All Sectors']},
+    {'name': 'Accelerator', 'type': 'Accelerator', 'stage': 'Pre-Seed', 'ticketSize': '$125K',
+     'location': 'Mountain View, USA', 'focus': 'AI/ML|Fintech'},
+])
+
+def startup(**overrides):
+    base = dict(funding_total=500_000, founded_year=2024, team_size=8, funding_rounds=1,
+                category='Fintech', location='Austin, USA')
+    return main_gpu.StartupInput(**{**base, **overrides})
+
+@pytest.fixture(scope='module')
+def index():
+    return main_gpu.InvestorIndex(TABLE)
+
+def test_parse_stage_terms_and_ticket_ranges():
+    assert main_gpu.stage_terms('Seed-Series B') == ['seed', 'series b']
+    # Substring rules, as in the Node fallback: 'seed' is in 'Pre-seed', ranges are not expanded
+    assert main_gpu.stage_terms('Pre-seed') == ['pre-seed', 'seed']
+    assert main_gpu.stage_terms('Seed-Series C') == ['seed', 'series c']
+    assert main_gpu.stage_terms('Growth') == []
+    assert main_gpu.parse_ticket_range('$1M - $20M') == (1e6, 2e7)
+    assert main_gpu.parse_ticket_range('$125K') == (125e3, 125e3)
+    assert main_gpu.parse_ticket_range('') == (0.0, float('inf'))
+    assert [main_gpu.ticket_band(a) for a in [0, 250_000, 3e6, 1e9]] == [0, 1, 2, 4]
+
+def test_posting_lists_map_keys_to_rows(index):
+    assert main_gpu.build_posting_lists([['a', 'b'], ['b'], []])['b'].tolist() == [0, 1]
+    assert index.by_category['fintech'].tolist() == [0, 3]
+    assert index.by_stage['seed'].tolist() == [0, 2, 3]
+    assert index.by_stage['series a'].tolist() == [2]
+
+def test_categories_match_focus_by_substring_either_way(index):
+    assert index.category_keys('Fin') == ['fintech']
+    assert index.category_keys('Fintech Lending') == ['fintech']
+    assert index.category_keys('Robotics') == []
+
+def test_top_k_is_prefix_of_full_ranking(index):
+    full_ids, full_scores, scored = index.match(startup(), 4, None, False, None)
+    top_ids, top_scores, _ = index.match(startup(), 2, None, False, None)
+    assert scored == 4
+    assert np.all(np.diff(full_scores) <= 0)
+    assert top_ids.tolist() == full_ids[:2].tolist()
+    assert TABLE['name'][full_ids[0]] == 'Seed Fintech'
+    assert TABLE['name'][full_ids[-1]] == 'Growth Health'
+
+def test_category_filter_keeps_focus_and_generalists(index):
+    ids, _, scored = index.match(startup(), 10, None, True, None)
+    assert sorted(TABLE['name'][ids]) == ['Accelerator', 'Generalist', 'Seed Fintech']
+    assert scored == 3
+
+def test_success_probability_weighs_selective_investors_more(index):
+    def scores(probability):
+        ids, score, _ = index.match(startup(category='Robotics', location='Paris, France', founded_year=2010), 4, None, False, probability)
+        return dict(zip(ids.tolist(), score.tolist()))
+    low, high = scores(10.0), scores(90.0)
+    # Accelerator (row 3) is less selective than the VC (row 0)
+    assert 0 < high[3] - low[3] < high[0] - low[0]
+
+def test_location_bonus_follows_startup_location_terms(index):
+    def scores(location):
+        ids, score, _ = index.match(startup(category='Robotics', location=location, founded_year=2010), 4, None, False, None)
+        return dict(zip(ids.tolist(), score.tolist()))
+    paris, new_york = scores('Paris, France'), scores('New York')
+    # Every investor gets the bonus, wherever it is based (scores cap at 100)
+    assert new_york == {i: min(score + 10, 100) for i, score in paris.items()}
+
+def test_ties_keep_table_order():
+    tied = pd.concat([TABLE.iloc[[1]]] * 5, ignore_index=True).assign(name=list('abcde'))
+    ids, score, _ = main_gpu.InvestorIndex(tied).match(startup(), 3, None, False, None)
+    assert ids.tolist() == [0, 1, 2]
+    assert len(set(score.tolist())) == 1
+
+def test_success_probability_is_opt_in():
+    request = main_gpu.InvestorMatchInput(startup=startup())
+    assert request.use_success_probability is False
@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+import xgboost as xgb
+from fastapi import HTTPException
+from sklearn.preprocessing import LabelEncoder
+
+import main_gpu
+
+STARTUP = {
+    'funding_total': 2_000_000,
+    'founded_year': 2021,
+    'category': 'Fintech',
+    'location': 'USA',
+    'team_size': 12,
+    'funding_rounds': 2
+}
+CATEGORIES = ['AI/ML', 'Fintech', 'SaaS', 'Technology']
+
+def label_model(name, features, encoder, seed):
+    """A small booster over `features`; category_encoded is this model's own label code"""
+    rng = np.random.default_rng(seed)
+    n = 500
+    data = {'funding_total': rng.lognormal(14, 1, n), 'team_size': rng.integers(1, 60, n),
+            'founded_year': rng.integers(2000, 2024, n)}
+    category = rng.choice(CATEGORIES, n)
+    data['category_encoded'] = encoder.transform(category)
+    matrix = np.column_stack([data[f] for f in features]).astype(np.float32)
+    label = (category == 'Fintech') | (data['team_size'] > 30)
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 3, 'nthread': 1},
+                        xgb.DMatrix(matrix, label=label, feature_names=features), num_boost_round=10)
+    return main_gpu.ServedModel(name, f'{name}.pkl', booster, features, encoder, None, {'trained_date': 'today'})
+
+@pytest.fixture
+def registry():
+    primary_enc = LabelEncoder().fit(CATEGORIES)
+    # Trained on a wider vocabulary, so the same labels get different codes:
+    # the union's category column must be re-encoded per model
+    shadow_enc = LabelEncoder().fit(CATEGORIES + ['Biotech', 'E-commerce'])
+    primary = label_model('primary', ['funding_total', 'team_size', 'category_encoded'], primary_enc, 1)
+    shadow = label_model('shadow', ['category_encoded', 'founded_year', 'team_size'], shadow_enc, 2)
+    return main_gpu.ModelRegistry({'primary': primary, 'shadow': shadow}, 'primary', ['shadow'])
+
+def union_matrix(registry, rows):
+    """What build_feature_matrix produces: the union columns, categories in the primary's codes"""
+    encoder = registry.primary.encoders['category_encoded']
+    values = {'funding_total': [r[0] for r in rows], 'team_size': [r[1] for r in rows],
+              'founded_year': [r[2] for r in rows],
+              'category_encoded': main_gpu.encode_labels(encoder, [r[3] for r in rows])}
+    cols = {'category': np.array([r[3] for r in rows]), 'location': np.array(['USA'] * len(rows))}
+    return np.column_stack([values[f] for f in registry.union]).astype(np.float32), cols
+
+ROWS = [(1e6, 10, 2020, 'Fintech'), (5e5, 45, 2015, 'SaaS'), (3e6, 3, 2022, 'AI/ML')]
+
+def test_union_starts_with_the_primary_features(registry):
+    assert registry.union == ['funding_total', 'team_size', 'category_encoded', 'founded_year']
+    assert registry.primary.prefix
+    assert not registry.models['shadow'].prefix
+    assert [m.name for m in registry.shadows] == ['shadow']
+
+def test_each_model_gets_its_own_columns_and_codes(registry):
+    union, cols = union_matrix(registry, ROWS)
+    shadow = registry.models['shadow']
+    expected = np.array([[shadow.encoders['category_encoded'].transform([c])[0], y, t] for _, t, y, c in ROWS],
+                        dtype=np.float32)
+    assert not np.array_equal(expected[:, 0], union[:, 2])
+    assert np.array_equal(shadow.matrix(union, cols), expected)
+    assert np.array_equal(registry.primary.matrix(union, cols), union[:, :3])
+
+def test_score_routes_to_the_named_models(registry):
+    union, cols = union_matrix(registry, ROWS)
+    scores = registry.score(['primary', 'shadow'], union, cols)
+    for name, probabilities in scores.items():
+        model = registry.models[name]
+        direct = model.booster.predict(xgb.DMatrix(model.matrix(union, cols), feature_names=model.features))
+        assert np.allclose(probabilities, direct)
+    assert registry.get(None) is registry.primary
+
+def test_unknown_model_is_404(registry):
+    with pytest.raises(HTTPException) as error:
+        registry.get('missing')
+    assert error.value.status_code == 404
+
+def test_shadow_runs_are_tallied(registry):
+    union, cols = union_matrix(registry, ROWS)
+    primary = registry.primary.predict(registry.primary.matrix(union, cols))
+    registry.run_shadows(union, cols, primary)
+
+    stats = registry.snapshot()['shadows']['shadow']
+    assert stats['scored'] == len(ROWS)
+    assert stats['errors'] == 0
+    assert 0 <= stats['agreement'] <= 1
+
+def call(method, path, **kwargs):
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.request(method, path, **kwargs)
+    return asyncio.run(run())
+
+@pytest.mark.skipif(len(main_gpu.model_registry.models) < 2, reason="needs both trained models")
+def test_endpoints_route_by_model_name():
+    compare = call('POST', '/predict/compare', json={'startup': STARTUP}).json()
+    assert set(compare['probabilities']) == set(main_gpu.model_registry.models)
+
+    for name, probability in compare['probabilities'].items():
+        single = call('POST', f'/predict/success?model={name}', json=STARTUP).json()
+        assert single['model_info']['name'] == name
+        assert single['probability'] == probability
+
+    default = call('POST', '/predict/success', json=STARTUP).json()
+    assert default['model_info']['name'] == compare['primary']
+    assert call('POST', '/predict/success?model=missing', json=STARTUP).status_code == 404
+    assert set(call('GET', '/models').json()['models']) == set(main_gpu.model_registry.models)
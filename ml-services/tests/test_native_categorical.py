@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+import auto_train
+import main_gpu
+
+@pytest.fixture
+def served(synthetic_model, monkeypatch):
+    """The synthetic native-categorical model installed as main_gpu's primary model"""
+    booster, X, _ = synthetic_model
+    booster = booster.copy()
+    auto_train.attach_categories(booster, X)
+    model = main_gpu.ServedModel('native', 'native.pkl', booster, auto_train.FEATURE_COLUMNS, None, None, {})
+    registry = main_gpu.ModelRegistry({'native': model}, 'native', [])
+    for name, value in [('model_registry', registry), ('primary_model', model), ('xgb_model', booster),
+                        ('feature_columns', model.features), ('category_encoder', None), ('location_encoder', None),
+                        ('native_categories', model.native_categories), ('feature_types', model.feature_types)]:
+        monkeypatch.setattr(main_gpu, name, value)
+    return booster, X
+
+def test_native_encoding_keeps_sorted_categories_and_drops_encoders(tmp_path, monkeypatch):
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    monkeypatch.setitem(auto_train.CONFIG, 'categorical_mode', 'native')
+    for name in auto_train.ENCODER_FILES:
+        (tmp_path / name).write_bytes(b'stale')
+
+    df = auto_train.encode_features(pd.DataFrame({'category': ['SaaS', 'AI/ML', 'SaaS'], 'location': ['UK', 'USA', 'UK']}))
+    assert df['category_encoded'].cat.categories.tolist() == ['AI/ML', 'SaaS']
+    assert df['location_encoded'].cat.codes.tolist() == [0, 1, 0]
+    assert list(tmp_path.iterdir()) == []
+
+def test_feature_array_codes_categoricals_and_types_them():
+    X = pd.DataFrame({'a': [1.5, 2.0, 3.0], 'c': pd.Categorical(['y', None, 'x'], categories=['x', 'y'])})
+    matrix, types = auto_train.feature_array(X)
+    assert types == ['q', 'c']
+    assert matrix.dtype == np.float32
+    assert matrix[:, 1].tolist()[::2] == [1.0, 0.0] and np.isnan(matrix[1, 1])
+
+def test_categories_travel_on_the_booster(served):
+    booster, X = served
+    stored = json.loads(booster.attr('categories'))
+    assert stored == {f: X[f].cat.categories.tolist() for f in auto_train.NATIVE_CATEGORICALS}
+
+def test_serving_codes_match_training_and_unseen_is_missing(served):
+    _, X = served
+    classes = X['category_encoded'].cat.categories.tolist()
+    codes = main_gpu.encode_category('category_encoded', None, [classes[2], 'Not A Category', classes[0]],
+                                     main_gpu.native_categories)
+    assert codes[0] == 2 and codes[2] == 0 and np.isnan(codes[1])
+    # Label-encoded features still go through the encoder
+    assert main_gpu.encode_category('funding_total', None, ['x'], main_gpu.native_categories).tolist() == [0]
+
+def test_served_predictions_match_training_frame(served):
+    booster, X = served
+    rows = X.iloc[:50]
+    cols = {
+        **{name: rows[name].to_numpy(np.float32) for name in
+           ['funding_total', 'founded_year', 'team_size', 'funding_rounds', 'monthly_revenue',
+            'user_growth_rate', 'burn_rate', 'market_size', 'num_strengths', 'num_challenges',
+            'description_length', 'problem_length']},
+        'category': rows['category_encoded'].astype(str).to_numpy(),
+        'location': rows['location_encoded'].astype(str).to_numpy(),
+    }
+    matrix = main_gpu.build_feature_matrix(cols)
+    served_codes = matrix[:, auto_train.FEATURE_COLUMNS.index('category_encoded')]
+    assert served_codes.tolist() == rows['category_encoded'].cat.codes.tolist()
+
+    # Numeric columns as served, categoricals as trained
+    frame = rows.assign(**{c: matrix[:, i] for i, c in enumerate(auto_train.FEATURE_COLUMNS)
+                           if c not in auto_train.NATIVE_CATEGORICALS})
+    assert np.array_equal(main_gpu.xgb_model.predict(main_gpu.model_dmatrix(matrix)),
+                          booster.predict(xgb.DMatrix(frame, enable_categorical=True)))
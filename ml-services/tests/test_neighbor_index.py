@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import neighbor_index
+
+FEATURES = ['funding_total', 'team_size', 'founded_year', 'constant']
+
+@pytest.fixture(scope='module')
+def index(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    n = 3000
+    matrix = np.column_stack([rng.lognormal(14, 2, n), rng.integers(1, 200, n),
+                              rng.integers(1995, 2024, n), np.full(n, 7.0)]).astype(np.float32)
+    out_dir = tmp_path_factory.mktemp('neighbors')
+    neighbor_index.build(matrix, rng.integers(0, 2, n), FEATURES, str(out_dir),
+                         attributes={'funding_total': matrix[:, 0]},
+                         labels={'category': rng.choice(['SaaS', 'Fintech'], n)}, n_lists=30, seed=1)
+    return neighbor_index.NeighborIndex(str(out_dir)), matrix
+
+def brute_force(index, matrix, queries, k):
+    """Distances over the raw training rows, in the index's standardized space"""
+    z = neighbor_index.standardize(matrix, index.log_mask, index.mean, index.scale)
+    q = neighbor_index.standardize(queries, index.log_mask, index.mean, index.scale)
+    d = ((q[:, None, :] - z[None, :, :]) ** 2).sum(axis=2)
+    return np.sort(d, axis=1)[:, :k], np.argsort(d, axis=1, kind='stable')[:, :k]
+
+def test_standardize_logs_clips_and_zeroes_constant_columns():
+    z = neighbor_index.standardize(np.array([[np.e - 1, 100.0, np.nan]]), np.array([True, False, False]),
+                                   np.array([0.0, 0.0, 5.0], dtype=np.float32), np.array([1.0, 2.0, 0.0], dtype=np.float32))
+    assert z[0].tolist() == pytest.approx([1.0, neighbor_index.MAX_Z, 0.0])
+
+def test_exact_search_matches_brute_force(index):
+    idx, matrix = index
+    queries = matrix[:5] * 1.05
+    distances, positions = idx.exact_search(queries, k=5)
+    expected, rows = brute_force(idx, matrix, queries, 5)
+    assert distances == pytest.approx(expected, abs=1e-3)
+    assert idx.row_ids[positions[:, 0]].tolist() == rows[:, 0].tolist()
+
+def test_probing_every_list_is_exact(index, monkeypatch):
+    idx, matrix = index
+    monkeypatch.setattr(neighbor_index, 'EXACT_MAX_ROWS', 0)
+    queries = matrix[10:20] * 0.97
+    ivf, _ = idx.search(queries, k=5, nprobe=idx.meta['n_lists'])
+    exact, _ = idx.exact_search(queries, k=5)
+    assert ivf == pytest.approx(exact, abs=1e-3)
+
+def test_few_probes_keep_high_recall(index, monkeypatch):
+    idx, matrix = index
+    monkeypatch.setattr(neighbor_index, 'EXACT_MAX_ROWS', 0)
+    queries = matrix[100:150] * 1.02
+    ivf, _ = idx.search(queries, k=10, nprobe=6)
+    exact, _ = idx.exact_search(queries, k=10)
+    recall = np.mean([np.mean(a <= b[-1] + 1e-4) for a, b in zip(ivf, exact)])
+    assert recall >= 0.9
+
+def test_describe_returns_source_rows_with_attributes(index):
+    idx, matrix = index
+    distances, positions = idx.search(matrix[:1], k=3)
+    nearest = idx.describe(positions[0], distances[0])
+    assert len(nearest) == 3
+    assert nearest[0]['row_id'] == 0 and nearest[0]['distance'] == pytest.approx(0, abs=1e-2)
+    assert nearest[0]['funding_total'] == pytest.approx(float(matrix[0, 0]))
+    assert nearest[0]['category'] in ('SaaS', 'Fintech')
+    assert idx.meta['scale'][FEATURES.index('constant')] == 0
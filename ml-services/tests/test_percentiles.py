@@ -0,0 +1,83 @@
+import joblib
+import numpy as np
+import pytest
+import xgboost as xgb
+
+import auto_train
+import main_gpu
+
+@pytest.fixture(scope='module')
+def population(synthetic_model):
+    """(score index, training probabilities, category labels, location labels)"""
+    booster, X, _ = synthetic_model
+    index = main_gpu.ScoreIndex(auto_train.score_distribution(booster, X))
+    probabilities = booster.predict(xgb.DMatrix(X, enable_categorical=True)).astype(np.float32)
+    return (index, probabilities, auto_train.group_labels(X, 'category_encoded'),
+            auto_train.group_labels(X, 'location_encoded'))
+
+def dump(model, path):
+    joblib.dump(model, path)
+    return path
+
+def brute_percentile(population, score):
+    """Percent scoring below, ties counted as half"""
+    return ((population < score).sum() + (population == score).sum() / 2) / len(population) * 100
+
+def test_midrank_counts_ties_as_half():
+    values = np.array([0.1, 0.2, 0.2, 0.2, 0.5])
+    assert main_gpu.midrank(values, np.array([0.0, 0.1, 0.2, 0.3, 0.9])).tolist() == [0, 0.5, 2.5, 4, 5]
+
+def test_percentile_matches_brute_force(population):
+    index, probabilities, _, _ = population
+    queries = np.concatenate([probabilities[:50], [0.0, 0.5, 1.0]]).astype(np.float32)
+    expected = [brute_percentile(probabilities, q) for q in queries]
+    assert np.allclose(index.percentile(queries), expected)
+
+@pytest.mark.parametrize('source', ['category', 'location'])
+def test_group_percentile_matches_brute_force(population, source):
+    index, probabilities, categories, locations = population
+    labels = categories if source == 'category' else locations
+    rows = np.arange(0, len(probabilities), 37)
+
+    percentile, counts = index.group_percentile(source, labels[rows], probabilities[rows])
+    for i, row in enumerate(rows):
+        group = probabilities[labels == labels[row]]
+        assert counts[i] == len(group)
+        assert percentile[i] == pytest.approx(brute_percentile(group, probabilities[row]))
+
+def test_unseen_label_has_no_group_percentile(population):
+    index, probabilities, _, _ = population
+    percentile, counts = index.group_percentile('category', ['Not A Category'], probabilities[:1])
+    assert np.isnan(percentile[0])
+    assert counts[0] == 0
+
+def test_rank_returns_one_row_per_startup(population):
+    index, probabilities, categories, locations = population
+    cols = {'category': np.append(categories[:3], 'Not A Category'), 'location': locations[:4]}
+    rows = index.rank(probabilities[:4], cols)
+
+    assert len(rows) == 4
+    assert set(rows[0]) == {'population', 'percentile', 'category_percentile', 'category_population',
+                            'location_percentile', 'location_population'}
+    assert all(r['population'] == len(probabilities) for r in rows)
+    assert rows[3]['category_percentile'] is None and rows[3]['category_population'] == 0
+    assert rows[0]['percentile'] == round(brute_percentile(probabilities, probabilities[0]), 1)
+
+def test_saved_distribution_loads_only_for_its_model(synthetic_model, tmp_path, monkeypatch):
+    booster, X, _ = synthetic_model
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    auto_train.write_score_distribution(auto_train.score_distribution(booster, X))
+
+    served = joblib.load(dump(booster, tmp_path / 'model.pkl'))
+    loaded = main_gpu.ScoreIndex.load(str(tmp_path), served)
+    assert loaded is not None and len(loaded.all) == len(X)
+
+    other = booster[:5]
+    assert main_gpu.ScoreIndex.load(str(tmp_path), other) is None
+
+def test_distribution_without_fingerprint_is_refused(synthetic_model, tmp_path):
+    booster, X, _ = synthetic_model
+    arrays = auto_train.score_distribution(booster, X)
+    del arrays['model']
+    np.savez(tmp_path / 'score_distribution.npz', **arrays)
+    assert main_gpu.ScoreIndex.load(str(tmp_path), booster) is None
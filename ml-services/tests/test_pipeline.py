@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+import auto_train
+
+calls = []
+
+def load(ctx):
+    calls.append('load')
+    return {'rows': list(range(ctx['n']))}
+
+def total(ctx):
+    calls.append('total')
+    return {'total': sum(ctx['rows'])}
+
+def report(ctx):
+    calls.append('report')
+
+def stages(n=5):
+    def configured(ctx):
+        ctx['n'] = n
+    return [
+        auto_train.Stage('setup', configured, key=lambda ctx: n, persist=False),
+        auto_train.Stage('load', load, deps=['setup'], key=lambda ctx: n),
+        auto_train.Stage('total', total, deps=['load']),
+        auto_train.Stage('report', report, deps=['total'], persist=False),
+    ]
+
+@pytest.fixture(autouse=True)
+def scratch(tmp_path, monkeypatch):
+    monkeypatch.setitem(auto_train.CONFIG, 'pipeline_dir', str(tmp_path / 'pipeline'))
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    calls.clear()
+
+def statuses(pipeline):
+    return {entry['stage']: entry['status'] for entry in pipeline.report}
+
+def test_rerun_skips_unchanged_stages():
+    assert auto_train.Pipeline(stages(), {}).run()['total'] == 10
+    calls.clear()
+
+    pipeline = auto_train.Pipeline(stages(), {})
+    assert pipeline.run()['total'] == 10
+    assert calls == ['report']
+    assert statuses(pipeline) == {'setup': 'ran', 'load': 'cached', 'total': 'cached', 'report': 'ran'}
+
+def test_changed_key_reruns_the_stage_and_everything_after_it(tmp_path):
+    auto_train.Pipeline(stages(), {}).run()
+    calls.clear()
+
+    pipeline = auto_train.Pipeline(stages(n=4), {'n': 4})
+    assert pipeline.run()['total'] == 6
+    assert calls == ['load', 'total', 'report']
+    with open(tmp_path / 'pipeline_report.json') as f:
+        saved = json.load(f)
+    assert saved['options'] == {'n': 4}
+    assert [s['stage'] for s in saved['stages']] == ['setup', 'load', 'total', 'report']
+    assert all(s['cpu_s'] >= 0 and s['peak_rss_mb'] > 0 for s in saved['stages'])
+
+def test_single_stage_reruns_from_saved_inputs():
+    auto_train.Pipeline(stages(), {}).run()
+    calls.clear()
+
+    ctx = auto_train.Pipeline(stages(), {}).run(only='total')
+    assert calls == ['total']
+    assert ctx['total'] == 10
+
+def test_single_stage_needs_its_inputs_saved():
+    with pytest.raises(RuntimeError, match="No saved output for stage 'load'"):
+        auto_train.Pipeline(stages(), {}).run(only='total')
+    with pytest.raises(ValueError, match='Unknown stage'):
+        auto_train.Pipeline(stages(), {}).run(only='nope')
+
+def test_failed_stage_is_reported_and_not_marked_done(tmp_path):
+    def broken(ctx):
+        raise KeyError('boom')
+    failing = stages()[:2] + [auto_train.Stage('total', broken, deps=['load'])]
+
+    with pytest.raises(KeyError):
+        auto_train.Pipeline(failing, {}).run()
+    with open(tmp_path / 'pipeline_report.json') as f:
+        assert json.load(f)['stages'][-1]['status'] == 'failed'
+
+    calls.clear()
+    auto_train.Pipeline(stages(), {}).run()
+    assert calls == ['total', 'report']
@@ -0,0 +1,59 @@
+import asyncio
+import re
+
+import httpx
+import pytest
+
+import main_gpu
+
+PITCH = ("Small clinics lose 20% of revenue to missed appointments, a painful problem nobody has fixed. "
+         "Our platform books, reminds and refills slots automatically for 3,000 customers across a "
+         "$4 billion market. MedFlow grew 15% month over month since launch.")
+
+def post(path, body):
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post(path, json=body)
+    return asyncio.run(run())
+
+def node_signals(text):
+    """The per-signal regexes of the Node route's analyzeLocally"""
+    return {
+        'word_count': len(re.split(r'\s+', text)),
+        'signals': {name for name, pattern in [
+            ('number', r'\d'), ('problem', r'(problem|challenge|issue|pain)'),
+            ('solution', r'(solution|solve|fix|help|platform)'), ('market', r'(market|customers|users|target)'),
+            ('metrics', r'(\$|%|million|thousand|billion)')
+        ] if re.search(pattern, text, re.IGNORECASE)}
+    }
+
+@pytest.mark.parametrize('text', [
+    PITCH, '  leading and trailing  ', 'no signals at all here', 'ISSUERS helpful TARGETED 5 thousand',
+    'one\n\ttwo   three', '', 'prefix painters'
+])
+def test_single_pass_scan_matches_node_regexes(text):
+    assert main_gpu.scan_pitch(text) == node_signals(text)
+
+def test_scores_follow_node_rules():
+    result = main_gpu.analyze_pitch(main_gpu.PitchInput(pitch_text=PITCH, startup_name='medflow', team_size=12))
+    assert result['word_count'] == 39
+    assert result['clarity'] == 70
+    assert result['completeness'] == 100
+    assert result['persuasiveness'] == 90
+    assert result['overall_score'] == 87
+    assert result['sentiment'] == 'Positive'
+    assert 'Good use of your startup name: medflow' in result['strengths']
+    assert result['startup_context'] == {'name': 'medflow', 'category': None, 'mentioned': True}
+    assert 'Highlight your 12-person team as a strength' in result['improvements']
+
+def test_short_pitch_fails_only_its_own_item():
+    response = post('/pitch/analyze', {'pitches': [{'pitch_text': 'too short'}, {'pitch_text': PITCH}]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['count'] == 2
+    assert body['results'][0] == {'error': 'Pitch must be at least 50 characters'}
+    assert body['results'][1]['overall_score'] == 87
+
+def test_empty_batch_is_rejected():
+    assert post('/pitch/analyze', {'pitches': []}).status_code == 422
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import main_gpu
+
+STARTUP = {
+    'name': 'Acme',
+    'founded_year': 2021,
+    'category': 'Technology',
+    'location': 'USA',
+    'team_size': 12,
+    'funding': {'total': 1_500_000, 'rounds': 2},
+    'key_strengths': ['team'],
+    'main_challenges': ['growth']
+}
+
+def post_portfolios(n, startups=1):
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test', timeout=30) as client:
+            body = {'startups': [STARTUP] * startups, 'questions': ['How can I raise funding?']}
+            return await asyncio.gather(*[
+                client.post('/advisor/portfolio', json=body, headers={'x-client-id': f'client-{i}'})
+                for i in range(n)
+            ])
+    return asyncio.run(run())
+
+@pytest.fixture
+def portfolio_gate(monkeypatch):
+    gate = main_gpu.EndpointGate(concurrency=1, queue_size=1)
+    monkeypatch.setitem(main_gpu.admission_gates, '/advisor/portfolio', gate)
+    return gate
+
+def test_portfolio_streams_one_line_per_company(portfolio_gate):
+    response, = post_portfolios(1, startups=3)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['type'] for line in lines] == ['company'] * 3 + ['done']
+    assert sorted(line['index'] for line in lines[:3]) == [0, 1, 2]
+    assert all(len(line['answers']) == 1 for line in lines[:3])
+    assert lines[-1]['companies'] == 3
+
+
+def test_worker_chunks_match_inline_rendering(portfolio_gate, monkeypatch):
+    inline, = post_portfolios(1, startups=4)
+    monkeypatch.setattr(main_gpu, 'PORTFOLIO_INLINE_ANSWERS', 0)
+    monkeypatch.setattr(main_gpu, 'PORTFOLIO_CHUNK_ANSWERS', 1)
+    monkeypatch.setattr(main_gpu, 'portfolio_pool', None)
+    chunked, = post_portfolios(1, startups=4)
+    main_gpu.portfolio_pool.shutdown()
+
+    def companies(response):
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        return sorted((line for line in lines if line['type'] == 'company'), key=lambda line: line['index'])
+
+    assert json.loads(chunked.text.splitlines()[-1])['workers'] == main_gpu.PORTFOLIO_WORKERS
+    assert companies(chunked) == companies(inline)
+
+def test_pool_forks_workers_or_falls_back_to_threads(portfolio_gate, monkeypatch):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    monkeypatch.setattr(main_gpu, 'portfolio_pool', None)
+    pool = main_gpu.get_portfolio_pool()
+    pool.shutdown()
+    assert isinstance(pool, ProcessPoolExecutor)
+    assert pool._mp_context.get_start_method() == 'fork'
+
+    inline, = post_portfolios(1, startups=4)
+    monkeypatch.setattr(multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    monkeypatch.setattr(main_gpu, 'PORTFOLIO_INLINE_ANSWERS', 0)
+    monkeypatch.setattr(main_gpu, 'PORTFOLIO_CHUNK_ANSWERS', 1)
+    monkeypatch.setattr(main_gpu, 'portfolio_pool', None)
+    threaded, = post_portfolios(1, startups=4)
+    assert isinstance(main_gpu.portfolio_pool, ThreadPoolExecutor)
+    main_gpu.portfolio_pool.shutdown()
+
+    def companies(response):
+        return sorted((json.loads(line) for line in response.text.splitlines()[:-1]), key=lambda line: line['index'])
+
+    assert companies(threaded) == companies(inline)
+
+def test_portfolio_holds_admission_slot_while_streaming(portfolio_gate, monkeypatch):
+    render = main_gpu.render_company_reports
+    in_flight_while_rendering = []
+
+    def slow_render(companies, questions):
+        in_flight_while_rendering.append(portfolio_gate.in_flight)
+        time.sleep(0.3)
+        return render(companies, questions)
+
+    monkeypatch.setattr(main_gpu, 'render_company_reports', slow_render)
+    responses = post_portfolios(4)
+
+    # One rendering, one queued behind it, the rest shed because the queue is full
+    assert sorted(r.status_code for r in responses) == [200, 200, 503, 503]
+    assert in_flight_while_rendering == [1, 1]
+    assert portfolio_gate.shed_queue_full == 2
+    assert portfolio_gate.in_flight == 0
+    assert portfolio_gate.waiting == 0
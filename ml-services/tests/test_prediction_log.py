@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+import main_gpu
+
+FEATURES = ['a', 'b']
+
+def rows(start, n):
+    matrix = np.arange(start, start + n, dtype=np.float32)[:, None].repeat(2, axis=1)
+    return matrix, matrix[:, 0] / 100
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_gpu, 'PREDICTION_LOG_DIR', str(tmp_path))
+    return tmp_path
+
+def test_ring_wraps_and_drains_oldest_first():
+    sink = main_gpu.PredictionLogSink(FEATURES, capacity=4)
+    sink.enqueue(*rows(0, 3))
+    assert sink.drain()['a'].tolist() == [0, 1, 2]
+
+    sink.enqueue(*rows(3, 4))
+    frame = sink.drain()
+    assert frame['a'].tolist() == [3, 4, 5, 6]
+    assert frame['probability'].tolist() == pytest.approx([0.03, 0.04, 0.05, 0.06])
+    assert list(frame.columns) == ['ts', 'model_version', 'probability', 'a', 'b']
+    assert sink.drain() is None
+
+def test_full_ring_drops_and_counts_overflow():
+    sink = main_gpu.PredictionLogSink(FEATURES, capacity=4)
+    sink.enqueue(*rows(0, 3))
+    sink.enqueue(*rows(3, 3))
+    assert sink.stats['enqueued'] == 4
+    assert sink.stats['dropped'] == 2
+    assert sink.drain()['a'].tolist() == [0, 1, 2, 3]
+
+def test_batch_size_triggers_flush(monkeypatch):
+    monkeypatch.setattr(main_gpu, 'PREDICTION_LOG_FLUSH_ROWS', 3)
+    sink = main_gpu.PredictionLogSink(FEATURES, capacity=10)
+    sink.enqueue(*rows(0, 2))
+    assert not sink.flush_needed.is_set()
+    sink.enqueue(*rows(2, 1))
+    assert sink.flush_needed.is_set()
+
+def test_flush_appends_jsonl(log_dir):
+    sink = main_gpu.PredictionLogSink(FEATURES, capacity=10)
+    for start in (0, 2):
+        sink.enqueue(*rows(start, 2))
+        asyncio.run(sink.flush())
+
+    path, = log_dir.iterdir()
+    records = [json.loads(line) for line in path.read_text().splitlines() if line]
+    assert [r['a'] for r in records] == [0, 1, 2, 3]
+    assert sink.stats['written'] == 4 and sink.stats['flushes'] == 2
+
+def test_flush_writes_one_parquet_file_per_batch(log_dir, monkeypatch):
+    monkeypatch.setattr(main_gpu, 'PREDICTION_LOG_FORMAT', 'parquet')
+    sink = main_gpu.PredictionLogSink(FEATURES, capacity=10)
+    for start in (0, 2):
+        sink.enqueue(*rows(start, 2))
+        asyncio.run(sink.flush())
+
+    paths = sorted(log_dir.iterdir())
+    assert len(paths) == 2
+    assert pd.read_parquet(paths[1])['b'].tolist() == [2, 3]
+
+def test_failed_write_is_counted_not_raised(log_dir, monkeypatch):
+    sink = main_gpu.PredictionLogSink(FEATURES, capacity=10)
+    monkeypatch.setattr(sink, 'write', lambda frame: (_ for _ in ()).throw(OSError('disk full')))
+    sink.enqueue(*rows(0, 2))
+    asyncio.run(sink.flush())
+    assert sink.stats['write_errors'] == 1
+    assert sink.stats['dropped'] == 2
+    assert sink.size == 0
+
+@pytest.mark.skipif(main_gpu.xgb_model is None, reason='no trained model in ./models')
+def test_scored_request_lands_in_the_ring(monkeypatch):
+    sink = main_gpu.PredictionLogSink(main_gpu.feature_columns, capacity=10)
+    monkeypatch.setattr(main_gpu, 'prediction_log', sink)
+    startup = {'funding_total': 1e6, 'founded_year': 2020, 'team_size': 9, 'funding_rounds': 1,
+               'category': 'Fintech', 'location': 'USA'}
+
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post('/predict/success', json=startup)
+    response = asyncio.run(run())
+
+    frame = sink.drain()
+    assert len(frame) == 1
+    assert frame['funding_total'][0] == 1e6
+    assert frame['probability'][0] * 100 == pytest.approx(response.json()['probability'], abs=0.01)
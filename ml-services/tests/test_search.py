@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+
+import auto_train
+
+@pytest.fixture
+def small_search(tmp_path, monkeypatch):
+    monkeypatch.setitem(auto_train.CONFIG, 'models_dir', str(tmp_path))
+    monkeypatch.setitem(auto_train.CONFIG, 'search_min_rounds', 5)
+    monkeypatch.setitem(auto_train.CONFIG, 'search_max_rounds', 45)
+    monkeypatch.setitem(auto_train.CONFIG, 'search_early_stopping', 100)
+    monkeypatch.setitem(auto_train.CONFIG, 'search_threads_per_worker', 1)
+    X, y = make_classification(n_samples=1500, n_features=10, n_informative=6, random_state=1)
+    return pd.DataFrame(X, columns=[f'f{i}' for i in range(10)]), pd.Series(y)
+
+def test_resumed_trial_continues_from_its_rung():
+    X, y = make_classification(n_samples=400, n_features=5, random_state=0)
+    auto_train._init_search_worker(X[:300], y[:300], X[300:], y[300:], ['q'] * 5, 1)
+    config = {'max_depth': 3, 'learning_rate': 0.1}
+
+    _, first, rounds, stopped = auto_train._run_search_job(config, 5, None)
+    _, _, resumed_rounds, _ = auto_train._run_search_job(config, 10, first)
+    assert (rounds, stopped, resumed_rounds) == (5, False, 15)
+
+def test_halving_narrows_each_rung_and_saves_best(small_search, tmp_path):
+    X, y = small_search
+    best = auto_train.search_hyperparameters(X, y, n_trials=9)
+
+    with open(tmp_path / 'hpo_leaderboard.json') as f:
+        board = json.load(f)
+    assert board['budgets'] == [5, 15, 45]
+    trials = board['trials']
+    reached = [sum(t['rung'] >= k for t in trials) for k in range(3)]
+    assert reached[0] == 9
+    assert reached[0] > reached[1] > reached[2] >= 1
+    assert sum(t['rounds'] for t in trials) < 9 * 45
+
+    with open(tmp_path / 'best_params.json') as f:
+        saved = json.load(f)
+    assert saved['params'] == best == trials[0]['params']
+    assert trials[0]['converged']
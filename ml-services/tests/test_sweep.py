@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import main_gpu
+
+STARTUP = {
+    'funding_total': 2_000_000, 'founded_year': 2020, 'team_size': 12, 'funding_rounds': 2,
+    'monthly_revenue': 40_000, 'user_growth_rate': 0.15, 'burn_rate': 60_000, 'market_size': 1e9,
+    'category': 'Fintech', 'location': 'San Francisco', 'key_strengths': ['team', 'traction']
+}
+
+def post(path, body):
+    async def run():
+        transport = httpx.ASGITransport(app=main_gpu.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post(path, json=body)
+    return asyncio.run(run())
+
+pytestmark = pytest.mark.skipif(main_gpu.xgb_model is None, reason='no trained model in ./models')
+
+def test_sweep_cells_match_single_predictions():
+    axes = [{'field': 'funding_total', 'values': [1e5, 1e6, 1e7]},
+            {'field': 'team_size', 'start': 2, 'stop': 40, 'steps': 4}]
+    response = post('/predict/sweep', {'startup': STARTUP, 'axes': axes})
+    assert response.status_code == 200
+    body = response.json()
+
+    funding, team = (axis['values'] for axis in body['axes'])
+    assert team == [2, 15, 27, 40]
+    assert body['n_variants'] == 12
+    assert np.shape(body['probabilities']) == (3, 4)
+    for i, j in [(0, 0), (1, 2), (2, 3)]:
+        single = post('/predict/success', {**STARTUP, 'funding_total': funding[i], 'team_size': int(team[j])})
+        assert body['probabilities'][i][j] == pytest.approx(single.json()['probability'], abs=0.01)
+    assert body['base_probability'] == pytest.approx(post('/predict/success', STARTUP).json()['probability'], abs=0.01)
+
+def test_log_scale_axis_is_geometric():
+    axes = [{'field': 'monthly_revenue', 'start': 1e3, 'stop': 1e6, 'steps': 4, 'log_scale': True}]
+    body = post('/predict/sweep', {'startup': STARTUP, 'axes': axes}).json()
+    assert body['axes'][0]['values'] == pytest.approx([1e3, 1e4, 1e5, 1e6])
+    assert len(body['probabilities']) == 4
+
+@pytest.mark.parametrize('axes, detail', [
+    ([{'field': 'category', 'values': [1]}], "Cannot sweep 'category'"),
+    ([{'field': 'team_size', 'values': [1]}, {'field': 'team_size', 'values': [2]}], 'Axes must sweep different fields'),
+    ([{'field': 'burn_rate', 'start': 0, 'stop': 10, 'log_scale': True}], 'log_scale axes need positive start/stop'),
+    ([{'field': 'burn_rate'}], 'needs values or start/stop'),
+    ([], 'Provide one or two axes'),
+])
+def test_invalid_axes_are_rejected(axes, detail):
+    response = post('/predict/sweep', {'startup': STARTUP, 'axes': axes})
+    assert response.status_code == 400
+    assert detail in response.json()['detail']
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import synthetic_data
+
+def test_chunk_sizes_cover_rows_exactly():
+    assert synthetic_data.chunk_sizes(10, 4) == [4, 4, 2]
+    assert synthetic_data.chunk_sizes(8, 4) == [4, 4]
+
+def test_chunk_stream_matches_spawned_seed_sequence():
+    spawned = np.random.SeedSequence(11).spawn(3)[2]
+    assert synthetic_data.chunk_rng(11, 2).random(4).tolist() == np.random.default_rng(spawned).random(4).tolist()
+
+@pytest.mark.parametrize('schema', sorted(synthetic_data.SCHEMAS))
+def test_same_seed_same_data(schema):
+    first = synthetic_data.generate(2500, schema, seed=3, chunk_rows=1000)
+    again = synthetic_data.generate(2500, schema, seed=3, chunk_rows=1000)
+    other = synthetic_data.generate(2500, schema, seed=4, chunk_rows=1000)
+    pd.testing.assert_frame_equal(first, again)
+    assert not first['funding_total'].equals(other['funding_total'])
+    assert len(first) == 2500
+    assert 0.2 < first['success'].mean() < 0.8
+
+def test_shards_match_in_memory_dataset_for_any_worker_count(tmp_path):
+    expected = synthetic_data.generate(2500, seed=5, chunk_rows=1000)
+    for workers in [1, 2]:
+        paths = synthetic_data.write_shards(str(tmp_path / str(workers)), 2500, seed=5,
+                                            chunk_rows=1000, workers=workers)
+        assert len(paths) == 3
+        shards = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+        pd.testing.assert_frame_equal(shards, expected, check_categorical=False)
+
+def test_auto_train_rows_follow_their_derivations():
+    df = synthetic_data.generate(1000, seed=1)
+    assert df['company_age'].eq(2025 - df['founded_year']).all()
+    assert df['is_well_funded'].eq((df['funding_total'] > 1_000_000).astype(np.int8)).all()
+    assert df['monthly_revenue'].gt(0).eq(df['has_revenue'] == 1).all()
+    assert df['success'].eq((df['success_score'] > 50).astype(np.int8)).all()
+
+def test_chunk_size_is_part_of_the_dataset_identity():
+    small = synthetic_data.generate(2000, seed=5, chunk_rows=500)
+    large = synthetic_data.generate(2000, seed=5, chunk_rows=1000)
+    assert not small['funding_total'].equals(large['funding_total'])
+
+def test_default_pool_is_sized_by_usable_cores(tmp_path, monkeypatch):
+    import concurrent.futures
+    import cpu_profile
+    sizes = []
+
+    class RecordingPool(concurrent.futures.ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            sizes.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(cpu_profile, 'available_cpus', lambda: 2)
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', RecordingPool)
+    synthetic_data.write_shards(str(tmp_path), 2500, seed=5, chunk_rows=1000)
+    synthetic_data.write_shards(str(tmp_path), 1000, seed=5, chunk_rows=1000)
+    assert sizes == [2, 1]
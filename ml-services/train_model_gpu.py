@@ -9,6 +9,8 @@ import joblib
 import os
 import time
 import torch
+import synthetic_data
+import cpu_profile
 
 print("="*70)
 print("GPU-ACCELERATED STARTUP SUCCESS PREDICTION MODEL TRAINING")
@@ -21,7 +23,7 @@ if torch.cuda.is_available():
     print(f"✓ GPU Device: {torch.cuda.get_device_name(0)}")
     print(f"✓ GPU Memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB")
 else:
-    print("⚠ CUDA not available, using CPU")
+    print(f"✓ CUDA not available, using CPU ({cpu_profile.available_cpus()} usable cores)")
 
 os.makedirs('../models', exist_ok=True)
 
@@ -29,49 +31,7 @@ def create_synthetic_dataset(n_samples=10000):
     print(f"\n[DATASET CREATION]")
     print(f"Generating {n_samples:,} samples...")
     
-    np.random.seed(42)
-    
-    categories = ['Technology', 'Healthcare', 'Fintech', 'E-commerce', 
-                  'Education', 'SaaS', 'AI/ML', 'Blockchain', 'Other']
-    
-    locations = ['San Francisco', 'New York', 'Boston', 'Austin', 
-                 'London', 'Berlin', 'Singapore', 'Bangalore']
-    
-    data = {
-        'funding_total': np.random.lognormal(13, 2.5, n_samples),
-        'founded_year': np.random.randint(2010, 2024, n_samples),
-        'team_size': np.random.randint(2, 150, n_samples),
-        'funding_rounds': np.random.randint(0, 8, n_samples),
-        'monthly_revenue': np.random.lognormal(10, 2, n_samples),
-        'user_growth_rate': np.random.uniform(-0.2, 2.5, n_samples),
-        'burn_rate': np.random.lognormal(11, 1.8, n_samples),
-        'market_size': np.random.lognormal(15, 2, n_samples),
-        'category': np.random.choice(categories, n_samples),
-        'location': np.random.choice(locations, n_samples),
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # Feature engineering
-    df['company_age'] = 2025 - df['founded_year']
-    df['funding_per_round'] = df['funding_total'] / (df['funding_rounds'] + 1)
-    df['funding_velocity'] = df['funding_total'] / (df['company_age'] + 1)
-    df['revenue_to_burn_ratio'] = df['monthly_revenue'] / (df['burn_rate'] + 1)
-    df['funding_efficiency'] = df['user_growth_rate'] * df['funding_total'] / 1e6
-    
-    # Create target
-    df['success_score'] = (
-        (df['funding_total'] > df['funding_total'].median()).astype(int) * 20 +
-        (df['funding_rounds'] >= 2).astype(int) * 15 +
-        ((df['team_size'] >= 5) & (df['team_size'] <= 80)).astype(int) * 15 +
-        ((df['company_age'] >= 2) & (df['company_age'] <= 6)).astype(int) * 15 +
-        (df['user_growth_rate'] > 0.5).astype(int) * 15 +
-        (df['revenue_to_burn_ratio'] > 0.5).astype(int) * 10 +
-        df['category'].isin(['Technology', 'AI/ML', 'Fintech', 'SaaS']).astype(int) * 10
-    )
-    
-    df['success_score'] += np.random.normal(0, 10, n_samples)
-    df['success'] = (df['success_score'] >= 55).astype(int)
+    df = synthetic_data.generate(n_samples, schema='gpu', seed=42)
     
     print(f"✓ Dataset created: {len(df):,} samples")
     print(f"✓ Success rate: {df['success'].mean():.2%}")
@@ -97,10 +57,9 @@ def preprocess_data(df):
 def train_xgboost_gpu(X, y, X_test, y_test):
     print("\n[XGBOOST GPU TRAINING]")
     
-    start_time = time.time()
-    
     params = {
         'device': 'cuda' if torch.cuda.is_available() else 'cpu',
+        'nthread': cpu_profile.available_cpus(),
         'tree_method': 'hist',
         'max_depth': 10,
         'learning_rate': 0.1,
@@ -114,6 +73,13 @@ def train_xgboost_gpu(X, y, X_test, y_test):
         'random_state': 42
     }
     
+    if params['device'] == 'cpu':
+        # Same nthread/max_bin benchmark auto_train runs before CPU training, on this script's features
+        profile = cpu_profile.autotune(X, y, params, seed=params['random_state'])
+        params.update(nthread=profile['nthread'], max_bin=profile['max_bin'])
+        print(f"✓ Autotuned nthread={profile['nthread']} max_bin={profile['max_bin']}")
+    
+    start_time = time.time()
     dtrain = xgb.DMatrix(X, label=y)
     dtest = xgb.DMatrix(X_test, label=y_test)
     